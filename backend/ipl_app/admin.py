@@ -1,5 +1,12 @@
 from django.contrib import admin
-from .models import Team, Player, Match, Delivery
+from django.db.models import Q
+from .models import Team, Player, Match, Delivery, SeasonTeamStats, SeasonBowlerStats, SeasonBattingStats, HeadToHead, TeamVenueStats
+from .search import search_names
+
+ADMIN_SEARCH_LIMIT = 100
+
+def _matching_player_ids(search_term):
+    return [match['id'] for match in search_names(search_term, kind='player', limit=ADMIN_SEARCH_LIMIT)]
 
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
@@ -13,6 +20,12 @@ class PlayerAdmin(admin.ModelAdmin):
     search_fields = ('name',)
     list_filter = ('role',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Resolve the term through the name index instead of a LIKE '%term%' scan
+        if not search_term:
+            return queryset, False
+        return queryset.filter(pk__in=_matching_player_ids(search_term)), False
+
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     list_display = ('match_id', 'season', 'team1', 'team2', 'winner', 'date', 'venue')
@@ -26,4 +39,39 @@ class DeliveryAdmin(admin.ModelAdmin):
     list_display = ('match', 'inning', 'over', 'ball', 'batsman', 'bowler', 'total_runs')
     list_filter = ('inning', 'is_super_over')
     raw_id_fields = ('match', 'batsman', 'non_striker', 'bowler', 'player_dismissed', 'fielder')
-    search_fields = ('batsman__name', 'bowler__name')
\ No newline at end of file
+    search_fields = ('batsman__name', 'bowler__name')
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        players = _matching_player_ids(search_term)
+        return queryset.filter(Q(batsman__in=players) | Q(bowler__in=players)), False
+
+@admin.register(SeasonTeamStats)
+class SeasonTeamStatsAdmin(admin.ModelAdmin):
+    list_display = ('season', 'team', 'matches_played', 'matches_won', 'extra_runs_conceded')
+    list_filter = ('season',)
+    raw_id_fields = ('team',)
+
+@admin.register(SeasonBowlerStats)
+class SeasonBowlerStatsAdmin(admin.ModelAdmin):
+    list_display = ('season', 'bowler', 'balls', 'legal_balls', 'runs_conceded', 'wickets')
+    list_filter = ('season',)
+    raw_id_fields = ('bowler',)
+
+@admin.register(SeasonBattingStats)
+class SeasonBattingStatsAdmin(admin.ModelAdmin):
+    list_display = ('season', 'batsman', 'runs', 'balls', 'fours', 'sixes', 'dismissals')
+    list_filter = ('season',)
+    raw_id_fields = ('batsman',)
+
+@admin.register(HeadToHead)
+class HeadToHeadAdmin(admin.ModelAdmin):
+    list_display = ('team', 'opponent', 'matches', 'wins', 'losses', 'no_results')
+    raw_id_fields = ('team', 'opponent')
+
+@admin.register(TeamVenueStats)
+class TeamVenueStatsAdmin(admin.ModelAdmin):
+    list_display = ('venue', 'team', 'matches', 'wins', 'losses', 'no_results')
+    search_fields = ('venue',)
+    raw_id_fields = ('team',)
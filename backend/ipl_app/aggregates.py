@@ -0,0 +1,198 @@
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Q, Sum
+from .models import (
+    Match, Delivery, SeasonTeamStats, SeasonBowlerStats, SeasonBattingStats, HeadToHead, TeamVenueStats,
+)
+
+# Dismissals that count as a wicket for the side but not for the bowler
+NON_BOWLER_DISMISSALS = ('run out', 'retired hurt', 'retired out', 'obstructing the field')
+BOWLER_WICKET = Q(player_dismissed__isnull=False) & ~Q(dismissal_kind__in=NON_BOWLER_DISMISSALS)
+# Byes and leg byes are extras, but not charged to the bowler
+BOWLER_RUNS = F('total_runs') - F('bye_runs') - F('legbye_runs')
+
+
+def refresh_season_stats(seasons=None):
+    """Rebuild the per-season summary rows for ``seasons`` (all seasons when None).
+
+    Each season is recomputed from Match and Delivery with grouped queries and
+    its summary rows are replaced in one transaction, so the chart views only
+    ever see complete seasons.
+    """
+    if seasons is None:
+        seasons = Match.objects.values_list('season', flat=True).distinct()
+    seasons = sorted(set(seasons))
+    if not seasons:
+        return
+
+    with transaction.atomic():
+        SeasonTeamStats.objects.filter(season__in=seasons).delete()
+        SeasonBowlerStats.objects.filter(season__in=seasons).delete()
+        SeasonBattingStats.objects.filter(season__in=seasons).delete()
+        SeasonTeamStats.objects.bulk_create(_team_stats(seasons), batch_size=1000)
+        SeasonBowlerStats.objects.bulk_create(_bowler_stats(seasons), batch_size=1000)
+        SeasonBattingStats.objects.bulk_create(_batting_stats(seasons), batch_size=1000)
+
+
+def refresh_head_to_head(teams=None):
+    """Rebuild the head-to-head and venue records of ``teams`` (all teams when None).
+
+    A team's records only change with its own matches, so the loader passes
+    just the teams of new or changed matches.
+    """
+    matches = Match.objects.all()
+    pairs = HeadToHead.objects.all()
+    venues = TeamVenueStats.objects.all()
+    if teams is not None:
+        teams = set(teams)
+        if not teams:
+            return
+        matches = matches.filter(Q(team1__in=teams) | Q(team2__in=teams))
+        pairs = pairs.filter(Q(team__in=teams) | Q(opponent__in=teams))
+        venues = venues.filter(team__in=teams)
+
+    head_to_head = {}
+    at_venue = {}
+    for side, other in (('team1', 'team2'), ('team2', 'team1')):
+        for item in _side_records(matches, side, other, other):
+            _add_record(head_to_head, (item[side], item[other]), item)
+        for item in _side_records(matches, side, other, 'venue'):
+            if teams is None or item[side] in teams:
+                _add_record(at_venue, (item['venue'], item[side]), item)
+
+    with transaction.atomic():
+        pairs.delete()
+        venues.delete()
+        HeadToHead.objects.bulk_create([
+            HeadToHead(team_id=team, opponent_id=opponent, **record)
+            for (team, opponent), record in head_to_head.items()
+        ], batch_size=1000)
+        TeamVenueStats.objects.bulk_create([
+            TeamVenueStats(venue=venue, team_id=team, **record)
+            for (venue, team), record in at_venue.items()
+        ], batch_size=1000)
+
+
+def _side_records(matches, side, other, key):
+    """Win/loss counts of the ``side`` team (team1 or team2), grouped by that team and ``key``."""
+    return matches.values(side, key).annotate(
+        played=Count('id'),
+        won=Count('id', filter=Q(winner=F(side))),
+        lost=Count('id', filter=Q(winner=F(other))),
+        undecided=Count('id', filter=Q(winner__isnull=True)),
+    ).order_by()
+
+
+def _add_record(records, key, item):
+    record = records.setdefault(key, {'matches': 0, 'wins': 0, 'losses': 0, 'no_results': 0})
+    record['matches'] += item['played']
+    record['wins'] += item['won']
+    record['losses'] += item['lost']
+    record['no_results'] += item['undecided']
+
+
+def team_records(seasons=None):
+    """Return ``(season, team_id, played, won)`` for every team in one grouped query.
+
+    Each match contributes one appearance for team1 and one for team2; the
+    two appearance lists are combined with UNION ALL and grouped once, instead
+    of counting per team.
+    """
+    connection = connections[router.db_for_read(Match)]
+    qn = connection.ops.quote_name
+    where = ''
+    params = []
+    if seasons is not None:
+        seasons = list(seasons)
+        where = 'WHERE {} IN ({})'.format(qn('season'), ', '.join(['%s'] * len(seasons)))
+        params = seasons
+
+    appearances = ' UNION ALL '.join(
+        'SELECT {season}, {team} AS team_id, CASE WHEN {winner} = {team} THEN 1 ELSE 0 END AS won '
+        'FROM {table} {where}'.format(
+            season=qn('season'), team=qn(column), winner=qn('winner_id'),
+            table=qn(Match._meta.db_table), where=where,
+        )
+        for column in ('team1_id', 'team2_id')
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT season, team_id, COUNT(*), SUM(won) FROM ({}) appearances '
+            'GROUP BY season, team_id'.format(appearances),
+            params * 2,
+        )
+        return cursor.fetchall()
+
+
+def _team_stats(seasons):
+    stats = {}
+
+    def row(season, team_id):
+        if (season, team_id) not in stats:
+            stats[season, team_id] = SeasonTeamStats(season=season, team_id=team_id)
+        return stats[season, team_id]
+
+    for season, team_id, played, won in team_records(seasons):
+        item = row(season, team_id)
+        item.matches_played = played
+        item.matches_won = won
+
+    extras = Delivery.objects.filter(season__in=seasons).values(
+        'season', 'bowling_team'
+    ).annotate(extra_runs=Sum('extra_runs'))
+    for item in extras.order_by():
+        row(item['season'], item['bowling_team']).extra_runs_conceded = item['extra_runs'] or 0
+
+    return list(stats.values())
+
+
+def _bowler_stats(seasons):
+    bowlers = Delivery.objects.filter(season__in=seasons).values(
+        'season', 'bowler'
+    ).annotate(
+        balls=Count('id'),
+        legal_balls=Count('id', filter=Q(wide_runs=0, noball_runs=0)),
+        runs_conceded=Sum(BOWLER_RUNS),
+        wickets=Count('id', filter=BOWLER_WICKET),
+    )
+    return [
+        SeasonBowlerStats(
+            season=item['season'],
+            bowler_id=item['bowler'],
+            balls=item['balls'],
+            legal_balls=item['legal_balls'],
+            runs_conceded=item['runs_conceded'] or 0,
+            wickets=item['wickets'],
+        )
+        for item in bowlers.order_by()
+    ]
+
+
+def _batting_stats(seasons):
+    deliveries = Delivery.objects.filter(season__in=seasons)
+    stats = {}
+    batsmen = deliveries.values('season', 'batsman').annotate(
+        runs=Sum('batsman_runs'),
+        balls=Count('id', filter=Q(wide_runs=0)),
+        fours=Count('id', filter=Q(batsman_runs=4)),
+        sixes=Count('id', filter=Q(batsman_runs=6)),
+    )
+    for item in batsmen.order_by():
+        stats[item['season'], item['batsman']] = SeasonBattingStats(
+            season=item['season'],
+            batsman_id=item['batsman'],
+            runs=item['runs'] or 0,
+            balls=item['balls'],
+            fours=item['fours'],
+            sixes=item['sixes'],
+        )
+
+    # A run-out non-striker is dismissed without facing the ball
+    dismissed = deliveries.filter(player_dismissed__isnull=False).values(
+        'season', 'player_dismissed'
+    ).annotate(dismissals=Count('id'))
+    for item in dismissed.order_by():
+        key = (item['season'], item['player_dismissed'])
+        if key not in stats:
+            stats[key] = SeasonBattingStats(season=key[0], batsman_id=key[1])
+        stats[key].dismissals = item['dismissals']
+    return list(stats.values())
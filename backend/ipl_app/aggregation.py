@@ -0,0 +1,227 @@
+"""Compile validated ad-hoc aggregation specs into a single grouped query.
+
+A spec names group-by dimensions, metrics, filters, an ordering and a limit,
+all checked against whitelists. The planner answers it from the smallest
+source that can serve every dimension, filter and metric: the per-season
+summary tables when possible, otherwise Delivery.
+"""
+from functools import reduce
+from operator import mul
+from django.conf import settings
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, NullIf
+from .aggregates import BOWLER_RUNS, BOWLER_WICKET
+from .models import Delivery, SeasonTeamStats, SeasonBowlerStats
+
+LEGAL_BALL = Q(wide_runs=0, noball_runs=0)
+
+# Rough number of distinct values per dimension, used to bound the result size
+DIMENSION_CARDINALITY = {
+    'season': 20,
+    'batting_team': 20,
+    'bowling_team': 20,
+    'bowler': 600,
+    'batsman': 700,
+    'venue': 60,
+    'over': 20,
+    'inning': 4,
+}
+INTEGER_FILTERS = {'batting_team', 'bowling_team', 'bowler', 'batsman', 'over', 'inning', 'match'}
+# Filters whose values never contain commas, so ``season=2016,2017`` may list several;
+# others (venue names such as "MA Chidambaram Stadium, Chepauk") take repeated parameters
+COMMA_SEPARATED_FILTERS = INTEGER_FILTERS | {'season'}
+
+
+class InvalidSpec(ValueError):
+    pass
+
+
+def _ratio(numerator, denominator, scale):
+    return ExpressionWrapper(
+        Cast(numerator, FloatField()) * scale / NullIf(denominator, 0), output_field=FloatField()
+    )
+
+
+class Source:
+    """One table the planner can answer from.
+
+    ``dimensions`` maps a dimension to its ORM fields (``[label]`` or
+    ``[id, label]``), ``filters`` maps a filter to its lookup and ``metrics``
+    maps a metric to a factory returning a fresh aggregate expression.
+    """
+
+    def __init__(self, name, model, dimensions, filters, metrics):
+        self.name = name
+        self.model = model
+        self.dimensions = dimensions
+        self.filters = filters
+        self.metrics = metrics
+
+    def supports(self, spec):
+        return (set(spec.group_by) <= set(self.dimensions)
+                and set(spec.filters) <= set(self.filters)
+                and set(spec.metrics) <= set(self.metrics))
+
+
+SOURCES = [
+    Source(
+        'season_team_stats', SeasonTeamStats,
+        dimensions={'season': ['season'], 'bowling_team': ['team', 'team__name']},
+        filters={'season': 'season', 'bowling_team': 'team'},
+        metrics={'extras': lambda: Sum('extra_runs_conceded')},
+    ),
+    Source(
+        'season_bowler_stats', SeasonBowlerStats,
+        dimensions={'season': ['season'], 'bowler': ['bowler', 'bowler__name']},
+        filters={'season': 'season', 'bowler': 'bowler'},
+        # runs_conceded leaves out byes and leg byes, so it only answers the bowler's runs metric
+        metrics={
+            'runs_conceded': lambda: Sum('runs_conceded'),
+            'deliveries': lambda: Sum('balls'),
+            'balls': lambda: Sum('legal_balls'),
+            'wickets': lambda: Sum('wickets'),
+            'economy': lambda: _ratio(Sum('runs_conceded'), Sum('legal_balls'), 6),
+        },
+    ),
+    Source(
+        'delivery', Delivery,
+        dimensions={
+            'season': ['season'],
+            'batting_team': ['batting_team', 'batting_team__name'],
+            'bowling_team': ['bowling_team', 'bowling_team__name'],
+            'bowler': ['bowler', 'bowler__name'],
+            'batsman': ['batsman', 'batsman__name'],
+            'venue': ['match__venue'],
+            'over': ['over'],
+            'inning': ['inning'],
+        },
+        filters={
+            'season': 'season', 'batting_team': 'batting_team', 'bowling_team': 'bowling_team',
+            'bowler': 'bowler', 'batsman': 'batsman', 'venue': 'match__venue', 'over': 'over',
+            'inning': 'inning', 'match': 'match__match_id',
+        },
+        metrics={
+            'runs': lambda: Sum('total_runs'),
+            'runs_conceded': lambda: Sum(BOWLER_RUNS),
+            'batsman_runs': lambda: Sum('batsman_runs'),
+            'extras': lambda: Sum('extra_runs'),
+            'deliveries': lambda: Count('id'),
+            'balls': lambda: Count('id', filter=LEGAL_BALL),
+            'wickets': lambda: Count('id', filter=BOWLER_WICKET),
+            'economy': lambda: _ratio(Sum(BOWLER_RUNS), Count('id', filter=LEGAL_BALL), 6),
+            'strike_rate': lambda: _ratio(Sum('batsman_runs'), Count('id', filter=Q(wide_runs=0)), 100),
+        },
+    ),
+]
+METRICS = list(SOURCES[-1].metrics)
+FILTERS = list(SOURCES[-1].filters)
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class AggregateSpec:
+    def __init__(self, group_by, metrics, filters, order, limit):
+        self.group_by = group_by
+        self.metrics = metrics
+        self.filters = filters
+        self.order = order
+        self.limit = limit
+
+    @classmethod
+    def from_params(cls, params):
+        """Validate query parameters such as ``group_by=season,bowler&metrics=economy&season=2016&order=economy``.
+
+        ``params`` is a QueryDict; a filter may be repeated to match any of its values.
+        """
+        group_by = sorted(set(_split(params.get('group_by', ''))))
+        metrics = sorted(set(_split(params.get('metrics', ''))))
+        if not metrics:
+            raise InvalidSpec('At least one metric is required.')
+        unknown = sorted(set(group_by) - set(DIMENSION_CARDINALITY)) + sorted(set(metrics) - set(METRICS))
+        if unknown:
+            raise InvalidSpec(f'Unknown dimensions or metrics: {", ".join(unknown)}')
+        if len(group_by) > settings.IPL_AGGREGATE_MAX_DIMENSIONS:
+            raise InvalidSpec(f'At most {settings.IPL_AGGREGATE_MAX_DIMENSIONS} group-by dimensions are allowed.')
+
+        filters = {}
+        for name in FILTERS:
+            raw = params.getlist(name)
+            if name in COMMA_SEPARATED_FILTERS:
+                raw = [item for value in raw for item in value.split(',')]
+            values = sorted({value.strip() for value in raw if value.strip()})
+            if not values:
+                continue
+            if name in INTEGER_FILTERS and not all(value.isdigit() for value in values):
+                raise InvalidSpec(f'Filter {name} takes integers.')
+            filters[name] = values
+
+        order = _split(params.get('order', '')) or list(group_by)
+        for item in order:
+            if item.lstrip('-') not in group_by + metrics:
+                raise InvalidSpec(f'Cannot order by {item}: not a requested dimension or metric.')
+
+        limit = params.get('limit', str(settings.IPL_AGGREGATE_DEFAULT_LIMIT))
+        if not limit.isdigit() or not 0 < int(limit) <= settings.IPL_AGGREGATE_MAX_LIMIT:
+            raise InvalidSpec(f'limit must be between 1 and {settings.IPL_AGGREGATE_MAX_LIMIT}.')
+
+        spec = cls(group_by, metrics, filters, order, int(limit))
+        if spec.estimated_groups() > settings.IPL_AGGREGATE_MAX_GROUPS:
+            raise InvalidSpec('This grouping could produce too many rows; add filters on the grouped dimensions.')
+        return spec
+
+    def estimated_groups(self):
+        """Upper bound on the number of groups, counting a filtered dimension by its filter values."""
+        return reduce(mul, (
+            len(self.filters[name]) if name in self.filters else DIMENSION_CARDINALITY[name]
+            for name in self.group_by
+        ), 1)
+
+    def normalized(self):
+        return {
+            'group_by': self.group_by,
+            'metrics': self.metrics,
+            'filters': self.filters,
+            'order': self.order,
+            'limit': self.limit,
+        }
+
+    def plan(self):
+        """The first (smallest) source able to answer the whole spec."""
+        return next(source for source in SOURCES if source.supports(self))
+
+    def run(self):
+        """Return ``(source name, rows)`` computed by one grouped query."""
+        source = self.plan()
+        queryset = source.model.objects.all()
+        for name, values in self.filters.items():
+            queryset = queryset.filter(**{f'{source.filters[name]}__in': values})
+
+        annotations = {f'metric_{name}': source.metrics[name]() for name in self.metrics}
+        if not self.group_by:
+            return source.name, [self.format_row(source, queryset.aggregate(**annotations))]
+
+        fields = [field for name in self.group_by for field in source.dimensions[name]]
+        queryset = queryset.values(*fields).annotate(**annotations)
+
+        ordering = []
+        for item in self.order:
+            descending, name = item.startswith('-'), item.lstrip('-')
+            field = f'metric_{name}' if name in self.metrics else source.dimensions[name][-1]
+            ordering.append(F(field).desc(nulls_last=True) if descending else F(field).asc(nulls_last=True))
+        queryset = queryset.order_by(*ordering)[:self.limit]
+
+        return source.name, [self.format_row(source, item) for item in queryset]
+
+    def format_row(self, source, item):
+        row = {}
+        for name in self.group_by:
+            dimension_fields = source.dimensions[name]
+            row[name] = item[dimension_fields[-1]]
+            if len(dimension_fields) == 2:
+                row[f'{name}_id'] = item[dimension_fields[0]]
+        for name in self.metrics:
+            value = item[f'metric_{name}']
+            row[name] = round(value, 2) if isinstance(value, float) else value
+        return row
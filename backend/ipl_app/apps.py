@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class IplAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'ipl_app'
+
+    def ready(self):
+        from django.core.signals import request_started
+        from django.db.backends.signals import connection_created
+        from .bluegreen import on_request_started, refresh_active_database, remember_database_name
+        from .database import apply_sqlite_pragmas
+        from .instrumentation import install_query_recorder
+        connection_created.connect(apply_sqlite_pragmas)
+        connection_created.connect(install_query_recorder)
+        connection_created.connect(remember_database_name)
+        request_started.connect(on_request_started)
+        # Serve the active blue/green build, if there is one, from the first request
+        refresh_active_database(force=True)
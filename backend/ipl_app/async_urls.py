@@ -0,0 +1,38 @@
+"""Async versions of the read-only API endpoints, mounted by ``ipl_project.asgi_urls``.
+
+Each keeps the URL and name of its sync counterpart in ``ipl_app.urls``;
+exports stream through ``as_async_stream``; anything not listed (list/create
+views) falls through to the sync view.
+"""
+from django.urls import path
+from . import urls
+from .async_views import as_async, as_async_stream
+
+ASYNC_URL_NAMES = {
+    'matches-per-year',
+    'team-wins-stacked',
+    'extra-runs-per-team',
+    'economical-bowlers',
+    'matches-played-vs-won-all-seasons',
+    'matches-played-vs-won',
+    'season-dashboard',
+    'season-leaderboard',
+    'aggregate',
+    'head-to-head',
+    'venue-records',
+    'player-stats',
+    'name-search',
+    'available-years',
+    'teams-list',
+}
+ASYNC_STREAMING_URL_NAMES = {'export'}
+
+urlpatterns = [
+    path(str(pattern.pattern), as_async(pattern.callback), name=pattern.name)
+    for pattern in urls.urlpatterns
+    if pattern.name in ASYNC_URL_NAMES
+] + [
+    path(str(pattern.pattern), as_async_stream(pattern.callback), name=pattern.name)
+    for pattern in urls.urlpatterns
+    if pattern.name in ASYNC_STREAMING_URL_NAMES
+]
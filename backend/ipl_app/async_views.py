@@ -0,0 +1,127 @@
+"""Async entry points for the read-only API, served through ``ipl_project.asgi``.
+
+Under ASGI Django runs every sync view in one shared thread, so a slow
+aggregate stalls all other requests. ``as_async`` wraps an existing view so
+it runs in a bounded thread pool of ``IPL_ASYNC_MAX_WORKERS`` threads
+instead, and concurrent identical GET requests await a single in-flight
+computation rather than each starting their own.
+
+``as_async_stream`` does the same for streaming views such as the exports:
+Django would otherwise collect a sync ``StreamingHttpResponse`` into one list
+before sending it, so their chunks are pulled one at a time instead.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import HttpResponse
+from .bluegreen import refresh_active_database
+
+_executor = None
+_executor_lock = threading.Lock()
+# (event loop, path, query, Accept) -> task computing that response
+_inflight = {}
+_stats_lock = threading.Lock()
+_stats = {'computed': 0, 'coalesced': 0}
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'IPL_ASYNC_MAX_WORKERS', 8), thread_name_prefix='ipl-async'
+                )
+    return _executor
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def coalescing_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_coalescing_stats():
+    with _stats_lock:
+        _stats.update(computed=0, coalesced=0)
+
+
+def _run_view(view, request, args, kwargs):
+    """Call and render a DRF view in a pool thread; returns its (status, content type, body)."""
+    try:
+        # Pool threads never see request_started either
+        refresh_active_database()
+        response = view(request, *args, **kwargs)
+        response.render()
+        return response.status_code, response['Content-Type'], response.content
+    finally:
+        # Pool threads never see request_finished, so close their connection here as it would
+        close_old_connections()
+
+
+def _request_key(request):
+    query = tuple((key, tuple(request.GET.getlist(key))) for key in sorted(request.GET))
+    # The Accept header picks the renderer, so it is part of the response's identity
+    return id(asyncio.get_running_loop()), request.path, query, request.headers.get('Accept', '')
+
+
+def as_async(view):
+    """An async view returning the same rendered response body as the DRF ``view``."""
+    run = sync_to_async(_run_view, thread_sensitive=False, executor=_get_executor())
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            status, content_type, content = await run(view, request, args, kwargs)
+        else:
+            key = _request_key(request)
+            task = _inflight.get(key)
+            if task is None:
+                _count('computed')
+                task = asyncio.ensure_future(run(view, request, args, kwargs))
+                _inflight[key] = task
+                task.add_done_callback(lambda _: _inflight.pop(key, None))
+            else:
+                _count('coalesced')
+            # A client disconnecting must not cancel the computation others are awaiting
+            status, content_type, content = await asyncio.shield(task)
+        return HttpResponse(content, status=status, content_type=content_type)
+
+    wrapper.sync_view = view
+    return wrapper
+
+
+def _next_chunk(iterator):
+    return next(iterator, None)
+
+
+async def iterate_in_thread(chunks):
+    """Async iterator over a sync chunk iterator, advancing it one chunk per call off the event loop."""
+    # The database cursor behind the chunks must stay on one thread, the one request_finished closes
+    advance = sync_to_async(_next_chunk, thread_sensitive=True)
+    iterator = iter(chunks)
+    while (chunk := await advance(iterator)) is not None:
+        yield chunk
+
+
+def as_async_stream(view):
+    """An async view streaming the response of the sync streaming ``view`` without buffering it."""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        # Only validates the request and builds the lazy chunk generator; no queries run here
+        response = view(request, *args, **kwargs)
+        if response.streaming and not response.is_async:
+            response.streaming_content = iterate_in_thread(response.streaming_content)
+        return response
+
+    wrapper.sync_view = view
+    return wrapper
@@ -0,0 +1,149 @@
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack, contextmanager
+from django.db import connection, connections, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .bluegreen import point_aliases_at
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak RSS is then not reported
+    resource = None
+
+RESULTS_FORMAT = 1
+
+
+@contextmanager
+def scratch_database(directory):
+    """Run the enclosed block against a freshly migrated on-disk SQLite file.
+
+    Benchmarks must never touch the live ``db.sqlite3``; this reuses Django's
+    test database machinery but points it at ``directory`` so timings reflect
+    real file I/O rather than an in-memory database.
+    """
+    old_name = connection.settings_dict['NAME']
+    connection.settings_dict['TEST']['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    # Other aliases of the same file, i.e. the analytics connection, follow it
+    replicas = [alias for alias in connections if alias != connection.alias
+                and connections[alias].settings_dict['NAME'] == old_name]
+    point_aliases_at(replicas, connection.settings_dict['NAME'])
+    try:
+        yield connection.settings_dict['NAME']
+    finally:
+        point_aliases_at(replicas, old_name)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def median_ms(function, repeat=5):
+    """Call ``function`` ``repeat`` times and return the median wall time in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def peak_rss_mb():
+    """High-water mark of this process's resident memory, or None where it can't be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def suite_endpoints(seasons, player_id, teams):
+    """(label, URL) of every endpoint the suite measures."""
+    first, last = seasons[0], seasons[-1]
+    return [
+        ('matches-per-year', reverse('matches-per-year')),
+        ('team-wins-stacked', reverse('team-wins-stacked')),
+        ('available-years', reverse('available-years')),
+        ('extra-runs-per-team', reverse('extra-runs-per-team', kwargs={'year': last})),
+        ('economical-bowlers', reverse('economical-bowlers', kwargs={'year': last})),
+        ('economical-bowlers all seasons', reverse('economical-bowlers', kwargs={'year': 'all'})),
+        ('matches-played-vs-won', reverse('matches-played-vs-won', kwargs={'year': last})),
+        ('matches-played-vs-won all seasons', reverse('matches-played-vs-won-all-seasons')),
+        ('season-dashboard', reverse('season-dashboard', kwargs={'year': last})),
+        ('season-leaderboard range', reverse('season-leaderboard', kwargs={'year': f'{first}-{last}'}) + '?stat=economy'),
+        ('player-stats', reverse('player-stats', kwargs={'player_id': player_id})),
+        ('head-to-head', reverse('head-to-head') + f'?team={teams[0]}&opponent={teams[1]}'),
+        ('aggregate by season and bowler', reverse('aggregate') + f'?group_by=bowler&metrics=economy,wickets&season={last}'),
+        ('aggregate by over', reverse('aggregate') + '?group_by=over&metrics=runs,balls'),
+        ('name-search', reverse('name-search') + '?q=mumbai pl'),
+        ('match list', reverse('match-list-create') + f'?season={last}'),
+        ('delivery list', reverse('delivery-list') + f'?season={last}&page_size=1000'),
+    ]
+
+
+def measure_endpoint(client, url, repeat=5):
+    """Latency, query count and peak Python allocations of one GET, after a warm-up request."""
+    response = client.get(url)
+    if response.status_code != 200:
+        raise RuntimeError(f'{url} returned {response.status_code}')
+    # Each request resets the DEBUG query log, so start the capture from an empty one.
+    # Reads go to the analytics alias, so capture on every connection.
+    reset_queries()
+    with ExitStack() as stack:
+        captures = [stack.enter_context(CaptureQueriesContext(wrapper)) for wrapper in connections.all()]
+        client.get(url)
+    # Read now: the next request resets the query log again
+    query_count = sum(len(capture) for capture in captures)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    tracemalloc.start()
+    try:
+        client.get(url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'queries': query_count,
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def compare_results(baseline, current, threshold=0.2, min_ms=1.0):
+    """Regressions of ``current`` against ``baseline`` suite results, as readable lines.
+
+    A timing or memory figure regresses when it grows by more than
+    ``threshold`` (and, for timings, by more than ``min_ms`` so noise on
+    fast endpoints doesn't count); any extra query is a regression.
+    """
+    regressions = []
+
+    def check(label, before, after, unit, floor):
+        if before is None or after is None:
+            return
+        if after > before * (1 + threshold) and after - before > floor:
+            regressions.append(f'{label}: {before}{unit} -> {after}{unit}')
+
+    for scale, result in current['scales'].items():
+        previous = baseline['scales'].get(scale)
+        if previous is None:
+            continue
+        check(f'{scale} ingest', previous['ingest_s'], result['ingest_s'], 's', min_ms / 1000)
+        check(f'{scale} ingest peak RSS', previous['ingest_peak_rss_mb'], result['ingest_peak_rss_mb'], ' MB', 1)
+        for name, metrics in result['endpoints'].items():
+            before = previous['endpoints'].get(name)
+            if before is None:
+                continue
+            check(f'{scale} {name}', before['median_ms'], metrics['median_ms'], ' ms', min_ms)
+            check(f'{scale} {name} peak memory', before['peak_kb'], metrics['peak_kb'], ' KB', 64)
+            if metrics['queries'] > before['queries']:
+                regressions.append(f'{scale} {name}: {before["queries"]} -> {metrics["queries"]} queries')
+    return regressions
+
@@ -0,0 +1,210 @@
+"""Blue/green database builds: load into a new SQLite file, validate it, then switch.
+
+Builds live in ``IPL_DATABASES_DIR`` as ``ipl-<timestamp>.sqlite3``; the
+``ACTIVE`` file there names the one being served and is replaced atomically
+to switch. Every process checks ``ACTIVE`` at the start of each request (at
+most every ``IPL_DATASET_VERSION_TTL`` seconds) and moves its database
+aliases to the newly active file; connections still open on the previous
+file are closed as soon as their thread is between requests. Each build
+carries its own ``DatasetVersion`` row, so chart cache keys and ETags
+follow the active build, including on rollback.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.migrations.executor import MigrationExecutor
+from .dataset import forget_dataset_version
+from .models import DatasetVersion, Delivery, Match, SeasonTeamStats
+
+POINTER_NAME = 'ACTIVE'
+BUILD_PREFIX = 'ipl-'
+BUILD_SUFFIX = '.sqlite3'
+
+_lock = threading.Lock()
+# Build named by ACTIVE when this process last looked, when that was, and the
+# database served before any build (DATABASE_PATH unless e.g. under tests)
+_active = {'name': None, 'checked': 0.0, 'base': None}
+
+
+class InvalidBuild(Exception):
+    pass
+
+
+def builds_dir():
+    return settings.IPL_DATABASES_DIR
+
+
+def build_path(name):
+    return os.path.join(builds_dir(), name)
+
+
+def list_builds():
+    """Build file names, oldest first."""
+    if not os.path.isdir(builds_dir()):
+        return []
+    return sorted(
+        name for name in os.listdir(builds_dir())
+        if name.startswith(BUILD_PREFIX) and name.endswith(BUILD_SUFFIX)
+    )
+
+
+def read_active():
+    """Name of the active build, or None before the first blue/green load."""
+    try:
+        with open(build_path(POINTER_NAME), encoding='utf-8') as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def build_version(path):
+    """The ``DatasetVersion`` token stored in a build file, read without Django."""
+    with closing(sqlite3.connect(path)) as database:
+        row = database.execute('SELECT version FROM ipl_app_datasetversion WHERE id = 1').fetchone()
+    return row[0] if row else None
+
+
+def _database_aliases():
+    """Aliases opening the default database file, i.e. ``default`` and the analytics reader."""
+    name = settings.DATABASES[DEFAULT_DB_ALIAS]['NAME']
+    return [alias for alias in settings.DATABASES if settings.DATABASES[alias]['NAME'] == name]
+
+
+def _close(wrapper):
+    # The SQLite wrapper ignores close() on in-memory databases (as in tests); really close it
+    BaseDatabaseWrapper.close(wrapper)
+
+
+def point_aliases_at(aliases, name):
+    for alias in aliases:
+        _close(connections[alias])
+        # Wrappers in every thread share this dict, and new ones are created from it
+        settings.DATABASES[alias]['NAME'] = name
+        connections[alias].settings_dict['NAME'] = name
+
+
+@contextmanager
+def using_database(path):
+    """Point this process's database aliases at ``path`` for the enclosed block."""
+    aliases = _database_aliases()
+    previous = settings.DATABASES[DEFAULT_DB_ALIAS]['NAME']
+    point_aliases_at(aliases, path)
+    try:
+        yield
+    finally:
+        point_aliases_at(aliases, previous)
+
+
+def remember_database_name(sender, connection, **kwargs):
+    """``connection_created`` receiver recording which file a connection opened."""
+    connection.opened_database_name = connection.settings_dict['NAME']
+
+
+def close_stale_connections():
+    """Close this thread's connections opened on a build that is no longer active."""
+    for alias in settings.DATABASES:
+        wrapper = connections[alias]
+        if (wrapper.connection is not None and not wrapper.in_atomic_block
+                and getattr(wrapper, 'opened_database_name', None) != wrapper.settings_dict['NAME']):
+            _close(wrapper)
+
+
+def refresh_active_database(force=False):
+    """Follow ``ACTIVE`` if another process switched builds; returns the active build name."""
+    now = time.monotonic()
+    if force or now - _active['checked'] >= settings.IPL_DATASET_VERSION_TTL:
+        with _lock:
+            name = read_active()
+            _active['checked'] = now
+            if name != _active['name']:
+                if _active['name'] is None:
+                    _active['base'] = settings.DATABASES[DEFAULT_DB_ALIAS]['NAME']
+                # Without ACTIVE, e.g. after rolling back past the first build, serve the original database
+                path = build_path(name) if name else _active['base']
+                for alias in _database_aliases():
+                    settings.DATABASES[alias]['NAME'] = path
+                _active['name'] = name
+                forget_dataset_version()
+    close_stale_connections()
+    return _active['name']
+
+
+def on_request_started(sender, **kwargs):
+    refresh_active_database()
+
+
+def validate_build(path):
+    """Raise ``InvalidBuild`` unless the file at ``path`` is complete enough to serve."""
+    if not os.path.exists(path):
+        raise InvalidBuild(f'{path} does not exist')
+    with closing(sqlite3.connect(path)) as database:
+        result = database.execute('PRAGMA quick_check').fetchone()[0]
+    if result != 'ok':
+        raise InvalidBuild(f'{path} failed the integrity check: {result}')
+
+    with using_database(path):
+        connection = connections[DEFAULT_DB_ALIAS]
+        executor = MigrationExecutor(connection)
+        if executor.migration_plan(executor.loader.graph.leaf_nodes()):
+            raise InvalidBuild(f'{path} has unapplied migrations')
+        if not Match.objects.exists() or not Delivery.objects.exists():
+            raise InvalidBuild(f'{path} has no matches or deliveries')
+        seasons = set(Match.objects.values_list('season', flat=True).distinct())
+        summarized = set(SeasonTeamStats.objects.values_list('season', flat=True).distinct())
+        if seasons - summarized:
+            raise InvalidBuild(f'{path} has no season summaries for {", ".join(sorted(seasons - summarized))}')
+        if not DatasetVersion.objects.filter(pk=1).exists():
+            raise InvalidBuild(f'{path} has no dataset version')
+
+
+def activate_build(name):
+    """Atomically make ``name`` the build every process serves."""
+    if name not in list_builds():
+        raise InvalidBuild(f'No build named {name} in {builds_dir()}')
+    pointer = build_path(POINTER_NAME)
+    temporary = f'{pointer}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as handle:
+        handle.write(name)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, pointer)
+    return refresh_active_database(force=True)
+
+
+def deactivate_builds():
+    """Go back to serving the database configured in settings, ``DATABASE_PATH``, in every process."""
+    try:
+        os.remove(build_path(POINTER_NAME))
+    except FileNotFoundError:
+        pass
+    return refresh_active_database(force=True)
+
+
+def prune_builds(keep):
+    """Delete all but the newest ``keep`` inactive builds; returns the deleted names."""
+    active = read_active()
+    inactive = [name for name in list_builds() if name != active]
+    stale = inactive[:max(len(inactive) - keep, 0)]
+    for name in stale:
+        delete_build(name)
+    return stale
+
+
+def delete_build(name):
+    for suffix in ('', '-wal', '-shm'):
+        try:
+            os.remove(build_path(name) + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def new_build_name():
+    # Names sort in build order
+    now = time.time_ns()
+    stamp = time.strftime('%Y%m%d-%H%M%S', time.localtime(now // 10**9))
+    return f'{BUILD_PREFIX}{stamp}.{now % 10**9:09d}{BUILD_SUFFIX}'
@@ -0,0 +1,137 @@
+import functools
+import hashlib
+import json
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpRequest
+from django.urls import resolve, reverse
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from .dataset import get_dataset_version
+from .models import Match
+
+# (url name, takes a year) of every cached chart endpoint, used for warm-up
+CHART_URLS = [
+    ('matches-per-year', False),
+    ('team-wins-stacked', False),
+    ('matches-played-vs-won-all-seasons', False),
+    ('available-years', False),
+    ('head-to-head', False),
+    ('extra-runs-per-team', True),
+    ('economical-bowlers', True),
+    ('matches-played-vs-won', True),
+    ('season-dashboard', True),
+]
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+def chart_cache():
+    """Return the chart cache, or None when IPL_CHART_CACHE_ALIAS disables caching."""
+    alias = getattr(settings, 'IPL_CHART_CACHE_ALIAS', 'charts')
+    return caches[alias] if alias else None
+
+
+def _count(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.update(hits=0, misses=0)
+
+
+def chart_cache_key(name, kwargs, query_params):
+    """Key for one chart response; the dataset version makes keys from older loads unreachable.
+
+    Payloads are cached before rendering, so the ``?format=`` override shares its entry.
+    """
+    parts = [f'{key}={value}' for key, value in sorted(kwargs.items())]
+    parts += [
+        f'{key}={",".join(query_params.getlist(key))}'
+        for key in sorted(query_params) if key != api_settings.URL_FORMAT_OVERRIDE
+    ]
+    return _key(name, '&'.join(parts))
+
+
+def _key(name, arguments):
+    # Hash the arguments so keys stay short and free of spaces, as memcached requires
+    digest = hashlib.sha1(arguments.encode('utf-8')).hexdigest()
+    return f'ipl:{get_dataset_version()}:{name}:{digest}'
+
+
+def cached_chart(name):
+    """Cache the successful payloads of a read-only chart view under the dataset version.
+
+    Apply below ``@api_view`` so the wrapped function receives a DRF request.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            cache = chart_cache()
+            if cache is None:
+                return view(request, *args, **kwargs)
+
+            key = chart_cache_key(name, kwargs, request.query_params)
+            data = cache.get(key)
+            if data is not None:
+                _count('hits')
+                return Response(data)
+
+            _count('misses')
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout=None)
+            return response
+        return wrapper
+    return decorator
+
+
+def cached_result(name, params, compute):
+    """Return ``compute()`` cached under the dataset version and the JSON-normalized ``params``."""
+    cache = chart_cache()
+    if cache is None:
+        return compute()
+
+    key = _key(name, json.dumps(params, sort_keys=True, separators=(',', ':')))
+    result = cache.get(key)
+    if result is not None:
+        _count('hits')
+        return result
+
+    _count('misses')
+    result = compute()
+    cache.set(key, result, timeout=None)
+    return result
+
+
+def warm_chart_cache():
+    """Compute every cached chart, including each per-season chart for every season.
+
+    Only useful with a cache backend shared between processes; the local-memory
+    default is per process, so it warms just the calling process.
+    """
+    seasons = list(Match.objects.values_list('season', flat=True).distinct().order_by('season'))
+    warmed = 0
+    for url_name, per_season in CHART_URLS:
+        for kwargs in ([{'year': season} for season in seasons] if per_season else [{}]):
+            request = HttpRequest()
+            request.method = 'GET'
+            request.path = reverse(url_name, kwargs=kwargs)
+            match = resolve(request.path)
+            # Under the ASGI URL configuration the route resolves to an async wrapper
+            view = getattr(match.func, 'sync_view', match.func)
+            view(request, *match.args, **match.kwargs)
+            warmed += 1
+    return warmed
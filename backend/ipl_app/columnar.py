@@ -0,0 +1,253 @@
+import os
+import threading
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from .aggregates import NON_BOWLER_DISMISSALS
+from .dataset import get_dataset_version
+from .instrumentation import warmup
+from .models import Team, Player, Match, Delivery
+from .snapshot import Snapshot
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, only needed for IPL_ANALYTICS_ENGINE = 'columnar'
+    np = None
+
+
+def _encode(ids, values):
+    """Map primary keys to dense codes (positions in the sorted ``ids``); None or -1 becomes -1."""
+    if not isinstance(values, np.ndarray):
+        values = [-1 if value is None else value for value in values]
+    values = np.asarray(values, dtype=np.int64)
+    codes = np.searchsorted(ids, values).astype(np.int32)
+    codes[values < 0] = -1
+    return codes
+
+
+class ColumnarDataset:
+    """Match and Delivery held as NumPy columns, with dictionary-encoded teams, players and seasons.
+
+    Team, player and season columns hold dense codes indexing ``team_names``,
+    ``player_names`` and ``seasons`` (-1 for a missing team or player), so
+    every chart is a ``bincount`` over ``season * width + code``. Exposes the
+    same query methods as ``engines.OrmEngine``.
+    """
+
+    def __init__(self, seasons, team_names, player_names, matches, deliveries, version=None):
+        self.seasons_list = list(seasons)
+        self.team_names = list(team_names)
+        self.player_names = list(player_names)
+        self.matches = matches
+        self.deliveries = deliveries
+        self.version = version
+        self.season_codes = {season: code for code, season in enumerate(self.seasons_list)}
+        self._team_matrices = None
+
+    @classmethod
+    def from_database(cls, version=None):
+        if np is None:
+            raise ImproperlyConfigured('The columnar analytics engine requires numpy')
+
+        teams = list(Team.objects.order_by('id').values_list('id', 'name'))
+        players = list(Player.objects.order_by('id').values_list('id', 'name'))
+        team_ids = np.array([pk for pk, _ in teams], dtype=np.int64)
+        player_ids = np.array([pk for pk, _ in players], dtype=np.int64)
+
+        match_rows = list(Match.objects.values_list('season', 'team1_id', 'team2_id', 'winner_id').order_by())
+        seasons = sorted({row[0] for row in match_rows})
+        season_codes = {season: code for code, season in enumerate(seasons)}
+        season, team1, team2, winner = zip(*match_rows) if match_rows else ((),) * 4
+        matches = {
+            'season': np.array([season_codes[value] for value in season], dtype=np.int16),
+            'team1': _encode(team_ids, team1),
+            'team2': _encode(team_ids, team2),
+            'winner': _encode(team_ids, winner),
+        }
+
+        delivery_rows = list(Delivery.objects.values_list(
+            'season', 'bowling_team_id', 'bowler_id', 'total_runs', 'extra_runs', 'wide_runs', 'noball_runs',
+            'bye_runs', 'legbye_runs', 'player_dismissed_id', 'dismissal_kind',
+        ).order_by())
+        (season, bowling_team, bowler, total_runs, extra_runs, wide_runs, noball_runs,
+         bye_runs, legbye_runs, dismissed, kind) = zip(*delivery_rows) if delivery_rows else ((),) * 11
+        total_runs = np.array(total_runs, dtype=np.int32)
+        deliveries = {
+            'season': np.array([season_codes[value] for value in season], dtype=np.int16),
+            'bowling_team': _encode(team_ids, bowling_team),
+            'bowler': _encode(player_ids, bowler),
+            'total_runs': total_runs,
+            'extra_runs': np.array(extra_runs, dtype=np.int32),
+            'legal': (np.array(wide_runs, dtype=np.int32) == 0) & (np.array(noball_runs, dtype=np.int32) == 0),
+            'bowler_runs': total_runs - np.array(bye_runs, dtype=np.int32) - np.array(legbye_runs, dtype=np.int32),
+            'bowler_wicket': np.array([
+                player is not None and value not in NON_BOWLER_DISMISSALS for player, value in zip(dismissed, kind)
+            ], dtype=np.bool_),
+        }
+        return cls(seasons, [name for _, name in teams], [name for _, name in players],
+                   matches, deliveries, version=version)
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """Build the dataset from a memory-mapped ``snapshot.Snapshot`` without querying the database."""
+        if np is None:
+            raise ImproperlyConfigured('The columnar analytics engine requires numpy')
+
+        def names(table):
+            return np.array(snapshot.strings(table, 'name'), dtype=object)[snapshot.column(table, 'name')].tolist()
+
+        team_ids = snapshot.column('team', 'id')
+        player_ids = snapshot.column('player', 'id')
+
+        # Re-code the snapshot's season string tables to the sorted seasons that have matches
+        match_seasons = snapshot.strings('match', 'season')
+        match_season_codes = snapshot.column('match', 'season')
+        seasons = sorted({match_seasons[code] for code in np.unique(match_season_codes)})
+        season_codes = {season: code for code, season in enumerate(seasons)}
+
+        def recode_seasons(table):
+            lookup = np.array([season_codes.get(season, -1) for season in snapshot.strings(table, 'season')],
+                              dtype=np.int16)
+            return lookup[snapshot.column(table, 'season')] if len(lookup) else np.array([], dtype=np.int16)
+
+        matches = {
+            'season': recode_seasons('match'),
+            'team1': _encode(team_ids, snapshot.column('match', 'team1')),
+            'team2': _encode(team_ids, snapshot.column('match', 'team2')),
+            'winner': _encode(team_ids, snapshot.column('match', 'winner')),
+        }
+        excluded_kinds = np.array([kind in NON_BOWLER_DISMISSALS for kind in snapshot.strings('delivery', 'dismissal_kind')],
+                                  dtype=np.bool_)
+        bowler_excluded = excluded_kinds[snapshot.column('delivery', 'dismissal_kind')]
+        deliveries = {
+            'season': recode_seasons('delivery'),
+            'bowling_team': _encode(team_ids, snapshot.column('delivery', 'bowling_team')),
+            'bowler': _encode(player_ids, snapshot.column('delivery', 'bowler')),
+            'total_runs': snapshot.column('delivery', 'total_runs'),
+            'extra_runs': snapshot.column('delivery', 'extra_runs'),
+            'legal': (snapshot.column('delivery', 'wide_runs') == 0) & (snapshot.column('delivery', 'noball_runs') == 0),
+            'bowler_runs': (snapshot.column('delivery', 'total_runs') - snapshot.column('delivery', 'bye_runs')
+                            - snapshot.column('delivery', 'legbye_runs')),
+            'bowler_wicket': (snapshot.column('delivery', 'player_dismissed') >= 0) & ~bowler_excluded,
+        }
+        dataset = cls(seasons, names('team'), names('player'), matches, deliveries,
+                      version=snapshot.dataset_version)
+        dataset.snapshot = snapshot
+        return dataset
+
+    def team_matrices(self):
+        """(played, won, extra_runs, bowled) per season x team, computed once."""
+        if self._team_matrices is None:
+            width = len(self.team_names)
+            size = len(self.seasons_list) * width
+            matches, deliveries = self.matches, self.deliveries
+
+            match_season = matches['season'].astype(np.int64) * width
+            played = (np.bincount(match_season + matches['team1'], minlength=size)
+                      + np.bincount(match_season + matches['team2'], minlength=size))
+            has_winner = matches['winner'] >= 0
+            won = np.bincount(match_season[has_winner] + matches['winner'][has_winner], minlength=size)
+            bowling = deliveries['season'].astype(np.int64) * width + deliveries['bowling_team']
+            extra_runs = np.bincount(bowling, weights=deliveries['extra_runs'], minlength=size)
+            bowled = np.bincount(bowling, minlength=size)
+            self._team_matrices = tuple(
+                matrix[:size].astype(np.int64).reshape(len(self.seasons_list), width)
+                for matrix in (played, won, extra_runs, bowled)
+            )
+        return self._team_matrices
+
+    def seasons(self):
+        return list(self.seasons_list)
+
+    def matches_per_season(self):
+        counts = np.bincount(self.matches['season'], minlength=len(self.seasons_list))
+        return [{'season': season, 'matches_count': int(counts[code])}
+                for code, season in enumerate(self.seasons_list)]
+
+    def season_team_rows(self, season=None):
+        played, won, extra_runs, bowled = self.team_matrices()
+        if season is None:
+            codes = range(len(self.seasons_list))
+        elif season in self.season_codes:
+            codes = [self.season_codes[season]]
+        else:
+            codes = []
+
+        rows = []
+        for code in codes:
+            # A summary row exists for every team that played or bowled in the season
+            for team in np.flatnonzero((played[code] > 0) | (bowled[code] > 0)):
+                rows.append({
+                    'season': self.seasons_list[code],
+                    'team__name': self.team_names[team],
+                    'matches_played': int(played[code, team]),
+                    'matches_won': int(won[code, team]),
+                    'extra_runs_conceded': int(extra_runs[code, team]),
+                })
+        return sorted(rows, key=lambda row: (row['season'], row['team__name']))
+
+    def team_wins(self):
+        return [
+            {'season': row['season'], 'team__name': row['team__name'], 'matches_won': row['matches_won']}
+            for row in self.season_team_rows() if row['matches_won'] > 0
+        ]
+
+    def economical_bowlers(self, seasons=None, min_balls=60, limit=15):
+        deliveries = self.deliveries
+        if seasons is None:
+            selected = slice(None)
+        else:
+            codes = [self.season_codes[season] for season in seasons if season in self.season_codes]
+            selected = np.isin(deliveries['season'], codes)
+        bowler = deliveries['bowler'][selected]
+        width = len(self.player_names)
+
+        legal_balls = np.bincount(bowler, weights=deliveries['legal'][selected], minlength=width)
+        runs = np.bincount(bowler, weights=deliveries['bowler_runs'][selected], minlength=width)
+        wickets = np.bincount(bowler, weights=deliveries['bowler_wicket'][selected], minlength=width)
+        candidates = np.flatnonzero(legal_balls >= max(min_balls, 1))
+        economy = runs[candidates] * 6 / legal_balls[candidates]
+
+        ranked = sorted(range(len(candidates)),
+                        key=lambda i: (economy[i], self.player_names[candidates[i]], candidates[i]))
+        return [
+            {
+                'bowler__name': self.player_names[candidates[i]],
+                'legal': int(legal_balls[candidates[i]]),
+                'runs': int(runs[candidates[i]]),
+                'wickets_taken': int(wickets[candidates[i]]),
+                'economy': float(economy[i]),
+            }
+            for i in ranked[:limit]
+        ]
+
+
+_state = {'dataset': None}
+_lock = threading.Lock()
+
+
+def _load(version):
+    path = getattr(settings, 'IPL_SNAPSHOT_PATH', None)
+    if path and os.path.exists(path):
+        snapshot = Snapshot(path)
+        if snapshot.dataset_version == version:
+            return ColumnarDataset.from_snapshot(snapshot)
+        snapshot.close()
+    return ColumnarDataset.from_database(version=version)
+
+
+def get_columnar_dataset():
+    """Return the process-wide dataset, rebuilding it when the dataset version has moved on.
+
+    A snapshot at ``IPL_SNAPSHOT_PATH`` exported for the current version is
+    mapped instead of querying the database.
+    """
+    version = get_dataset_version()
+    dataset = _state['dataset']
+    if dataset is None or dataset.version != version:
+        with _lock:
+            dataset = _state['dataset']
+            if dataset is None or dataset.version != version:
+                with warmup():
+                    dataset = _load(version)
+                _state['dataset'] = dataset
+    return dataset
@@ -0,0 +1,56 @@
+"""SQLite runtime profile and the read/write split.
+
+``apply_sqlite_pragmas`` runs ``IPL_SQLITE_PRAGMAS`` on every new SQLite
+connection. WAL lets readers continue while ``load_ipl_data`` holds its
+write transaction. The ``IPL_ANALYTICS_DATABASE`` alias is a second
+connection to the same file that ``AnalyticsRouter`` sends reads to and
+that is opened with ``query_only``, so only ``default`` ever writes.
+"""
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Settings a read-only connection can't or needn't change
+WRITER_PRAGMAS = {'journal_mode'}
+
+
+def analytics_alias():
+    alias = getattr(settings, 'IPL_ANALYTICS_DATABASE', None)
+    return alias if alias in settings.DATABASES else None
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """``connection_created`` receiver configuring SQLite connections."""
+    if connection.vendor != 'sqlite':
+        return
+    read_only = connection.alias == analytics_alias()
+    # On the DB-API connection, so reconnects don't count towards a request's queries
+    database = connection.connection
+    for name, value in getattr(settings, 'IPL_SQLITE_PRAGMAS', {}).items():
+        if not (read_only and name in WRITER_PRAGMAS):
+            database.execute(f'PRAGMA {name} = {value}')
+    if read_only:
+        database.execute('PRAGMA query_only = ON')
+
+
+class AnalyticsRouter:
+    """Reads go to the analytics connection, writes and migrations to ``default``.
+
+    Reads made while ``default`` is inside a transaction stay on it, so a
+    writer such as the loader sees its own uncommitted rows.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = analytics_alias()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases are the same database
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
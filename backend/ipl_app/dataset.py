@@ -0,0 +1,37 @@
+import time
+import uuid
+from django.conf import settings
+from django.db import transaction
+from .models import DatasetVersion
+
+# Process-local copy of the version so most requests don't need a query to read it
+_memo = {'version': None, 'checked': 0.0}
+
+
+def get_dataset_version():
+    """Return the token identifying the currently loaded data.
+
+    The token is re-read from the database at most every
+    ``IPL_DATASET_VERSION_TTL`` seconds, so other processes see a new load
+    within that window.
+    """
+    now = time.monotonic()
+    ttl = getattr(settings, 'IPL_DATASET_VERSION_TTL', 2)
+    if _memo['version'] is None or now - _memo['checked'] >= ttl:
+        version = DatasetVersion.objects.filter(pk=1).values_list('version', flat=True).first()
+        _memo['version'] = version or 'initial'
+        _memo['checked'] = now
+    return _memo['version']
+
+
+def bump_dataset_version():
+    """Give the dataset a new version token; call inside the transaction that changed the data."""
+    version = uuid.uuid4().hex
+    DatasetVersion.objects.update_or_create(pk=1, defaults={'version': version})
+    forget_dataset_version()
+    transaction.on_commit(forget_dataset_version)
+    return version
+
+
+def forget_dataset_version():
+    _memo['version'] = None
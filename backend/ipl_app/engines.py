@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Count, ExpressionWrapper, F, FloatField, Sum
+from django.db.models.functions import Cast
+from .models import Match, SeasonTeamStats, SeasonBowlerStats
+
+ENGINES = ('orm', 'columnar')
+
+
+class OrmEngine:
+    """Answers the chart queries from Match and the per-season summary tables.
+
+    Every method returns plain rows; the columnar engine returns identical
+    rows from in-memory arrays, so the chart views work with either.
+    """
+
+    def seasons(self):
+        return list(Match.objects.values_list('season', flat=True).distinct().order_by('season'))
+
+    def matches_per_season(self):
+        return list(Match.objects.values('season').annotate(matches_count=Count('id')).order_by('season'))
+
+    def season_team_rows(self, season=None):
+        """Rows of (season, team__name, matches_played, matches_won, extra_runs_conceded)."""
+        rows = SeasonTeamStats.objects.values(
+            'season', 'team__name', 'matches_played', 'matches_won', 'extra_runs_conceded'
+        )
+        if season is not None:
+            rows = rows.filter(season=season)
+        return list(rows.order_by('season', 'team__name'))
+
+    def team_wins(self):
+        return list(SeasonTeamStats.objects.filter(matches_won__gt=0).values(
+            'season', 'team__name', 'matches_won'
+        ).order_by('season', 'team__name'))
+
+    def economical_bowlers(self, seasons=None, min_balls=60, limit=15):
+        """The ``limit`` most economical bowlers over ``seasons`` (all when None), ranked and cut in SQL.
+
+        Rows of (bowler__name, legal, runs, wickets_taken, economy); a bowler
+        needs ``min_balls`` legal balls across the seasons.
+        """
+        stats = SeasonBowlerStats.objects.all()
+        if seasons is not None:
+            stats = stats.filter(season__in=seasons)
+        return list(stats.values('bowler', 'bowler__name').annotate(
+            legal=Sum('legal_balls'),
+            runs=Sum('runs_conceded'),
+            wickets_taken=Sum('wickets'),
+        ).filter(legal__gte=max(min_balls, 1)).annotate(
+            economy=ExpressionWrapper(Cast('runs', FloatField()) * 6 / F('legal'), output_field=FloatField()),
+        ).order_by('economy', 'bowler__name', 'bowler').values(
+            'bowler__name', 'legal', 'runs', 'wickets_taken', 'economy'
+        )[:limit])
+
+
+_orm_engine = OrmEngine()
+
+
+def get_engine(name=None):
+    """Return the analytics engine selected by ``IPL_ANALYTICS_ENGINE`` (or ``name``)."""
+    name = name or getattr(settings, 'IPL_ANALYTICS_ENGINE', 'orm')
+    if name == 'orm':
+        return _orm_engine
+    if name == 'columnar':
+        from .columnar import get_columnar_dataset
+        return get_columnar_dataset()
+    raise ImproperlyConfigured(f'IPL_ANALYTICS_ENGINE must be one of {", ".join(ENGINES)}, not {name!r}')
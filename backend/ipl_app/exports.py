@@ -0,0 +1,86 @@
+import csv
+import io
+import json
+import zlib
+from django.db.models import Q
+from .models import Match, Delivery
+
+# (CSV column, ORM path) per export; column names follow the Kaggle files load_ipl_data reads
+EXPORT_COLUMNS = {
+    'matches': [
+        ('id', 'match_id'), ('season', 'season'), ('city', 'city'), ('date', 'date'),
+        ('team1', 'team1__name'), ('team2', 'team2__name'), ('toss_winner', 'toss_winner__name'),
+        ('toss_decision', 'toss_decision'), ('result', 'result'), ('dl_applied', 'dl_applied'),
+        ('winner', 'winner__name'), ('win_by_runs', 'win_by_runs'), ('win_by_wickets', 'win_by_wickets'),
+        ('player_of_match', 'player_of_match__name'), ('venue', 'venue'),
+        ('umpire1', 'umpire1'), ('umpire2', 'umpire2'), ('umpire3', 'umpire3'),
+    ],
+    'deliveries': [
+        ('match_id', 'match__match_id'), ('inning', 'inning'), ('batting_team', 'batting_team__name'),
+        ('bowling_team', 'bowling_team__name'), ('over', 'over'), ('ball', 'ball'),
+        ('batsman', 'batsman__name'), ('non_striker', 'non_striker__name'), ('bowler', 'bowler__name'),
+        ('is_super_over', 'is_super_over'), ('wide_runs', 'wide_runs'), ('bye_runs', 'bye_runs'),
+        ('legbye_runs', 'legbye_runs'), ('noball_runs', 'noball_runs'), ('penalty_runs', 'penalty_runs'),
+        ('batsman_runs', 'batsman_runs'), ('extra_runs', 'extra_runs'), ('total_runs', 'total_runs'),
+        ('player_dismissed', 'player_dismissed__name'), ('dismissal_kind', 'dismissal_kind'),
+        ('fielder', 'fielder__name'),
+    ],
+}
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def export_queryset(dataset, season=None, team=None):
+    """Rows for one export as a ``values_list`` in a stable, index-backed order."""
+    if dataset == 'matches':
+        queryset = Match.objects.order_by('match_id')
+        team_filter = Q(team1=team) | Q(team2=team)
+    else:
+        # The natural key index keeps each match's deliveries together, as load_ipl_data expects
+        queryset = Delivery.objects.order_by('match', 'inning', 'over', 'ball', 'sequence')
+        team_filter = Q(batting_team=team) | Q(bowling_team=team)
+    if season:
+        queryset = queryset.filter(season=season)
+    if team:
+        queryset = queryset.filter(team_filter)
+    return queryset.values_list(*[path for _, path in EXPORT_COLUMNS[dataset]])
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def iter_export(dataset, fmt, rows, chunk_size=2000):
+    """Encode ``rows`` as CSV or NDJSON, yielding one bytes chunk per ``chunk_size`` rows."""
+    columns = [column for column, _ in EXPORT_COLUMNS[dataset]]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == 'csv':
+        writer.writerow(columns)
+
+    count = 0
+    for row in rows.iterator(chunk_size=chunk_size):
+        if fmt == 'csv':
+            writer.writerow([_csv_value(value) for value in row])
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row)), default=str))
+            buffer.write('\n')
+        count += 1
+        if count % chunk_size == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def gzip_stream(chunks):
+    """Compress a stream of bytes chunks into a single gzip member as it goes."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,203 @@
+"""CSV parsing helpers for load_ipl_data.
+
+Nothing in this module touches Django, so shard workers can be started with
+any multiprocessing start method and never share the parent's database
+connection.
+"""
+import csv
+import hashlib
+import os
+from datetime import datetime
+
+DELIVERY_TEAM_COLUMNS = ('batting_team', 'bowling_team')
+DELIVERY_PLAYER_COLUMNS = ('batsman', 'non_striker', 'bowler', 'player_dismissed', 'fielder')
+
+# Column order of the tuples produced by convert_shard; the first five form the natural key
+DELIVERY_KEY_COLUMNS = ['match_id', 'inning', 'over', 'ball', 'sequence']
+DELIVERY_VALUE_COLUMNS = [
+    'season', 'date', 'batting_team_id', 'bowling_team_id', 'batsman_id', 'non_striker_id', 'bowler_id',
+    'is_super_over', 'wide_runs', 'bye_runs', 'legbye_runs', 'noball_runs', 'penalty_runs',
+    'batsman_runs', 'extra_runs', 'total_runs', 'player_dismissed_id', 'dismissal_kind',
+    'fielder_id',
+]
+DELIVERY_COLUMNS = DELIVERY_KEY_COLUMNS + DELIVERY_VALUE_COLUMNS
+
+
+class UngroupedDeliveries(ValueError):
+    """The deliveries of some match are not on consecutive lines, so the file can't be sharded."""
+
+
+def parse_int(value):
+    return int(value or 0)
+
+
+def parse_date(value):
+    # Handle multiple date formats: YYYY-MM-DD, MM/DD/YYYY and DD/MM/YYYY
+    formats = ('%m/%d/%Y', '%d/%m/%Y') if '/' in value else ('%Y-%m-%d',)
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def row_digest(values):
+    return hashlib.sha1('\x1f'.join(values).encode('utf-8')).hexdigest()
+
+
+def read_header(path):
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        return next(csv.reader(file))
+
+
+def _read_lines(file, end):
+    while file.tell() < end:
+        line = file.readline()
+        if not line:
+            break
+        yield line.decode('utf-8')
+
+
+def iter_shard(path, start, end, fieldnames):
+    """Yield the rows of ``path`` between byte offsets ``start`` and ``end`` as dicts."""
+    with open(path, 'rb') as file:
+        file.seek(start)
+        yield from csv.DictReader(_read_lines(file, end), fieldnames=fieldnames)
+
+
+def _match_id_of(line, index):
+    return next(csv.reader([line.decode('utf-8')]))[index]
+
+
+def shard_offsets(path, shard_size):
+    """Split ``path`` into byte ranges of roughly ``shard_size`` bytes.
+
+    Ranges start on line boundaries after the header and never split the
+    deliveries of one match, so each shard can be hashed and sequenced on its own.
+    """
+    size = os.path.getsize(path)
+    index = read_header(path).index('match_id')
+    with open(path, 'rb') as file:
+        file.readline()
+        offsets = [file.tell()]
+        while True:
+            target = offsets[-1] + max(shard_size, 1)
+            if target >= size:
+                break
+            file.seek(target)
+            file.readline()
+            line = file.readline()
+            if not line:
+                break
+            current = _match_id_of(line, index)
+            # Advance to the first line that belongs to a different match
+            while True:
+                position = file.tell()
+                line = file.readline()
+                if not line or _match_id_of(line, index) != current:
+                    break
+            if not line:
+                break
+            offsets.append(position)
+    offsets.append(size)
+    return list(zip(offsets, offsets[1:]))
+
+
+def scan_shard(path, start, end, fieldnames, grouped=True):
+    """First pass over a shard: distinct team/player names and a content hash per match.
+
+    Raises ``UngroupedDeliveries`` if a match's rows are split up, unless
+    ``grouped`` is False (the whole file read as one shard).
+    """
+    team_names = set()
+    player_names = set()
+    digests = {}
+    current_match = None
+    for row in iter_shard(path, start, end, fieldnames):
+        if row['match_id'] != current_match:
+            # Sequence numbers are assigned per match, so its rows must be contiguous
+            if grouped and row['match_id'] in digests:
+                raise UngroupedDeliveries(f'Deliveries for match {row["match_id"]} are not contiguous in {path}')
+            current_match = row['match_id']
+        for column in DELIVERY_TEAM_COLUMNS:
+            team_names.add(row.get(column))
+        for column in DELIVERY_PLAYER_COLUMNS:
+            player_names.add(row.get(column))
+        digest = digests.get(row['match_id'])
+        if digest is None:
+            digest = digests[row['match_id']] = hashlib.sha1()
+        digest.update('\x1f'.join(row.values()).encode('utf-8'))
+        digest.update(b'\n')
+    hashes = {int(match_id): digest.hexdigest() for match_id, digest in digests.items()}
+    return team_names, player_names, hashes
+
+
+# Identity maps installed in each worker by init_converter
+_context = {}
+
+
+def init_converter(team_ids, player_ids, match_rows, changed):
+    # match_rows maps the CSV match_id to (pk, season, date) of the stored match
+    _context.update(team_ids=team_ids, player_ids=player_ids, match_rows=match_rows, changed=changed)
+
+
+def iter_converted(path, start, end, fieldnames, grouped=True):
+    """Second pass over a shard: yield delivery tuples in DELIVERY_COLUMNS order.
+
+    Sequence numbers are kept for the current match only, or for every match
+    when ``grouped`` is False.
+
+    Rows of matches that are unchanged are dropped; rows of unknown matches and
+    rows that fail to parse are reported as ``('skipped', match_id)`` and
+    ``('error', message)`` instead of a tuple.
+    """
+    team_ids = _context['team_ids']
+    player_ids = _context['player_ids']
+    match_rows = _context['match_rows']
+    changed = _context['changed']
+    current_match = None
+    sequences = {}
+    all_sequences = {}
+    for row in iter_shard(path, start, end, fieldnames):
+        try:
+            match_id = int(row['match_id'])
+            if match_id != current_match:
+                current_match = match_id
+                sequences = {} if grouped else all_sequences.setdefault(match_id, {})
+            if match_id not in changed:
+                continue
+            match = match_rows.get(match_id)
+            if match is None:
+                yield ('skipped', match_id)
+                continue
+
+            key = (int(row['inning']), int(row['over']), int(row['ball']))
+            sequence = sequences.get(key, -1) + 1
+            sequences[key] = sequence
+            yield (
+                match[0], key[0], key[1], key[2], sequence, match[1], match[2],
+                team_ids[row['batting_team']],
+                team_ids[row['bowling_team']],
+                player_ids[row['batsman']],
+                player_ids[row['non_striker']],
+                player_ids[row['bowler']],
+                row.get('is_super_over', '0') == '1',
+                parse_int(row.get('wide_runs')),
+                parse_int(row.get('bye_runs')),
+                parse_int(row.get('legbye_runs')),
+                parse_int(row.get('noball_runs')),
+                parse_int(row.get('penalty_runs')),
+                parse_int(row.get('batsman_runs')),
+                parse_int(row.get('extra_runs')),
+                parse_int(row.get('total_runs')),
+                player_ids.get(row.get('player_dismissed')),
+                row.get('dismissal_kind', ''),
+                player_ids.get(row.get('fielder')),
+            )
+        except Exception as e:
+            yield ('error', f'Error processing delivery of match {row.get("match_id")}: {str(e)}')
+
+
+def convert_shard(path, start, end, fieldnames, grouped=True):
+    return list(iter_converted(path, start, end, fieldnames, grouped))
@@ -0,0 +1,197 @@
+"""Per-request timings: SQL, serializers, the view and rendering.
+
+``RequestTimingMiddleware`` opens a ``RequestTimings`` for each request in a
+context variable, so SQL run on any connection (through an execute wrapper
+installed on every new connection) and ``timed()`` blocks anywhere in the
+request add to it, including in the async views' pool threads. The result
+goes out as a ``Server-Timing`` header, a JSON log line on the
+``ipl_app.timing`` logger and per-route samples for ``route_stats()``.
+"""
+import contextvars
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
+
+logger = logging.getLogger('ipl_app.timing')
+
+_current = contextvars.ContextVar('ipl_request_timings', default=None)
+
+_samples_lock = threading.Lock()
+# route -> recent (total ms, queries) samples
+_samples = defaultdict(lambda: deque(maxlen=settings.IPL_TIMING_SAMPLES))
+_over_budget = defaultdict(int)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(queries):
+    """Allow GET requests to a view at most ``queries`` SQL queries, counting the dataset version read."""
+    def decorator(view):
+        view.query_budget = queries
+        return view
+    return decorator
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.durations = defaultdict(float)
+
+    def add(self, name, seconds):
+        self.durations[name] += seconds * 1000
+
+
+@contextmanager
+def timed(name):
+    """Add the time spent in the block to the current request's ``name`` timing, if any."""
+    timings = _current.get()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings.add(name, time.perf_counter() - started)
+
+
+@contextmanager
+def warmup():
+    """Rebuild process-wide state outside the request's query count; the time is reported as ``warmup``."""
+    timings = _current.get()
+    token = _current.set(None)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _current.reset(token)
+        if timings is not None:
+            timings.add('warmup', time.perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.queries += 1
+        timings.add('db', time.perf_counter() - started)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """``connection_created`` receiver adding ``record_query`` to every new connection."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _view_budget(view_func):
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        budget = getattr(getattr(view_func, 'view_class', None), 'query_budget', None)
+    return budget
+
+
+class RequestTimingMiddleware(MiddlewareMixin):
+    """Time each request and enforce view query budgets.
+
+    Install it last so ``process_view`` runs right before the view and
+    ``process_template_response`` right after it, which splits the view from
+    the rendering of DRF responses.
+    """
+
+    def process_request(self, request):
+        request.timing_started = time.perf_counter()
+        request.timings = RequestTimings()
+        _current.set(request.timings)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = _view_budget(view_func)
+        request.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        request.view_finished = time.perf_counter()
+        return response
+
+    def process_response(self, request, response):
+        timings = getattr(request, 'timings', None)
+        if timings is None:
+            return response
+        _current.set(None)
+        finished = time.perf_counter()
+        durations = timings.durations
+        if hasattr(request, 'view_started'):
+            view_finished = getattr(request, 'view_finished', finished)
+            durations['render'] = (finished - view_finished) * 1000
+            # Whatever the view spent outside SQL execution, serializers and warm-ups:
+            # materializing rows and view logic
+            durations['orm'] = max((view_finished - request.view_started) * 1000 - durations['db']
+                                   - durations['serialize'] - durations['warmup'], 0)
+        durations['total'] = (finished - request.timing_started) * 1000
+
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={durations[name]:.2f}' + (f';desc="queries={timings.queries}"' if name == 'db' else '')
+            for name in ('db', 'orm', 'serialize', 'render', 'warmup', 'total') if durations.get(name)
+        )
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match else request.path
+        budget = getattr(request, 'query_budget', None) if request.method in ('GET', 'HEAD') else None
+        over_budget = budget is not None and timings.queries > budget
+        with _samples_lock:
+            _samples[route].append((durations['total'], timings.queries))
+            if over_budget:
+                _over_budget[route] += 1
+
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.get_full_path(),
+            'route': route,
+            'status': response.status_code,
+            'queries': timings.queries,
+            **{f'{name}_ms': round(value, 2) for name, value in durations.items()},
+        }))
+        if over_budget:
+            message = f'{route} ran {timings.queries} queries, over its budget of {budget}'
+            if settings.IPL_QUERY_BUDGET_ACTION == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+
+def _percentile(ordered, share):
+    return ordered[min(int(len(ordered) * share), len(ordered) - 1)]
+
+
+def route_stats():
+    """Request count, latency percentiles and query counts per route over the recent samples."""
+    with _samples_lock:
+        samples = {route: list(values) for route, values in _samples.items()}
+        over_budget = dict(_over_budget)
+    stats = {}
+    for route, values in sorted(samples.items()):
+        totals = sorted(total for total, _ in values)
+        queries = [count for _, count in values]
+        stats[route] = {
+            'requests': len(values),
+            'p50_ms': round(_percentile(totals, 0.5), 2),
+            'p95_ms': round(_percentile(totals, 0.95), 2),
+            'p99_ms': round(_percentile(totals, 0.99), 2),
+            'max_queries': max(queries),
+            'mean_queries': round(sum(queries) / len(queries), 2),
+            'over_budget': over_budget.get(route, 0),
+        }
+    return stats
+
+
+def reset_route_stats():
+    with _samples_lock:
+        _samples.clear()
+        _over_budget.clear()
@@ -0,0 +1,99 @@
+import asyncio
+import io
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from ipl_app.async_views import coalescing_stats, reset_coalescing_stats
+from ipl_app.benchmarks import scratch_database
+from ipl_app.engines import get_engine
+from ipl_app.synthetic import generate_dataset
+
+
+def dashboard_urls(seasons):
+    """The requests one dashboard user makes, for every season."""
+    urls = ['/api/available-years/', '/api/matches-per-year/', '/api/team-wins-stacked/']
+    for season in seasons:
+        urls += [f'/api/season/{season}/dashboard/', f'/api/season/{season}/leaderboard/?stat=runs']
+    return urls
+
+
+def summarize(label, latencies, elapsed):
+    latencies = sorted(latencies)
+    percentile = lambda share: latencies[min(int(len(latencies) * share), len(latencies) - 1)]
+    return (
+        f'{label:6} {len(latencies) / elapsed:8.0f} req/s  '
+        f'p50 {statistics.median(latencies):8.2f} ms  p95 {percentile(0.95):8.2f} ms  p99 {percentile(0.99):8.2f} ms'
+    )
+
+
+class Command(BaseCommand):
+    help = ('Serve bursts of concurrent dashboard requests through the WSGI and the ASGI handler '
+            'in-process and compare throughput and latency')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deliveries', type=int, default=100000,
+                          help='Number of synthetic deliveries (the real full history is ~180k)')
+        parser.add_argument('--concurrency', type=int, default=200,
+                          help='Requests arriving together in each burst')
+        parser.add_argument('--bursts', type=int, default=10)
+        parser.add_argument('--threads', type=int, default=8,
+                          help='WSGI worker threads, as for gunicorn --threads')
+        parser.add_argument('--cache', action='store_true',
+                          help='Keep the chart cache on; by default every response is computed')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            matches_file, deliveries_file, _, _ = generate_dataset(directory, deliveries=options['deliveries'])
+            with scratch_database(directory):
+                call_command('load_ipl_data', matches_file=matches_file, deliveries_file=deliveries_file,
+                             warm_cache=False, stdout=io.StringIO())
+                urls = dashboard_urls(get_engine('orm').seasons())
+                bursts = [
+                    [urls[(burst * options['concurrency'] + index) % len(urls)] for index in range(options['concurrency'])]
+                    for burst in range(options['bursts'])
+                ]
+                cache_alias = 'charts' if options['cache'] else None
+
+                with override_settings(IPL_CHART_CACHE_ALIAS=cache_alias):
+                    self.stdout.write(self.run_wsgi(bursts, options['threads']))
+                with override_settings(IPL_CHART_CACHE_ALIAS=cache_alias, ROOT_URLCONF='ipl_project.asgi_urls'):
+                    reset_coalescing_stats()
+                    self.stdout.write(asyncio.run(self.run_asgi(bursts)))
+                    stats = coalescing_stats()
+                self.stdout.write(f'ASGI computed {stats["computed"]} responses and coalesced {stats["coalesced"]}')
+
+    def run_wsgi(self, bursts, threads):
+        latencies = []
+
+        def get(url, burst_started):
+            response = Client().get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{url} returned {response.status_code}')
+            return (time.perf_counter() - burst_started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for burst in bursts:
+                burst_started = time.perf_counter()
+                latencies += pool.map(get, burst, [burst_started] * len(burst))
+        return summarize('WSGI', latencies, time.perf_counter() - started)
+
+    async def run_asgi(self, bursts):
+        latencies = []
+        client = AsyncClient()
+
+        async def get(url, burst_started):
+            response = await client.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{url} returned {response.status_code}')
+            return (time.perf_counter() - burst_started) * 1000
+
+        started = time.perf_counter()
+        for burst in bursts:
+            burst_started = time.perf_counter()
+            latencies += await asyncio.gather(*[get(url, burst_started) for url in burst])
+        return summarize('ASGI', latencies, time.perf_counter() - started)
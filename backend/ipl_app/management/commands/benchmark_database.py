@@ -0,0 +1,134 @@
+import io
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client, override_settings
+from ipl_app.benchmarks import scratch_database
+from ipl_app.engines import get_engine
+from ipl_app.management.commands.benchmark_concurrency import dashboard_urls, summarize
+from ipl_app.synthetic import generate_dataset
+
+# Database runtime profiles compared: Django's defaults against the settings.py profile
+PROFILES = {
+    'stock': {
+        'pragmas': {'journal_mode': 'DELETE'},
+        'analytics': None,
+        'conn_max_age': 0,
+    },
+    'tuned': {
+        'pragmas': settings.IPL_SQLITE_PRAGMAS,
+        'analytics': settings.IPL_ANALYTICS_DATABASE,
+        'conn_max_age': settings.CONN_MAX_AGE,
+    },
+}
+
+
+@contextmanager
+def database_profile(profile):
+    saved = {alias: settings.DATABASES[alias]['CONN_MAX_AGE'] for alias in settings.DATABASES}
+    connections.close_all()
+    for alias in settings.DATABASES:
+        settings.DATABASES[alias]['CONN_MAX_AGE'] = profile['conn_max_age']
+    try:
+        with override_settings(IPL_SQLITE_PRAGMAS=profile['pragmas'], IPL_ANALYTICS_DATABASE=profile['analytics'],
+                               IPL_CHART_CACHE_ALIAS=None):
+            yield
+    finally:
+        connections.close_all()
+        for alias, conn_max_age in saved.items():
+            settings.DATABASES[alias]['CONN_MAX_AGE'] = conn_max_age
+
+
+class Command(BaseCommand):
+    help = ('Measure API read latency while idle and while load_ipl_data rewrites the data, '
+            'under the stock SQLite settings and the tuned profile with the read/write split')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deliveries', type=int, default=100000,
+                          help='Number of synthetic deliveries (the real full history is ~180k)')
+        parser.add_argument('--readers', type=int, default=4,
+                          help='Threads issuing dashboard requests back to back')
+        parser.add_argument('--idle-seconds', type=float, default=3.0,
+                          help='How long to measure reads with no load running')
+        parser.add_argument('--profiles', nargs='+', choices=list(PROFILES), default=list(PROFILES))
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            first = generate_dataset(directory, deliveries=options['deliveries'], seed=42)[:2]
+            # A second, different dataset of the same size, so the reload rewrites every match
+            reload_directory = os.path.join(directory, 'reload')
+            os.mkdir(reload_directory)
+            second = generate_dataset(reload_directory, deliveries=options['deliveries'], seed=43)[:2]
+
+            for name in options['profiles']:
+                with database_profile(PROFILES[name]), scratch_database(directory):
+                    self.load(*first)
+                    urls = dashboard_urls(get_engine('orm').seasons())
+                    self.stdout.write(f'{name}:')
+
+                    stop = threading.Event()
+                    timer = threading.Timer(options['idle_seconds'], stop.set)
+                    timer.start()
+                    self.stdout.write('  ' + self.read_until(stop, urls, options['readers'], 'idle'))
+
+                    stop = threading.Event()
+                    loaded = {}
+
+                    def reload():
+                        started = time.perf_counter()
+                        try:
+                            self.load(*second)
+                        finally:
+                            loaded['seconds'] = time.perf_counter() - started
+                            connections.close_all()
+                            stop.set()
+
+                    writer = threading.Thread(target=reload)
+                    writer.start()
+                    self.stdout.write('  ' + self.read_until(stop, urls, options['readers'], 'load'))
+                    writer.join()
+                    self.stdout.write(f'  reload took {loaded["seconds"]:.2f} s')
+
+    def load(self, matches_file, deliveries_file):
+        call_command('load_ipl_data', matches_file=matches_file, deliveries_file=deliveries_file,
+                     warm_cache=False, stdout=io.StringIO())
+
+    def read_until(self, stop, urls, readers, label):
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+
+        def read(offset):
+            client = Client(raise_request_exception=False)
+            index = offset
+            try:
+                while not stop.is_set():
+                    url = urls[index % len(urls)]
+                    index += 1
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    elapsed = (time.perf_counter() - started) * 1000
+                    with lock:
+                        if response.status_code == 200:
+                            latencies.append(elapsed)
+                        else:
+                            errors.append(url)
+            finally:
+                connections.close_all()
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=read, args=(offset,)) for offset in range(readers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        if not latencies:
+            return f'{label:6} no successful requests, {len(errors)} errors'
+        return f'{summarize(label, latencies, elapsed)}  max {max(latencies):8.2f} ms  {len(errors)} errors'
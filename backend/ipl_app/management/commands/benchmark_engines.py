@@ -0,0 +1,56 @@
+import io
+import tempfile
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from ipl_app.benchmarks import median_ms, scratch_database
+from ipl_app.columnar import ColumnarDataset
+from ipl_app.engines import get_engine
+from ipl_app.synthetic import generate_dataset
+
+
+def engine_queries(engine):
+    """Every chart query, as (label, callable) pairs, against ``engine``."""
+    seasons = engine.seasons()
+    return [
+        ('seasons', engine.seasons),
+        ('matches per season', engine.matches_per_season),
+        ('team wins', engine.team_wins),
+        ('team rows, all seasons', engine.season_team_rows),
+        ('team rows per season', lambda: [engine.season_team_rows(season) for season in seasons]),
+        ('economical bowlers per season', lambda: [engine.economical_bowlers([season]) for season in seasons]),
+        ('economical bowlers, all seasons', lambda: engine.economical_bowlers(None, limit=100)),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Compare the ORM and columnar analytics engines and check they return identical results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deliveries', type=int, default=300000,
+                          help='Number of synthetic deliveries (the real full history is ~180k)')
+        parser.add_argument('--repeat', type=int, default=5,
+                          help='Timed runs per query; the median is reported')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            matches_file, deliveries_file, _, _ = generate_dataset(directory, deliveries=options['deliveries'])
+            with scratch_database(directory):
+                call_command('load_ipl_data', matches_file=matches_file, deliveries_file=deliveries_file,
+                             warm_cache=False, stdout=io.StringIO())
+
+                started = time.perf_counter()
+                columnar = ColumnarDataset.from_database()
+                self.stdout.write(f'Columnar build: {(time.perf_counter() - started) * 1000:.0f} ms')
+
+                orm = get_engine('orm')
+                for (label, orm_query), (_, columnar_query) in zip(engine_queries(orm), engine_queries(columnar)):
+                    if orm_query() != columnar_query():
+                        raise CommandError(f'{label}: the engines returned different results')
+                    orm_ms = median_ms(orm_query, options['repeat'])
+                    columnar_ms = median_ms(columnar_query, options['repeat'])
+                    self.stdout.write(
+                        f'{label:32} orm: {orm_ms:8.2f} ms  columnar: {columnar_ms:8.2f} ms  '
+                        f'({orm_ms / columnar_ms if columnar_ms else 0:.1f}x)'
+                    )
+                self.stdout.write(self.style.SUCCESS('Both engines returned identical results'))
@@ -0,0 +1,52 @@
+import io
+import tempfile
+import time
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from ipl_app.benchmarks import scratch_database
+from ipl_app.models import Delivery
+from ipl_app.synthetic import generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Benchmark load_ipl_data against a synthetic dataset in a scratch database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deliveries', type=int, default=1000000,
+                          help='Number of synthetic deliveries to generate')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                          help='Batch size passed to load_ipl_data')
+        parser.add_argument('--workers', type=int, nargs='+', default=[1],
+                          help='Worker counts to benchmark, e.g. --workers 1 2 4 8')
+        parser.add_argument('--seed', type=int, default=42,
+                          help='Seed for the synthetic data generator')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            self.stdout.write(f'Generating {options["deliveries"]:,} synthetic deliveries...')
+            matches_file, deliveries_file, match_count, delivery_count = generate_dataset(
+                directory, deliveries=options['deliveries'], seed=options['seed']
+            )
+
+            baseline = None
+            for workers in options['workers']:
+                # Every run starts from an empty database
+                with scratch_database(directory):
+                    started = time.perf_counter()
+                    call_command(
+                        'load_ipl_data',
+                        matches_file=matches_file,
+                        deliveries_file=deliveries_file,
+                        batch_size=options['batch_size'],
+                        workers=workers,
+                        stdout=io.StringIO(),
+                    )
+                    elapsed = time.perf_counter() - started
+                    loaded = Delivery.objects.count()
+
+                baseline = baseline or elapsed
+                self.stdout.write(self.style.SUCCESS(
+                    f'workers={workers}: loaded {match_count:,} matches and {loaded:,} of '
+                    f'{delivery_count:,} deliveries in {elapsed:.1f}s '
+                    f'({loaded / elapsed:,.0f} rows/sec, {baseline / elapsed:.2f}x)'
+                ))
@@ -0,0 +1,47 @@
+import io
+import tempfile
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q, Sum
+from ipl_app.benchmarks import median_ms, scratch_database
+from ipl_app.models import Match, Delivery
+from ipl_app.synthetic import generate_dataset
+
+
+class Command(BaseCommand):
+    help = 'Compare season-scoped Delivery aggregates through the Match join and the denormalized season'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--deliveries', type=int, default=300000,
+                          help='Number of synthetic deliveries (the real full history is ~180k)')
+        parser.add_argument('--repeat', type=int, default=5,
+                          help='Timed runs per query; the median is reported')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as directory:
+            matches_file, deliveries_file, _, _ = generate_dataset(directory, deliveries=options['deliveries'])
+            with scratch_database(directory):
+                call_command('load_ipl_data', matches_file=matches_file,
+                             deliveries_file=deliveries_file, stdout=io.StringIO())
+                seasons = list(Match.objects.values_list('season', flat=True).distinct().order_by('season'))
+
+                for label, season_filter in (('join on match__season', 'match__season'),
+                                             ('denormalized season', 'season')):
+                    def extras():
+                        for season in seasons:
+                            list(Delivery.objects.filter(**{season_filter: season})
+                                 .values('bowling_team').annotate(extras=Sum('extra_runs')).order_by())
+
+                    def bowlers():
+                        for season in seasons:
+                            list(Delivery.objects.filter(**{season_filter: season})
+                                 .values('bowler').annotate(
+                                     balls=Count('id'),
+                                     runs=Sum('total_runs'),
+                                     wickets=Count('player_dismissed', filter=Q(player_dismissed__isnull=False)),
+                                 ).order_by())
+
+                    self.stdout.write(
+                        f'{label:24} extras per team: {median_ms(extras, options["repeat"]) / len(seasons):7.2f} ms/season  '
+                        f'bowler stats: {median_ms(bowlers, options["repeat"]) / len(seasons):7.2f} ms/season'
+                    )
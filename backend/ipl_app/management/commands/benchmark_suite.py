@@ -0,0 +1,117 @@
+import io
+import json
+import platform
+import subprocess
+import tempfile
+import time
+import django
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from ipl_app.benchmarks import (
+    RESULTS_FORMAT, compare_results, measure_endpoint, peak_rss_mb, scratch_database, suite_endpoints,
+)
+from ipl_app.dataset import forget_dataset_version
+from ipl_app.engines import get_engine
+from ipl_app.models import Team, Player
+from ipl_app.synthetic import SCALES, generate_scaled_dataset
+
+
+def current_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+class Command(BaseCommand):
+    help = ('Time ingest and every chart endpoint on synthetic data at 1x/10x/100x the real IPL size, '
+            'write the results as JSON and flag regressions against an earlier run')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['1x'],
+                          help='Dataset sizes relative to the real 2008-2017 data; 100x is ~15M deliveries')
+        parser.add_argument('--repeat', type=int, default=5,
+                          help='Timed requests per endpoint; the median is reported')
+        parser.add_argument('--seed', type=int, default=42,
+                          help='Seed for the synthetic data generator')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+        parser.add_argument('--compare', help='Results JSON of an earlier run to check for regressions')
+        parser.add_argument('--threshold', type=float, default=0.2,
+                          help='Relative slowdown or memory growth counted as a regression')
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as handle:
+                baseline = json.load(handle)
+            if baseline.get('format') != RESULTS_FORMAT:
+                raise CommandError(f'{options["compare"]} is not a format {RESULTS_FORMAT} results file')
+
+        results = {
+            'format': RESULTS_FORMAT,
+            'commit': current_commit(),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'engine': settings.IPL_ANALYTICS_ENGINE,
+            'seed': options['seed'],
+            'scales': {},
+        }
+        # Smallest first, so the process-wide peak RSS after each ingest belongs to that scale
+        for scale in sorted(options['scales'], key=SCALES.get):
+            results['scales'][scale] = self.run_scale(scale, options['seed'], options['repeat'])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2, sort_keys=True)
+            self.stdout.write(f'Results written to {options["output"]}')
+
+        if baseline is not None:
+            regressions = compare_results(baseline, results, threshold=options['threshold'])
+            if regressions:
+                for line in regressions:
+                    self.stdout.write(self.style.ERROR(f'Regression: {line}'))
+                raise CommandError(f'{len(regressions)} regressions against {baseline.get("commit") or options["compare"]}')
+            self.stdout.write(self.style.SUCCESS(f'No regressions against {baseline.get("commit") or options["compare"]}'))
+
+    def run_scale(self, scale, seed, repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            matches_file, deliveries_file, match_count, delivery_count = generate_scaled_dataset(directory, scale, seed)
+            result = {
+                'matches': match_count,
+                'deliveries': delivery_count,
+                'generate_s': round(time.perf_counter() - started, 3),
+            }
+            self.stdout.write(f'{scale}: {match_count:,} matches, {delivery_count:,} deliveries')
+
+            with scratch_database(directory):
+                started = time.perf_counter()
+                call_command('load_ipl_data', matches_file=matches_file, deliveries_file=deliveries_file,
+                             warm_cache=False, stdout=io.StringIO())
+                result['ingest_s'] = round(time.perf_counter() - started, 3)
+                result['ingest_peak_rss_mb'] = peak_rss_mb()
+                self.stdout.write(f'  ingest {result["ingest_s"]:9.2f} s   peak RSS {result["ingest_peak_rss_mb"]} MB')
+
+                # Measure computed responses: no chart cache, and no dataset version re-reads mid-run
+                with override_settings(IPL_CHART_CACHE_ALIAS=None, IPL_DATASET_VERSION_TTL=3600):
+                    forget_dataset_version()
+                    endpoints = suite_endpoints(
+                        get_engine().seasons(),
+                        Player.objects.order_by('id').values_list('id', flat=True).first(),
+                        list(Team.objects.order_by('name').values_list('name', flat=True)[:2]),
+                    )
+                    client = Client()
+                    result['endpoints'] = {}
+                    for label, url in endpoints:
+                        metrics = measure_endpoint(client, url, repeat)
+                        result['endpoints'][label] = metrics
+                        self.stdout.write(
+                            f'  {label:36} {metrics["median_ms"]:9.2f} ms  {metrics["queries"]:3} queries  '
+                            f'peak {metrics["peak_kb"]:9.1f} KB'
+                        )
+        return result
@@ -0,0 +1,30 @@
+import os
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ipl_app.dataset import get_dataset_version, forget_dataset_version
+from ipl_app.snapshot import write_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Export Team, Player, Match and Delivery to a memory-mappable columnar snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=str, default=getattr(settings, 'IPL_SNAPSHOT_PATH', None),
+                          help='Snapshot file to write (default: IPL_SNAPSHOT_PATH)')
+
+    def handle(self, *args, **options):
+        output = options['output']
+        directory = os.path.dirname(os.path.abspath(output))
+        os.makedirs(directory, exist_ok=True)
+
+        forget_dataset_version()
+        started = time.perf_counter()
+        header = write_snapshot(output, get_dataset_version())
+        elapsed = time.perf_counter() - started
+
+        rows = ', '.join(f'{table["rows"]} {name}' for name, table in header['tables'].items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote snapshot {header["dataset_version"]} to {output} '
+            f'({rows}; {os.path.getsize(output) / 1024 / 1024:.1f} MiB in {elapsed:.1f}s)'
+        ))
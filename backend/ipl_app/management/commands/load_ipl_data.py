@@ -1,10 +1,41 @@
 import csv
 import os
+import sqlite3
+import time
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
+from itertools import chain
+from django.conf import settings
+from django.core.management import call_command
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import DEFAULT_DB_ALIAS, connections, router, transaction
+from django.db.models import OuterRef, Subquery
+from ipl_app.aggregates import refresh_head_to_head, refresh_season_stats
+from ipl_app.bluegreen import (
+    InvalidBuild, activate_build, build_path, builds_dir, delete_build, new_build_name, prune_builds,
+    read_active, using_database, validate_build,
+)
+from ipl_app.cache import warm_chart_cache
+from ipl_app.dataset import bump_dataset_version
+from ipl_app.ingest import (
+    DELIVERY_COLUMNS, DELIVERY_KEY_COLUMNS, DELIVERY_VALUE_COLUMNS, UngroupedDeliveries, init_converter,
+    convert_shard, iter_converted, parse_date, parse_int, read_header, row_digest,
+    scan_shard, shard_offsets,
+)
 from ipl_app.models import Team, Player, Match, Delivery
 
+MATCH_TEAM_COLUMNS = ('team1', 'team2', 'toss_winner', 'winner')
+
+MATCH_UPDATE_FIELDS = [
+    'season', 'city', 'date', 'team1', 'team2', 'toss_winner', 'toss_decision', 'result',
+    'dl_applied', 'winner', 'win_by_runs', 'win_by_wickets', 'player_of_match', 'venue',
+    'umpire1', 'umpire2', 'umpire3', 'source_hash',
+]
+
+
 class Command(BaseCommand):
     help = 'Load IPL data from CSV files (matches.csv and deliveries.csv)'
 
@@ -13,207 +44,418 @@ class Command(BaseCommand):
                           help='Path to matches.csv file')
         parser.add_argument('--deliveries-file', type=str, required=True,
                           help='Path to deliveries.csv file')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                          help='Number of deliveries per bulk insert')
+        parser.add_argument('--incremental', action='store_true',
+                          help='Only load matches and deliveries whose content changed since the last load')
+        parser.add_argument('--workers', type=int, default=1,
+                          help='Number of processes parsing deliveries.csv shards')
+        parser.add_argument('--shard-size', type=int, default=8 * 1024 * 1024,
+                          help='Approximate size in bytes of each deliveries.csv shard')
+        parser.add_argument('--no-warm-cache', action='store_false', dest='warm_cache',
+                          help='Skip precomputing every chart response after the load')
+        parser.add_argument('--export-snapshot', action='store_true',
+                          help='Write the columnar snapshot (IPL_SNAPSHOT_PATH) after the load')
+        parser.add_argument('--blue-green', action='store_true',
+                          help='Load into a copy of the live database in IPL_DATABASES_DIR, validate it '
+                               'and then switch every API process to it')
 
     def handle(self, *args, **options):
         matches_file = options['matches_file']
         deliveries_file = options['deliveries_file']
+        self.batch_size = options['batch_size']
+        self.incremental = options['incremental']
+        self.workers = max(options['workers'], 1)
+        self.shard_size = options['shard_size']
 
         # Validate file existence
         if not os.path.exists(matches_file):
             raise CommandError(f'Matches file "{matches_file}" does not exist.')
-        
+
         if not os.path.exists(deliveries_file):
             raise CommandError(f'Deliveries file "{deliveries_file}" does not exist.')
 
         self.stdout.write('Starting IPL data loading process...')
 
+        # In-memory identity maps: name -> id for teams/players, match_id -> pk for matches
+        self.team_ids = {}
+        self.player_ids = {}
+        self.match_ids = {}
+        # Seasons and teams whose summary rows must be rebuilt once the load is complete
+        self.dirty_seasons = set()
+        self.dirty_teams = set()
+        # Deliveries upserted or pruned
+        self.deliveries_written = 0
+
+        build = self.start_build() if options['blue_green'] else None
         try:
-            with transaction.atomic():
-                # Load teams and matches first
-                self.load_matches(matches_file)
-                
-                # Load deliveries (which depend on matches, teams, and players)
-                self.load_deliveries(deliveries_file)
-                
+            with using_database(build_path(build)) if build else nullcontext():
+                with transaction.atomic():
+                    # Load teams and matches first
+                    self.load_matches(matches_file)
+
+                    # Load deliveries (which depend on matches, teams, and players)
+                    self.load_deliveries(deliveries_file)
+
+                    # Rebuild the per-season summaries read by the chart endpoints
+                    self.refresh_aggregates()
+
+                    # Cached chart responses and ETags are keyed by this version, so keep it if nothing changed
+                    changed = bool(self.dirty_seasons or self.dirty_teams or self.deliveries_written)
+                    if changed:
+                        bump_dataset_version()
+
+                if build:
+                    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+                        cursor.execute('ANALYZE')
+                        # Fold the WAL into the file so the build is complete on its own
+                        cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+            if build:
+                self.finish_build(build)
+
+            if options['export_snapshot']:
+                call_command('export_snapshot', stdout=self.stdout)
+
+            if options['warm_cache'] and changed:
+                warmed = warm_chart_cache()
+                self.stdout.write(f'Warmed {warmed} chart responses')
+
             self.stdout.write(
                 self.style.SUCCESS('Successfully loaded IPL data!')
             )
         except Exception as e:
+            if build and read_active() != build:
+                delete_build(build)
             self.stdout.write(
                 self.style.ERROR(f'Error loading data: {str(e)}')
             )
             raise
 
+    def start_build(self):
+        # Start from a copy of the live data, so incremental loads work the same way
+        live = connections[DEFAULT_DB_ALIAS]
+        if live.vendor != 'sqlite':
+            raise CommandError('--blue-green needs the SQLite backend')
+        os.makedirs(builds_dir(), exist_ok=True)
+        build = new_build_name()
+        live.ensure_connection()
+        target = sqlite3.connect(build_path(build))
+        try:
+            live.connection.backup(target)
+        finally:
+            target.close()
+        try:
+            with using_database(build_path(build)):
+                call_command('migrate', interactive=False, verbosity=0)
+        except Exception:
+            delete_build(build)
+            raise
+        self.stdout.write(f'Building {build} in {builds_dir()}')
+        return build
+
+    def finish_build(self, build):
+        try:
+            validate_build(build_path(build))
+        except InvalidBuild as e:
+            raise CommandError(f'Build {build} failed validation, still serving the previous data: {e}')
+        activate_build(build)
+        self.stdout.write(f'Switched to {build}')
+        pruned = prune_builds(settings.IPL_DATABASE_BUILDS_KEPT)
+        if pruned:
+            self.stdout.write(f'Removed old builds {", ".join(pruned)}')
+
+    def ensure_teams(self, names):
+        names = {name for name in names if name}
+        if not self.team_ids:
+            self.team_ids = dict(Team.objects.values_list('name', 'id'))
+        missing = names - self.team_ids.keys()
+        if missing:
+            Team.objects.bulk_create(
+                [Team(name=name, short_name=name[:10]) for name in sorted(missing)],
+                batch_size=self.batch_size,
+            )
+            self.team_ids = dict(Team.objects.values_list('name', 'id'))
+
+    def ensure_players(self, names):
+        names = {name for name in names if name}
+        if not self.player_ids:
+            self.player_ids = dict(Player.objects.values_list('name', 'id'))
+        missing = names - self.player_ids.keys()
+        if missing:
+            Player.objects.bulk_create(
+                [Player(name=name) for name in sorted(missing)],
+                batch_size=self.batch_size,
+            )
+            self.player_ids = dict(Player.objects.values_list('name', 'id'))
+
     def load_matches(self, matches_file):
         self.stdout.write('Loading matches data...')
-        
+
         with open(matches_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            for row in reader:
-                # Create teams if they don't exist
-                team1, _ = Team.objects.get_or_create(
-                    name=row['team1'],
-                    defaults={'short_name': row['team1'][:10]}
-                )
-                team2, _ = Team.objects.get_or_create(
-                    name=row['team2'],
-                    defaults={'short_name': row['team2'][:10]}
-                )
-                
-                # Handle toss winner
-                toss_winner = None
-                if row.get('toss_winner'):
-                    toss_winner, _ = Team.objects.get_or_create(
-                        name=row['toss_winner'],
-                        defaults={'short_name': row['toss_winner'][:10]}
-                    )
-                
-                # Handle winner
-                winner = None
-                if row.get('winner'):
-                    winner, _ = Team.objects.get_or_create(
-                        name=row['winner'],
-                        defaults={'short_name': row['winner'][:10]}
-                    )
-                
-                # Handle player of match
-                player_of_match = None
-                if row.get('player_of_match'):
-                    player_of_match, _ = Player.objects.get_or_create(
-                        name=row['player_of_match']
-                    )
-                
-                # Parse date - handle multiple date formats
-                try:
-                    if '/' in row['date']:
-                        # Format: MM/DD/YYYY or DD/MM/YYYY
-                        date_obj = datetime.strptime(row['date'], '%m/%d/%Y').date()
-                    else:
-                        # Format: YYYY-MM-DD
-                        date_obj = datetime.strptime(row['date'], '%Y-%m-%d').date()
-                except ValueError:
-                    try:
-                        # Try alternative format
-                        date_obj = datetime.strptime(row['date'], '%d/%m/%Y').date()
-                    except ValueError:
-                        self.stdout.write(
-                            self.style.WARNING(f'Could not parse date: {row["date"]}, using default')
-                        )
-                        date_obj = datetime.strptime('2008-01-01', '%Y-%m-%d').date()
-                
-                # Create match
-                Match.objects.get_or_create(
-                    match_id=int(row['id']),
-                    defaults={
-                        'season': row.get('season', '2008'),
-                        'city': row.get('city', ''),
-                        'date': date_obj,
-                        'team1': team1,
-                        'team2': team2,
-                        'toss_winner': toss_winner,
-                        'toss_decision': row.get('toss_decision', '').lower(),
-                        'result': row.get('result', 'normal'),
-                        'dl_applied': row.get('dl_applied', '0') == '1',
-                        'winner': winner,
-                        'win_by_runs': int(row.get('win_by_runs', 0) or 0),
-                        'win_by_wickets': int(row.get('win_by_wickets', 0) or 0),
-                        'player_of_match': player_of_match,
-                        'venue': row.get('venue', ''),
-                        'umpire1': row.get('umpire1', ''),
-                        'umpire2': row.get('umpire2', ''),
-                        'umpire3': row.get('umpire3', ''),
-                    }
+            rows = list(csv.DictReader(file))
+
+        # Skip rows whose content is unchanged since the last load
+        if self.incremental:
+            stored = dict(Match.objects.values_list('match_id', 'source_hash'))
+            rows = [row for row in rows if stored.get(int(row['id'])) != row_digest(row.values())]
+
+        # A match moving between seasons dirties both the old and the new one
+        stored = {}
+        stored_teams = {}
+        for match_id, season, date, team1, team2 in Match.objects.values_list(
+                'match_id', 'season', 'date', 'team1_id', 'team2_id'):
+            stored[match_id] = (season, date)
+            stored_teams[match_id] = (team1, team2)
+        for row in rows:
+            self.dirty_seasons.add(row.get('season', '2008'))
+            self.dirty_seasons.add(stored.get(int(row['id']), (None, None))[0])
+            self.dirty_teams.update(stored_teams.get(int(row['id']), ()))
+        self.dirty_seasons.discard(None)
+
+        # Create all teams and players referenced by the matches in one go
+        self.ensure_teams(row.get(column) for row in rows for column in MATCH_TEAM_COLUMNS)
+        self.ensure_players(row.get('player_of_match') for row in rows)
+
+        matches = {}
+        for row in rows:
+            date_obj = parse_date(row['date'])
+            if date_obj is None:
+                self.stdout.write(
+                    self.style.WARNING(f'Could not parse date: {row["date"]}, using default')
                 )
-        
-        self.stdout.write(f'Loaded {Match.objects.count()} matches')
+                date_obj = datetime.strptime('2008-01-01', '%Y-%m-%d').date()
+
+            match_id = int(row['id'])
+            matches[match_id] = Match(
+                match_id=match_id,
+                season=row.get('season', '2008'),
+                city=row.get('city', ''),
+                date=date_obj,
+                team1_id=self.team_ids[row['team1']],
+                team2_id=self.team_ids[row['team2']],
+                toss_winner_id=self.team_ids.get(row.get('toss_winner')),
+                toss_decision=row.get('toss_decision', '').lower(),
+                result=row.get('result', 'normal'),
+                dl_applied=row.get('dl_applied', '0') == '1',
+                winner_id=self.team_ids.get(row.get('winner')),
+                win_by_runs=parse_int(row.get('win_by_runs')),
+                win_by_wickets=parse_int(row.get('win_by_wickets')),
+                player_of_match_id=self.player_ids.get(row.get('player_of_match')),
+                venue=row.get('venue', ''),
+                umpire1=row.get('umpire1', ''),
+                umpire2=row.get('umpire2', ''),
+                umpire3=row.get('umpire3', ''),
+                source_hash=row_digest(row.values()),
+            )
+            self.dirty_teams.update((matches[match_id].team1_id, matches[match_id].team2_id))
+
+        # Upsert on the natural key so reloading the same file is idempotent
+        Match.objects.bulk_create(
+            matches.values(),
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['match_id'],
+            update_fields=MATCH_UPDATE_FIELDS,
+        )
+        self.match_ids = dict(Match.objects.values_list('match_id', 'id'))
+
+        # Keep the season and date copied onto existing deliveries in step with their match
+        moved = [
+            self.match_ids[match_id] for match_id, match in matches.items()
+            if match_id in stored and stored[match_id] != (match.season, match.date)
+        ]
+        if moved:
+            match_rows = Match.objects.filter(pk=OuterRef('match_id'))
+            Delivery.objects.filter(match_id__in=moved).update(
+                season=Subquery(match_rows.values('season')[:1]),
+                date=Subquery(match_rows.values('date')[:1]),
+            )
+
+        self.stdout.write(f'Loaded {len(matches)} new or changed matches ({len(self.match_ids)} total)')
+
+    def map_shards(self, function, path, shards, fieldnames, initializer=None, initargs=()):
+        """Apply ``function`` to every shard, in a process pool when --workers > 1.
+
+        Results are yielded in shard order with a bounded number in flight, so
+        the single writer consumes them as a stream.
+        """
+        if self.workers == 1:
+            if initializer:
+                initializer(*initargs)
+            for start, end in shards:
+                yield function(path, start, end, fieldnames)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=initializer,
+                                 initargs=initargs) as executor:
+            pending = deque()
+            for start, end in shards:
+                pending.append(executor.submit(function, path, start, end, fieldnames))
+                if len(pending) >= self.workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def scan_deliveries(self, path, shards, fieldnames, grouped=True):
+        # First pass: gather every distinct team and player name and a content hash per match
+        team_names = set()
+        player_names = set()
+        hashes = {}
+        scan = scan_shard if grouped else partial(scan_shard, grouped=False)
+        for shard_teams, shard_players, shard_hashes in self.map_shards(scan, path, shards, fieldnames):
+            overlap = hashes.keys() & shard_hashes.keys()
+            if overlap:
+                raise UngroupedDeliveries(f'Deliveries for match {min(overlap)} are not contiguous in {path}')
+            team_names |= shard_teams
+            player_names |= shard_players
+            hashes.update(shard_hashes)
+        return team_names, player_names, hashes
+
+    def changed_matches(self, hashes):
+        stored = dict(Match.objects.values_list('match_id', 'deliveries_hash'))
+        return {
+            match_id for match_id, digest in hashes.items()
+            if not self.incremental or stored.get(match_id) != digest
+        }
+
+    def upsert_deliveries(self, rows):
+        connection = connections[router.db_for_write(Delivery)]
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            Delivery.objects.bulk_create(
+                [Delivery(**dict(zip(DELIVERY_COLUMNS, row))) for row in rows],
+                update_conflicts=True,
+                unique_fields=['match', 'inning', 'over', 'ball', 'sequence'],
+                update_fields=[column.removesuffix('_id') for column in DELIVERY_VALUE_COLUMNS],
+            )
+            return
+
+        # COPY-style insert: one prepared statement executed for the whole batch
+        qn = connection.ops.quote_name
+        sql = 'INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ({}) DO UPDATE SET {}'.format(
+            qn(Delivery._meta.db_table),
+            ', '.join(qn(column) for column in DELIVERY_COLUMNS),
+            ', '.join(['%s'] * len(DELIVERY_COLUMNS)),
+            ', '.join(qn(column) for column in DELIVERY_KEY_COLUMNS),
+            ', '.join(f'{qn(column)} = EXCLUDED.{qn(column)}' for column in DELIVERY_VALUE_COLUMNS),
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def prune_deliveries(self, match_pk, keys):
+        # Remove rows a previous load wrote for this match that are no longer in the file
+        existing = Delivery.objects.filter(match_id=match_pk).values_list(
+            'id', 'inning', 'over', 'ball', 'sequence'
+        )
+        stale = [pk for pk, *key in existing if tuple(key) not in keys]
+        if stale:
+            Delivery.objects.filter(id__in=stale).delete()
+        return len(stale)
 
     def load_deliveries(self, deliveries_file):
-        self.stdout.write('Loading deliveries data...')
-        
-        with open(deliveries_file, 'r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            batch_size = 1000
-            deliveries_batch = []
-            
-            for i, row in enumerate(reader):
-                try:
-                    # Get match
-                    match = Match.objects.get(match_id=int(row['match_id']))
-                    
-                    # Get or create teams
-                    batting_team, _ = Team.objects.get_or_create(
-                        name=row['batting_team'],
-                        defaults={'short_name': row['batting_team'][:10]}
-                    )
-                    bowling_team, _ = Team.objects.get_or_create(
-                        name=row['bowling_team'],
-                        defaults={'short_name': row['bowling_team'][:10]}
-                    )
-                    
-                    # Get or create players
-                    batsman, _ = Player.objects.get_or_create(name=row['batsman'])
-                    non_striker, _ = Player.objects.get_or_create(name=row['non_striker'])
-                    bowler, _ = Player.objects.get_or_create(name=row['bowler'])
-                    
-                    # Handle dismissed player
-                    player_dismissed = None
-                    if row.get('player_dismissed'):
-                        player_dismissed, _ = Player.objects.get_or_create(
-                            name=row['player_dismissed']
-                        )
-                    
-                    # Handle fielder
-                    fielder = None
-                    if row.get('fielder'):
-                        fielder, _ = Player.objects.get_or_create(name=row['fielder'])
-                    
-                    delivery = Delivery(
-                        match=match,
-                        inning=int(row['inning']),
-                        batting_team=batting_team,
-                        bowling_team=bowling_team,
-                        over=int(row['over']),
-                        ball=int(row['ball']),
-                        batsman=batsman,
-                        non_striker=non_striker,
-                        bowler=bowler,
-                        is_super_over=row.get('is_super_over', '0') == '1',
-                        wide_runs=int(row.get('wide_runs', 0) or 0),
-                        bye_runs=int(row.get('bye_runs', 0) or 0),
-                        legbye_runs=int(row.get('legbye_runs', 0) or 0),
-                        noball_runs=int(row.get('noball_runs', 0) or 0),
-                        penalty_runs=int(row.get('penalty_runs', 0) or 0),
-                        batsman_runs=int(row.get('batsman_runs', 0) or 0),
-                        extra_runs=int(row.get('extra_runs', 0) or 0),
-                        total_runs=int(row.get('total_runs', 0) or 0),
-                        player_dismissed=player_dismissed,
-                        dismissal_kind=row.get('dismissal_kind', ''),
-                        fielder=fielder,
-                    )
-                    
-                    deliveries_batch.append(delivery)
-                    
-                    # Bulk create in batches
-                    if len(deliveries_batch) >= batch_size:
-                        Delivery.objects.bulk_create(deliveries_batch)
-                        deliveries_batch = []
-                        self.stdout.write(f'Loaded {i + 1} deliveries...')
-                
-                except Match.DoesNotExist:
-                    self.stdout.write(
-                        self.style.WARNING(f'Match {row["match_id"]} not found, skipping delivery')
-                    )
-                    continue
-                except Exception as e:
-                    self.stdout.write(
-                        self.style.ERROR(f'Error processing delivery {i + 1}: {str(e)}')
-                    )
-                    continue
-            
-            # Create remaining deliveries
-            if deliveries_batch:
-                Delivery.objects.bulk_create(deliveries_batch)
-        
-        self.stdout.write(f'Loaded {Delivery.objects.count()} deliveries')
\ No newline at end of file
+        self.stdout.write(f'Loading deliveries data with {self.workers} worker(s)...')
+        started = time.perf_counter()
+
+        fieldnames = read_header(deliveries_file)
+        shards = shard_offsets(deliveries_file, self.shard_size)
+        grouped = True
+        try:
+            team_names, player_names, hashes = self.scan_deliveries(deliveries_file, shards, fieldnames)
+        except UngroupedDeliveries as e:
+            # Shards must not split a match; read a file not grouped by match as one shard instead
+            self.stdout.write(self.style.WARNING(f'{e}; loading the file as a single shard'))
+            shards = [(shards[0][0], shards[-1][1])]
+            grouped = False
+            team_names, player_names, hashes = self.scan_deliveries(deliveries_file, shards, fieldnames, grouped)
+        changed = self.changed_matches(hashes)
+        connection = connections[router.db_for_write(Delivery)]
+        match_rows = {
+            match_id: (pk, season, connection.ops.adapt_datefield_value(date))
+            for match_id, pk, season, date in Match.objects.values_list('match_id', 'id', 'season', 'date')
+        }
+        self.dirty_seasons.update(match_rows[match_id][1] for match_id in changed if match_id in match_rows)
+        self.ensure_teams(team_names)
+        self.ensure_players(player_names)
+        loaded_before = set(Delivery.objects.values_list('match_id', flat=True).distinct())
+
+        # Second pass: workers turn shards into row tuples, this process is the only writer
+        convert = iter_converted if self.workers == 1 else convert_shard
+        results = self.map_shards(
+            convert if grouped else partial(convert, grouped=False),
+            deliveries_file, shards, fieldnames,
+            initializer=init_converter,
+            initargs=(self.team_ids, self.player_ids, match_rows, changed),
+        )
+
+        loaded = 0
+        pruned = 0
+        skipped_matches = set()
+        current_pk = None
+        # Natural keys written per match, kept only until stale rows have been pruned
+        written_keys = {}
+        deliveries_batch = []
+        for item in chain.from_iterable(results):
+            if isinstance(item[0], str):
+                kind, value = item
+                if kind == 'skipped':
+                    skipped_matches.add(value)
+                else:
+                    self.stdout.write(self.style.ERROR(value))
+                continue
+
+            current_pk = item[0]
+            deliveries_batch.append(item)
+            if current_pk in loaded_before:
+                written_keys.setdefault(current_pk, set()).add(item[1:5])
+
+            # Upsert in batches
+            if len(deliveries_batch) >= self.batch_size:
+                self.upsert_deliveries(deliveries_batch)
+                loaded += len(deliveries_batch)
+                deliveries_batch = []
+                self.stdout.write(f'Loaded {loaded} deliveries...')
+
+                # Every match except the current one has now been fully written, if the file is grouped
+                for match_pk in [pk for pk in written_keys if grouped and pk != current_pk]:
+                    pruned += self.prune_deliveries(match_pk, written_keys.pop(match_pk))
+
+        # Upsert remaining deliveries
+        if deliveries_batch:
+            self.upsert_deliveries(deliveries_batch)
+            loaded += len(deliveries_batch)
+        for match_pk, keys in written_keys.items():
+            pruned += self.prune_deliveries(match_pk, keys)
+        self.deliveries_written = loaded + pruned
+
+        # Remember what was loaded so the next incremental run can skip it
+        Match.objects.bulk_update(
+            [
+                Match(id=self.match_ids[match_id], deliveries_hash=hashes[match_id])
+                for match_id in changed if match_id in self.match_ids
+            ],
+            ['deliveries_hash'],
+            batch_size=self.batch_size,
+        )
+
+        for match_id in sorted(skipped_matches):
+            self.stdout.write(
+                self.style.WARNING(f'Match {match_id} not found, skipped its deliveries')
+            )
+
+        elapsed = time.perf_counter() - started
+        rate = loaded / elapsed if elapsed > 0 else 0
+        self.stdout.write(
+            f'Loaded {loaded} deliveries for {len(changed)} new or changed matches, '
+            f'removed {pruned} stale rows in {elapsed:.1f}s ({rate:,.0f} rows/sec)'
+        )
+
+    def refresh_aggregates(self):
+        started = time.perf_counter()
+        refresh_season_stats(self.dirty_seasons)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Refreshed summaries for {len(self.dirty_seasons)} season(s) in {elapsed:.1f}s')
+
+        started = time.perf_counter()
+        refresh_head_to_head(self.dirty_teams)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Refreshed head-to-head records for {len(self.dirty_teams)} team(s) in {elapsed:.1f}s')
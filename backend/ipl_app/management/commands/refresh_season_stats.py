@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ipl_app.aggregates import refresh_season_stats
+from ipl_app.dataset import bump_dataset_version
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-season team and bowler summary tables from Match and Delivery'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--season', action='append', dest='seasons',
+                          help='Season to rebuild (repeatable); defaults to every season')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            refresh_season_stats(options['seasons'])
+            bump_dataset_version()
+        self.stdout.write(self.style.SUCCESS('Season summaries refreshed'))
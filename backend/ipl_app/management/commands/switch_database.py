@@ -0,0 +1,54 @@
+import os
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from ipl_app.bluegreen import (
+    InvalidBuild, activate_build, build_path, build_version, builds_dir, deactivate_builds, list_builds, read_active,
+    validate_build,
+)
+
+
+class Command(BaseCommand):
+    help = ('List the blue/green database builds, switch to one of them or roll back to the build '
+            'before the active one; API processes follow within IPL_DATASET_VERSION_TTL seconds')
+
+    def add_arguments(self, parser):
+        parser.add_argument('build', nargs='?', help='Name of the build to activate')
+        parser.add_argument('--rollback', action='store_true',
+                          help='Activate the newest build older than the active one, or DATABASE_PATH '
+                               'when the first build is active')
+        parser.add_argument('--list', action='store_true', help='List the kept builds')
+
+    def handle(self, *args, **options):
+        builds = list_builds()
+        active = read_active()
+        if options['list'] or not (options['build'] or options['rollback']):
+            if not builds:
+                self.stdout.write(f'No builds in {builds_dir()}')
+            for name in builds:
+                path = build_path(name)
+                self.stdout.write(
+                    f'{"*" if name == active else " "} {name}  version {build_version(path)}  '
+                    f'{os.path.getsize(path) / 1024 / 1024:.1f} MiB'
+                )
+            return
+
+        if options['rollback']:
+            if active is None:
+                raise CommandError('No build is active, so there is nothing to roll back')
+            older = [name for name in builds if name < active]
+            if not older:
+                deactivate_builds()
+                self.stdout.write(self.style.SUCCESS(f'Switched from {active} to {settings.DATABASE_PATH}'))
+                return
+            target = older[-1]
+        else:
+            target = options['build']
+            if target not in builds:
+                raise CommandError(f'No build named {target} in {builds_dir()}')
+
+        try:
+            validate_build(build_path(target))
+        except InvalidBuild as e:
+            raise CommandError(str(e))
+        activate_build(target)
+        self.stdout.write(self.style.SUCCESS(f'Switched from {active or settings.DATABASE_PATH} to {target}'))
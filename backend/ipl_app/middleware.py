@@ -0,0 +1,63 @@
+import hashlib
+from django.conf import settings
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_etags
+from .dataset import get_dataset_version
+
+
+def etag_exempt(view):
+    """Opt a view out of DatasetETagMiddleware, e.g. for process-local statistics."""
+    view.dataset_etag_exempt = True
+    return view
+
+
+class DatasetETagMiddleware(MiddlewareMixin):
+    """Conditional GET support for the read-only API, driven by the dataset version.
+
+    Every API response is a pure function of the loaded data, the request
+    URL and the ``Accept`` header (the renderers share URLs, and e.g.
+    ``application/json; indent=2`` changes the body), so a strong ETag can
+    be derived from the dataset version, the path plus normalized query
+    string and ``Accept`` before the view runs; responses carry
+    ``Vary: Accept``. A matching ``If-None-Match`` is answered with 304
+    without calling the view.
+    MiddlewareMixin makes it usable in both the WSGI and the ASGI stack.
+    """
+
+    def process_response(self, request, response):
+        etag = getattr(request, 'dataset_etag', None)
+        if etag and response.status_code == 200 and not response.has_header('ETag'):
+            response['ETag'] = etag
+            self.add_cache_headers(response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(settings.IPL_ETAG_PATH_PREFIX):
+            return None
+        if getattr(view_func, 'dataset_etag_exempt', False):
+            return None
+
+        request.dataset_etag = self.etag_for(request)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and (if_none_match.strip() == '*' or request.dataset_etag in parse_etags(if_none_match)):
+            response = HttpResponseNotModified()
+            response['ETag'] = request.dataset_etag
+            self.add_cache_headers(response)
+            return response
+        return None
+
+    def etag_for(self, request):
+        query = '&'.join(
+            f'{key}={",".join(request.GET.getlist(key))}' for key in sorted(request.GET)
+        )
+        accept = ','.join(part.strip() for part in request.META.get('HTTP_ACCEPT', '').split(','))
+        digest = hashlib.sha1(f'{get_dataset_version()}|{request.path}?{query}|{accept}'.encode('utf-8'))
+        return f'"{digest.hexdigest()}"'
+
+    def add_cache_headers(self, response):
+        if not response.has_header('Cache-Control'):
+            response['Cache-Control'] = settings.IPL_API_CACHE_CONTROL
+        patch_cache_control(response, public=True)
+        patch_vary_headers(response, ('Accept',))
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:41
+
+from django.db import migrations, models
+
+
+def number_duplicate_deliveries(apps, schema_editor):
+    # Earlier loads appended rows without a natural key; give rows that share
+    # match/inning/over/ball increasing sequence numbers in insertion order.
+    Delivery = apps.get_model('ipl_app', 'Delivery')
+    db_alias = schema_editor.connection.alias
+    seen = {}
+    updates = []
+    deliveries = Delivery.objects.using(db_alias).order_by('id').values_list(
+        'id', 'match_id', 'inning', 'over', 'ball'
+    )
+    for pk, *key in deliveries.iterator(chunk_size=10000):
+        key = tuple(key)
+        sequence = seen.get(key, -1) + 1
+        seen[key] = sequence
+        if sequence:
+            updates.append(Delivery(id=pk, sequence=sequence))
+    Delivery.objects.using(db_alias).bulk_update(updates, ['sequence'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='sequence',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='deliveries_hash',
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.AddField(
+            model_name='match',
+            name='source_hash',
+            field=models.CharField(blank=True, editable=False, max_length=40),
+        ),
+        migrations.RunPython(number_duplicate_deliveries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='delivery',
+            constraint=models.UniqueConstraint(fields=('match', 'inning', 'over', 'ball', 'sequence'), name='unique_delivery_natural_key'),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q, Sum
+
+
+def populate_season_summaries(apps, schema_editor):
+    # Fill the summaries for data loaded before they existed; later loads maintain them
+    Match = apps.get_model('ipl_app', 'Match')
+    Delivery = apps.get_model('ipl_app', 'Delivery')
+    SeasonTeamStats = apps.get_model('ipl_app', 'SeasonTeamStats')
+    SeasonBowlerStats = apps.get_model('ipl_app', 'SeasonBowlerStats')
+    db_alias = schema_editor.connection.alias
+
+    teams = {}
+    matches = Match.objects.using(db_alias)
+    for column in ('team1', 'team2'):
+        for item in matches.values('season', column).annotate(played=Count('id')).order_by():
+            key = (item['season'], item[column])
+            teams.setdefault(key, SeasonTeamStats(season=key[0], team_id=key[1]))
+            teams[key].matches_played += item['played']
+    for item in matches.filter(winner__isnull=False).values('season', 'winner').annotate(won=Count('id')).order_by():
+        teams[item['season'], item['winner']].matches_won = item['won']
+    deliveries = Delivery.objects.using(db_alias)
+    for item in deliveries.values('match__season', 'bowling_team').annotate(extras=Sum('extra_runs')).order_by():
+        key = (item['match__season'], item['bowling_team'])
+        teams.setdefault(key, SeasonTeamStats(season=key[0], team_id=key[1]))
+        teams[key].extra_runs_conceded = item['extras'] or 0
+    SeasonTeamStats.objects.using(db_alias).bulk_create(teams.values(), batch_size=1000)
+
+    bowlers = deliveries.values('match__season', 'bowler').annotate(
+        balls=Count('id'),
+        runs=Sum('total_runs'),
+        wickets=Count('player_dismissed', filter=Q(player_dismissed__isnull=False)),
+    ).order_by()
+    SeasonBowlerStats.objects.using(db_alias).bulk_create([
+        SeasonBowlerStats(
+            season=item['match__season'], bowler_id=item['bowler'], balls=item['balls'],
+            runs_conceded=item['runs'] or 0, wickets=item['wickets'],
+        )
+        for item in bowlers
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0002_delivery_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonTeamStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=10)),
+                ('matches_played', models.IntegerField(default=0)),
+                ('matches_won', models.IntegerField(default=0)),
+                ('extra_runs_conceded', models.IntegerField(default=0)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_stats', to='ipl_app.team')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SeasonBowlerStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=10)),
+                ('balls', models.IntegerField(default=0)),
+                ('runs_conceded', models.IntegerField(default=0)),
+                ('wickets', models.IntegerField(default=0)),
+                ('bowler', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_bowling_stats', to='ipl_app.player')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='seasonteamstats',
+            constraint=models.UniqueConstraint(fields=('season', 'team'), name='unique_season_team_stats'),
+        ),
+        migrations.AddConstraint(
+            model_name='seasonbowlerstats',
+            constraint=models.UniqueConstraint(fields=('season', 'bowler'), name='unique_season_bowler_stats'),
+        ),
+        migrations.RunPython(populate_season_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0003_season_summaries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['bowler', 'match'], name='delivery_bowler_match_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['match', 'bowling_team', 'extra_runs'], name='delivery_extras_cover_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['season'], name='match_season_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='match',
+            index=models.Index(fields=['season', 'winner'], name='match_season_winner_idx'),
+        ),
+    ]
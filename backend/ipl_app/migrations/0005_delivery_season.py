@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:49
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_match_season(apps, schema_editor):
+    Match = apps.get_model('ipl_app', 'Match')
+    Delivery = apps.get_model('ipl_app', 'Delivery')
+    matches = Match.objects.using(schema_editor.connection.alias).filter(pk=OuterRef('match_id'))
+    Delivery.objects.using(schema_editor.connection.alias).update(
+        season=Subquery(matches.values('season')[:1]),
+        date=Subquery(matches.values('date')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0004_analytic_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='delivery',
+            name='delivery_extras_cover_idx',
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='season',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.RunPython(copy_match_season, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['season', 'bowler'], name='delivery_season_bowler_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='delivery',
+            index=models.Index(fields=['season', 'bowling_team', 'extra_runs'], name='delivery_season_extras_idx'),
+        ),
+    ]
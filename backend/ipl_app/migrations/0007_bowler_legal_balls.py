@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:01
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_legal_balls(apps, schema_editor):
+    Delivery = apps.get_model('ipl_app', 'Delivery')
+    SeasonBowlerStats = apps.get_model('ipl_app', 'SeasonBowlerStats')
+    db_alias = schema_editor.connection.alias
+
+    legal = {
+        (item['season'], item['bowler']): item['legal_balls']
+        for item in Delivery.objects.using(db_alias).filter(wide_runs=0, noball_runs=0)
+        .values('season', 'bowler').annotate(legal_balls=Count('id')).order_by()
+    }
+    stats = list(SeasonBowlerStats.objects.using(db_alias).all())
+    for item in stats:
+        item.legal_balls = legal.get((item.season, item.bowler_id), 0)
+    SeasonBowlerStats.objects.using(db_alias).bulk_update(stats, ['legal_balls'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0006_dataset_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='seasonbowlerstats',
+            name='legal_balls',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_legal_balls, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:04
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, F, Q
+
+
+def populate_head_to_head(apps, schema_editor):
+    # Build the records for matches loaded before they existed; later loads maintain them
+    Match = apps.get_model('ipl_app', 'Match')
+    HeadToHead = apps.get_model('ipl_app', 'HeadToHead')
+    TeamVenueStats = apps.get_model('ipl_app', 'TeamVenueStats')
+    db_alias = schema_editor.connection.alias
+
+    pairs = {}
+    venues = {}
+    for side, other in (('team1', 'team2'), ('team2', 'team1')):
+        for key_field, records in ((other, pairs), ('venue', venues)):
+            grouped = Match.objects.using(db_alias).values(side, key_field).annotate(
+                played=Count('id'),
+                won=Count('id', filter=Q(winner=F(side))),
+                lost=Count('id', filter=Q(winner=F(other))),
+                undecided=Count('id', filter=Q(winner__isnull=True)),
+            ).order_by()
+            for item in grouped:
+                record = records.setdefault((item[side], item[key_field]), [0, 0, 0, 0])
+                for index, name in enumerate(('played', 'won', 'lost', 'undecided')):
+                    record[index] += item[name]
+
+    HeadToHead.objects.using(db_alias).bulk_create([
+        HeadToHead(team_id=team, opponent_id=opponent, matches=played, wins=won, losses=lost, no_results=undecided)
+        for (team, opponent), (played, won, lost, undecided) in pairs.items()
+    ], batch_size=1000)
+    TeamVenueStats.objects.using(db_alias).bulk_create([
+        TeamVenueStats(venue=venue, team_id=team, matches=played, wins=won, losses=lost, no_results=undecided)
+        for (team, venue), (played, won, lost, undecided) in venues.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0007_bowler_legal_balls'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamVenueStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('venue', models.CharField(max_length=200)),
+                ('matches', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('no_results', models.IntegerField(default=0)),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='venue_stats', to='ipl_app.team')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HeadToHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matches', models.IntegerField(default=0)),
+                ('wins', models.IntegerField(default=0)),
+                ('losses', models.IntegerField(default=0)),
+                ('no_results', models.IntegerField(default=0)),
+                ('opponent', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='ipl_app.team')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='head_to_head', to='ipl_app.team')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='teamvenuestats',
+            constraint=models.UniqueConstraint(fields=('venue', 'team'), name='unique_team_venue_stats'),
+        ),
+        migrations.AddConstraint(
+            model_name='headtohead',
+            constraint=models.UniqueConstraint(fields=('team', 'opponent'), name='unique_head_to_head'),
+        ),
+        migrations.RunPython(populate_head_to_head, migrations.RunPython.noop),
+    ]
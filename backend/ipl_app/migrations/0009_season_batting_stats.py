@@ -0,0 +1,58 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:06
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q, Sum
+
+
+def populate_batting_stats(apps, schema_editor):
+    Delivery = apps.get_model('ipl_app', 'Delivery')
+    SeasonBattingStats = apps.get_model('ipl_app', 'SeasonBattingStats')
+    db_alias = schema_editor.connection.alias
+
+    deliveries = Delivery.objects.using(db_alias)
+    stats = {}
+    for item in deliveries.values('season', 'batsman').annotate(
+        runs=Sum('batsman_runs'),
+        balls=Count('id', filter=Q(wide_runs=0)),
+        fours=Count('id', filter=Q(batsman_runs=4)),
+        sixes=Count('id', filter=Q(batsman_runs=6)),
+    ).order_by():
+        stats[item['season'], item['batsman']] = SeasonBattingStats(
+            season=item['season'], batsman_id=item['batsman'], runs=item['runs'] or 0,
+            balls=item['balls'], fours=item['fours'], sixes=item['sixes'],
+        )
+    for item in deliveries.filter(player_dismissed__isnull=False).values(
+        'season', 'player_dismissed'
+    ).annotate(dismissals=Count('id')).order_by():
+        key = (item['season'], item['player_dismissed'])
+        stats.setdefault(key, SeasonBattingStats(season=key[0], batsman_id=key[1])).dismissals = item['dismissals']
+    SeasonBattingStats.objects.using(db_alias).bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0008_head_to_head'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeasonBattingStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('season', models.CharField(max_length=10)),
+                ('runs', models.IntegerField(default=0)),
+                ('balls', models.IntegerField(default=0)),
+                ('fours', models.IntegerField(default=0)),
+                ('sixes', models.IntegerField(default=0)),
+                ('dismissals', models.IntegerField(default=0)),
+                ('batsman', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='season_batting_stats', to='ipl_app.player')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='seasonbattingstats',
+            constraint=models.UniqueConstraint(fields=('season', 'batsman'), name='unique_season_batting_stats'),
+        ),
+        migrations.RunPython(populate_batting_stats, migrations.RunPython.noop),
+    ]
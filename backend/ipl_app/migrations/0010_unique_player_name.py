@@ -0,0 +1,73 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:09
+
+import uuid
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+PLAYER_REFERENCES = [
+    ('Match', 'player_of_match'),
+    ('Delivery', 'batsman'),
+    ('Delivery', 'non_striker'),
+    ('Delivery', 'bowler'),
+    ('Delivery', 'player_dismissed'),
+    ('Delivery', 'fielder'),
+]
+# (summary model, player field, counters) of the per-season tables unique on (season, player)
+SEASON_STATS = [
+    ('SeasonBowlerStats', 'bowler', ('balls', 'legal_balls', 'runs_conceded', 'wickets')),
+    ('SeasonBattingStats', 'batsman', ('runs', 'balls', 'fours', 'sixes', 'dismissals')),
+]
+
+
+def merge_duplicate_players(apps, schema_editor):
+    # Fold every duplicate name into its oldest row, as the loader already resolved names
+    Player = apps.get_model('ipl_app', 'Player')
+    DatasetVersion = apps.get_model('ipl_app', 'DatasetVersion')
+    db_alias = schema_editor.connection.alias
+
+    duplicates = Player.objects.using(db_alias).values('name').annotate(
+        keep=Min('id'), rows=Count('id')
+    ).filter(rows__gt=1).order_by()
+    merged = False
+    for item in duplicates:
+        keep = item['keep']
+        extra = list(Player.objects.using(db_alias).filter(name=item['name']).exclude(pk=keep).values_list('pk', flat=True))
+        for model_name, field in PLAYER_REFERENCES:
+            model = apps.get_model('ipl_app', model_name)
+            model.objects.using(db_alias).filter(**{f'{field}__in': extra}).update(**{field: keep})
+
+        for model_name, field, counters in SEASON_STATS:
+            model = apps.get_model('ipl_app', model_name)
+            for row in model.objects.using(db_alias).filter(**{f'{field}__in': extra}):
+                kept = model.objects.using(db_alias).filter(season=row.season, **{field: keep}).first()
+                if kept is None:
+                    setattr(row, f'{field}_id', keep)
+                    row.save()
+                    continue
+                for counter in counters:
+                    setattr(kept, counter, getattr(kept, counter) + getattr(row, counter))
+                kept.save()
+                row.delete()
+
+        Player.objects.using(db_alias).filter(pk__in=extra).delete()
+        merged = True
+
+    if merged:
+        # Player ids in cached responses may point at deleted rows
+        DatasetVersion.objects.using(db_alias).update_or_create(pk=1, defaults={'version': uuid.uuid4().hex})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0009_season_batting_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_players, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='player',
+            name='name',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:40
+
+import uuid
+from django.db import migrations
+from django.db.models import Count, F, Q, Sum
+
+
+def recompute_bowling_figures(apps, schema_editor):
+    Delivery = apps.get_model('ipl_app', 'Delivery')
+    SeasonBowlerStats = apps.get_model('ipl_app', 'SeasonBowlerStats')
+    DatasetVersion = apps.get_model('ipl_app', 'DatasetVersion')
+    db_alias = schema_editor.connection.alias
+
+    # Byes, leg byes and run outs (and the like) are not the bowler's
+    figures = {
+        (item['season'], item['bowler']): item
+        for item in Delivery.objects.using(db_alias).values('season', 'bowler').annotate(
+            runs_conceded=Sum(F('total_runs') - F('bye_runs') - F('legbye_runs')),
+            wickets=Count('id', filter=Q(player_dismissed__isnull=False) & ~Q(dismissal_kind__in=(
+                'run out', 'retired hurt', 'retired out', 'obstructing the field',
+            ))),
+        ).order_by()
+    }
+    stats = list(SeasonBowlerStats.objects.using(db_alias).all())
+    for item in stats:
+        row = figures.get((item.season, item.bowler_id), {})
+        item.runs_conceded = row.get('runs_conceded') or 0
+        item.wickets = row.get('wickets', 0)
+    SeasonBowlerStats.objects.using(db_alias).bulk_update(stats, ['runs_conceded', 'wickets'], batch_size=1000)
+    if stats:
+        # Cached charts and ETags still carry the old figures
+        DatasetVersion.objects.using(db_alias).update_or_create(pk=1, defaults={'version': uuid.uuid4().hex})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ipl_app', '0010_unique_player_name'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_bowling_figures, migrations.RunPython.noop),
+    ]
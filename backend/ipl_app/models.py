@@ -10,7 +10,7 @@ class Team(models.Model):
         return self.name
 
 class Player(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, unique=True)
     role = models.CharField(max_length=20, choices=[
         ('batsman', 'Batsman'),
         ('bowler', 'Bowler'),   
@@ -43,17 +43,31 @@ class Match(models.Model):
     umpire1 = models.CharField(max_length=100, blank=True)
     umpire2 = models.CharField(max_length=100, blank=True)
     umpire3 = models.CharField(max_length=100, blank=True)
+    # Content hashes of the source CSV rows, used by incremental re-ingest
+    source_hash = models.CharField(max_length=40, blank=True, editable=False)
+    deliveries_hash = models.CharField(max_length=40, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['season'], name='match_season_idx'),
+            models.Index(fields=['season', 'winner'], name='match_season_winner_idx'),
+        ]
     
     def __str__(self):
         return f"Match {self.match_id}: {self.team1} vs {self.team2}"
 
 class Delivery(models.Model):
     match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name='deliveries')
+    # Copied from the match so season-scoped aggregates don't need a join
+    season = models.CharField(max_length=10, blank=True)
+    date = models.DateField(null=True, blank=True)
     inning = models.IntegerField()
     batting_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='batting_deliveries')
     bowling_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='bowling_deliveries')
     over = models.IntegerField()
     ball = models.IntegerField()
+    # Disambiguates rows that share match/inning/over/ball in the source data
+    sequence = models.PositiveSmallIntegerField(default=0)
     batsman = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='batting_deliveries')
     non_striker = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='non_striker_deliveries')
     bowler = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='bowling_deliveries')
@@ -69,6 +83,112 @@ class Delivery(models.Model):
     player_dismissed = models.ForeignKey(Player, on_delete=models.CASCADE, null=True, blank=True, related_name='dismissals')
     dismissal_kind = models.CharField(max_length=20, blank=True)
     fielder = models.ForeignKey(Player, on_delete=models.CASCADE, null=True, blank=True, related_name='fielding')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['match', 'inning', 'over', 'ball', 'sequence'],
+                name='unique_delivery_natural_key',
+            ),
+        ]
+        # (match, inning) is served by the leading columns of the natural key
+        indexes = [
+            models.Index(fields=['bowler', 'match'], name='delivery_bowler_match_idx'),
+            models.Index(fields=['season', 'bowler'], name='delivery_season_bowler_idx'),
+            models.Index(fields=['season', 'bowling_team', 'extra_runs'], name='delivery_season_extras_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.match.match_id} - {self.over}.{self.ball}: {self.batsman} vs {self.bowler}"
\ No newline at end of file
+        return f"{self.match.match_id} - {self.over}.{self.ball}: {self.batsman} vs {self.bowler}"
+
+# Per-season summary tables, maintained by load_ipl_data so chart views never scan Delivery
+class SeasonTeamStats(models.Model):
+    season = models.CharField(max_length=10)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='season_stats')
+    matches_played = models.IntegerField(default=0)
+    matches_won = models.IntegerField(default=0)
+    extra_runs_conceded = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['season', 'team'], name='unique_season_team_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.season} - {self.team}"
+
+class SeasonBowlerStats(models.Model):
+    season = models.CharField(max_length=10)
+    bowler = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='season_bowling_stats')
+    # balls counts every delivery; legal_balls leaves out wides and no-balls
+    balls = models.IntegerField(default=0)
+    legal_balls = models.IntegerField(default=0)
+    runs_conceded = models.IntegerField(default=0)
+    wickets = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['season', 'bowler'], name='unique_season_bowler_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.season} - {self.bowler}"
+
+class SeasonBattingStats(models.Model):
+    season = models.CharField(max_length=10)
+    batsman = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='season_batting_stats')
+    runs = models.IntegerField(default=0)
+    # Balls faced; wides don't count
+    balls = models.IntegerField(default=0)
+    fours = models.IntegerField(default=0)
+    sixes = models.IntegerField(default=0)
+    dismissals = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['season', 'batsman'], name='unique_season_batting_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.season} - {self.batsman}"
+
+# All-time team records, maintained by load_ipl_data for the head-to-head and venue endpoints
+class HeadToHead(models.Model):
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='head_to_head')
+    opponent = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='+')
+    matches = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    no_results = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'opponent'], name='unique_head_to_head'),
+        ]
+
+    def __str__(self):
+        return f"{self.team} vs {self.opponent}"
+
+class TeamVenueStats(models.Model):
+    venue = models.CharField(max_length=200)
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='venue_stats')
+    matches = models.IntegerField(default=0)
+    wins = models.IntegerField(default=0)
+    losses = models.IntegerField(default=0)
+    no_results = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['venue', 'team'], name='unique_team_venue_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.team} at {self.venue}"
+
+class DatasetVersion(models.Model):
+    """Single row whose token changes whenever the loaded IPL data changes."""
+    version = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.version
@@ -0,0 +1,17 @@
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Cursor pagination over a unique, indexed key.
+
+    Each page is a ``WHERE key > last_key ORDER BY key LIMIT n`` query and no
+    total count is taken, so the cost of a page does not grow with the table.
+    Views choose the key with ``cursor_ordering``.
+    """
+    ordering = 'id'
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', self.ordering)
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
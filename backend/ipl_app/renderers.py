@@ -0,0 +1,57 @@
+"""JSON renderers for the API.
+
+``FastJSONRenderer`` produces the same JSON as DRF's ``JSONRenderer`` but
+encodes through orjson when it is installed. ``ColumnarJSONRenderer``
+(``?format=columns``) additionally turns every list of row objects under
+``data`` into ``{"columns": [...], "rows": [[...], ...]}``, which drops
+the repeated keys from large chart payloads.
+"""
+import json
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional dependency; without it the stdlib encoder is used
+    orjson = None
+
+if orjson is not None:
+    # Dates and times go through DRF's encoder so they format exactly as before
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def encode_json(data):
+    """Compact UTF-8 JSON for ``data``, as DRF's JSONRenderer would write it."""
+    if orjson is not None:
+        return orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (renderer_context or {}).get('indent') or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping of the JavaScript line separators as JSONRenderer
+        return encode_json(data).replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def columnize(value):
+    """Rewrite lists of row objects, at any depth of dicts, as ``{"columns": [...], "rows": [...]}``."""
+    if isinstance(value, dict):
+        return {key: columnize(item) for key, item in value.items()}
+    if isinstance(value, list) and all(isinstance(row, dict) for row in value):
+        columns = list(value[0]) if value else []
+        if all(list(row) == columns for row in value):
+            return {'columns': columns, 'rows': [list(row.values()) for row in value]}
+    return value
+
+
+class ColumnarJSONRenderer(FastJSONRenderer):
+    format = 'columns'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and 'data' in data:
+            data = {**data, 'data': columnize(data['data'])}
+        return super().render(data, accepted_media_type, renderer_context)
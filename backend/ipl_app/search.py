@@ -0,0 +1,153 @@
+"""In-process typeahead index over player and team names.
+
+Names are normalized (accents, case and punctuation dropped) and every word
+suffix of a name becomes a sorted key, so a binary search finds prefix
+matches on the full name or on any later word ("dhon" finds "MS Dhoni").
+Typo-tolerant matching fills up the remaining results: keys sharing enough
+character bigrams at nearby offsets with the query are compared to it by
+edit distance. The index is rebuilt when the dataset version changes.
+"""
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from .dataset import get_dataset_version
+from .instrumentation import warmup
+from .models import Team, Player
+
+KINDS = ('player', 'team')
+# Shorter queries only get prefix matches
+MIN_FUZZY_LENGTH = 5
+# Bigrams are indexed by their offset in a key, up to this far in
+GRAM_OFFSETS = 24
+# Ranking tiers, best first
+TIERS = ('exact', 'prefix', 'word', 'fuzzy')
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char)).casefold()
+    return ' '.join(''.join(char if char.isalnum() else ' ' for char in text).split())
+
+
+def _bigrams(text):
+    """(bigram, offset) pairs of ``text`` with a start marker, up to ``GRAM_OFFSETS``."""
+    text = f'${text[:GRAM_OFFSETS]}'
+    return [(text[index:index + 2], index) for index in range(len(text) - 1)]
+
+
+def prefix_distance(query, key, limit):
+    """Fewest edits turning ``query`` into some prefix of ``key``, or ``limit + 1`` once that exceeds ``limit``.
+
+    Edits are insertions, deletions, substitutions and transpositions of
+    adjacent characters (optimal string alignment).
+    """
+    key = key[:len(query) + limit]
+    previous2 = None
+    previous = list(range(len(key) + 1))
+    for i, char in enumerate(query, 1):
+        current = [i] + [0] * len(key)
+        for j, other in enumerate(key, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            if i > 1 and j > 1 and char == key[j - 2] and query[i - 2] == other:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous)
+
+
+class NameIndex:
+    def __init__(self, entries, version=None):
+        """``entries`` are (kind, id, name) triples."""
+        self.version = version
+        self.entries = entries
+        self.keys = []
+        for position, (_, _, name) in enumerate(entries):
+            words = normalize(name).split()
+            for start in range(len(words)):
+                self.keys.append((' '.join(words[start:]), start > 0, position))
+        self.keys.sort()
+        self.grams = defaultdict(list)
+        for slot, (key, _, _) in enumerate(self.keys):
+            for gram in _bigrams(key):
+                self.grams[gram].append(slot)
+        self.grams = dict(self.grams)
+
+    @classmethod
+    def from_database(cls, version=None):
+        entries = [('team', pk, name) for pk, name in Team.objects.order_by('id').values_list('id', 'name')]
+        entries += [('player', pk, name) for pk, name in Player.objects.order_by('id').values_list('id', 'name')]
+        return cls(entries, version)
+
+    def search(self, query, kind=None, limit=10):
+        """Up to ``limit`` matches for ``query``, best first: exact, full-name prefix, word prefix, then typos."""
+        query = normalize(query)
+        if not query:
+            return []
+        found = {}
+
+        def consider(position, rank):
+            if (kind is None or self.entries[position][0] == kind) and rank < found.get(position, (len(TIERS),)):
+                found[position] = rank
+
+        slot = bisect_left(self.keys, (query,))
+        while slot < len(self.keys) and self.keys[slot][0].startswith(query):
+            key, inner, position = self.keys[slot]
+            consider(position, (TIERS.index('word' if inner else 'exact' if key == query else 'prefix'), 0))
+            slot += 1
+
+        if len(found) < limit and len(query) >= MIN_FUZZY_LENGTH:
+            # A key prefix within ``allowed`` edits of the query shares all but a few of its
+            # bigrams, each shifted by at most ``allowed`` places
+            allowed = 1 if len(query) < 8 else 2
+            grams = _bigrams(query)
+            shared = Counter()
+            for gram, offset in grams:
+                shared.update({
+                    slot
+                    for shift in range(max(offset - allowed, 0), offset + allowed + 1)
+                    for slot in self.grams.get((gram, shift), ())
+                })
+            for slot, count in shared.items():
+                if count < len(grams) - 3 * allowed:
+                    continue
+                key, _, position = self.keys[slot]
+                distance = prefix_distance(query, key, allowed)
+                if distance <= allowed:
+                    consider(position, (TIERS.index('fuzzy'), distance))
+
+        ranked = sorted(found, key=lambda position: (
+            found[position], len(self.entries[position][2]), self.entries[position][2], position
+        ))
+        return [
+            {
+                'type': self.entries[position][0],
+                'id': self.entries[position][1],
+                'name': self.entries[position][2],
+                'match': TIERS[found[position][0]],
+            }
+            for position in ranked[:limit]
+        ]
+
+
+_state = {'index': None}
+_lock = threading.Lock()
+
+
+def get_name_index():
+    """Return the process-wide index, rebuilding it when the dataset version has moved on."""
+    version = get_dataset_version()
+    index = _state['index']
+    if index is None or index.version != version:
+        with _lock:
+            index = _state['index']
+            if index is None or index.version != version:
+                with warmup():
+                    index = NameIndex.from_database(version)
+                _state['index'] = index
+    return index
+
+
+def search_names(query, kind=None, limit=10):
+    return get_name_index().search(query, kind=kind, limit=limit)
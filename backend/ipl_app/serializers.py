@@ -1,17 +1,105 @@
+import decimal
+from functools import lru_cache
 from rest_framework import serializers
+from .instrumentation import timed
 from .models import Team, Player, Match, Delivery
 
-class TeamSerializer(serializers.ModelSerializer):
+class TimedListSerializer(serializers.ListSerializer):
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+class TimedDataMixin:
+    """Count building ``.data`` towards the request's serialize timing.
+
+    Lists are timed through TimedListSerializer, which a serializer's Meta
+    names as its ``list_serializer_class``.
+    """
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+def _decimal_converter(field):
+    exponent = decimal.Decimal(1).scaleb(-field.decimal_places)
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            value = decimal.Decimal(str(value).strip())
+        return '{:f}'.format(value.quantize(exponent))
+    return convert
+
+
+@lru_cache(maxsize=None)
+def _compiled_fields(serializer_class):
+    """(name, key, converter, required) for each field of a flat read-only serializer."""
+    compiled = []
+    for name, field in serializer_class().fields.items():
+        if isinstance(field, serializers.DecimalField):
+            converter = _decimal_converter(field)
+        elif isinstance(field, serializers.IntegerField):
+            converter = int
+        elif isinstance(field, serializers.CharField):
+            converter = str
+        else:
+            raise TypeError(f'{serializer_class.__name__}.{name}: no fast path for {type(field).__name__}')
+        compiled.append((name, field.source, converter, field.required))
+    return tuple(compiled)
+
+
+def _fast_row(fields, row):
+    data = {}
+    for name, key, converter, required in fields:
+        if key not in row:
+            if required:
+                raise KeyError(key)
+            continue
+        value = row[key]
+        data[name] = None if value is None else converter(value)
+    return data
+
+
+def fast_data(serializer_class, rows):
+    """What ``serializer_class(rows, many=True).data`` returns for a list of dicts, without the per-field machinery.
+
+    For the chart serializers, whose fields are all plain Char, Integer and Decimal fields.
+    """
+    with timed('serialize'):
+        fields = _compiled_fields(serializer_class)
+        return [_fast_row(fields, row) for row in rows]
+
+
+def fast_row(serializer_class, row):
+    """``fast_data`` for a single dict."""
+    with timed('serialize'):
+        return _fast_row(_compiled_fields(serializer_class), row)
+
+class ProjectedFieldsMixin:
+    """Drop every field not named in the ``fields`` keyword argument."""
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class TeamSerializer(TimedDataMixin, ProjectedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Team
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'short_name', 'city']
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(TimedDataMixin, ProjectedFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Player
+        list_serializer_class = TimedListSerializer
         fields = ['id', 'name', 'role']
 
-class MatchSerializer(serializers.ModelSerializer):
+class MatchSerializer(TimedDataMixin, ProjectedFieldsMixin, serializers.ModelSerializer):
     team1_name = serializers.CharField(source='team1.name', read_only=True)
     team2_name = serializers.CharField(source='team2.name', read_only=True)
     winner_name = serializers.CharField(source='winner.name', read_only=True)
@@ -19,42 +107,74 @@ class MatchSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Match
+        list_serializer_class = TimedListSerializer
         fields = ['match_id', 'season', 'city', 'date', 'team1_name', 'team2_name', 
                  'winner_name', 'venue', 'player_of_match_name']
 
-class DeliverySerializer(serializers.ModelSerializer):
+class DeliverySerializer(TimedDataMixin, ProjectedFieldsMixin, serializers.ModelSerializer):
     batsman_name = serializers.CharField(source='batsman.name', read_only=True)
     bowler_name = serializers.CharField(source='bowler.name', read_only=True)
     batting_team_name = serializers.CharField(source='batting_team.name', read_only=True)
     
     class Meta:
         model = Delivery
+        list_serializer_class = TimedListSerializer
         fields = ['match', 'inning', 'over', 'ball', 'batsman_name', 'bowler_name', 
                  'batting_team_name', 'batsman_runs', 'extra_runs', 'total_runs']
 
 # Chart Data Serializers
-class MatchesPerYearSerializer(serializers.Serializer):
+class MatchesPerYearSerializer(TimedDataMixin, serializers.Serializer):
     year = serializers.CharField()
     matches_count = serializers.IntegerField()
 
-class TeamWinsStackedSerializer(serializers.Serializer):
+class TeamWinsStackedSerializer(TimedDataMixin, serializers.Serializer):
     team = serializers.CharField()
     year = serializers.CharField()
     wins = serializers.IntegerField()
 
-class ExtraRunsPerTeamSerializer(serializers.Serializer):
+class ExtraRunsPerTeamSerializer(TimedDataMixin, serializers.Serializer):
     team = serializers.CharField()
     extra_runs = serializers.IntegerField()
 
-class EconomicalBowlerSerializer(serializers.Serializer):
+class EconomicalBowlerSerializer(TimedDataMixin, serializers.Serializer):
     bowler = serializers.CharField()
     economy_rate = serializers.DecimalField(max_digits=5, decimal_places=2)
     overs_bowled = serializers.DecimalField(max_digits=5, decimal_places=1)
     runs_conceded = serializers.IntegerField()
     wickets_taken = serializers.IntegerField()
 
-class MatchesPlayedVsWonSerializer(serializers.Serializer):
+class BattingStatsSerializer(TimedDataMixin, serializers.Serializer):
+    season = serializers.CharField(required=False)
+    runs = serializers.IntegerField()
+    balls = serializers.IntegerField()
+    fours = serializers.IntegerField()
+    sixes = serializers.IntegerField()
+    dismissals = serializers.IntegerField()
+    strike_rate = serializers.DecimalField(max_digits=6, decimal_places=2, allow_null=True)
+
+class BowlingStatsSerializer(TimedDataMixin, serializers.Serializer):
+    season = serializers.CharField(required=False)
+    legal_balls = serializers.IntegerField()
+    runs_conceded = serializers.IntegerField()
+    wickets = serializers.IntegerField()
+    economy_rate = serializers.DecimalField(max_digits=5, decimal_places=2, allow_null=True)
+
+class MatchesPlayedVsWonSerializer(TimedDataMixin, serializers.Serializer):
     team = serializers.CharField()
     matches_played = serializers.IntegerField()
     matches_won = serializers.IntegerField()
-    win_percentage = serializers.DecimalField(max_digits=5, decimal_places=2)
\ No newline at end of file
+    win_percentage = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+class SeasonMatchesPlayedVsWonSerializer(MatchesPlayedVsWonSerializer):
+    year = serializers.CharField()
+
+class VenueRecordSerializer(TimedDataMixin, serializers.Serializer):
+    team = serializers.CharField()
+    matches = serializers.IntegerField()
+    wins = serializers.IntegerField()
+    losses = serializers.IntegerField()
+    no_results = serializers.IntegerField()
+    win_percentage = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+class HeadToHeadSerializer(VenueRecordSerializer):
+    opponent = serializers.CharField()
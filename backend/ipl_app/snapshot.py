@@ -0,0 +1,187 @@
+"""Column-oriented binary snapshots of Team, Player, Match and Delivery.
+
+Layout of a snapshot file (all integers little-endian)::
+
+    b'IPLSNAP\\0'  format version (u4)  header offset (u8)  header length (u8)
+    column data, each section 8-byte aligned
+    JSON header describing every table and column
+
+Integer, boolean, date (proleptic ordinal) and foreign key columns are
+fixed-width arrays with -1 (0 for dates) standing in for NULL. Text columns
+are dictionary-encoded: an ``<i4`` code column plus a string table of
+``<u4`` end offsets into a UTF-8 blob. Files are written under a temporary
+name and renamed into place, and are read through a read-only ``mmap`` so
+every process opening the same snapshot shares it through the page cache.
+"""
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from django.db import models
+from .models import Team, Player, Match, Delivery
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency; without it columns are exposed as memoryviews
+    np = None
+
+MAGIC = b'IPLSNAP\0'
+FORMAT_VERSION = 1
+PREAMBLE = struct.Struct('<8sIQQ')
+
+SNAPSHOT_MODELS = [Team, Player, Match, Delivery]
+# Bookkeeping columns with no analytic use
+SKIPPED_FIELDS = {'created_at', 'source_hash', 'deliveries_hash'}
+
+# (array typecode, dtype) per column kind
+COLUMN_TYPES = {
+    'int': ('i', '<i4'),
+    'bool': ('b', '|i1'),
+    'date': ('i', '<i4'),
+    'str': ('i', '<i4'),
+}
+
+
+def _column_kind(field):
+    if isinstance(field, models.ForeignKey):
+        return 'int'
+    if isinstance(field, models.BooleanField):
+        return 'bool'
+    if isinstance(field, models.DateTimeField):
+        return None
+    if isinstance(field, models.DateField):
+        return 'date'
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return 'int'
+    if isinstance(field, models.CharField):
+        return 'str'
+    return None
+
+
+def snapshot_fields(model):
+    """The (column name, attname, kind) triples exported for ``model``."""
+    fields = []
+    for field in model._meta.concrete_fields:
+        kind = _column_kind(field)
+        if kind is not None and field.name not in SKIPPED_FIELDS:
+            fields.append((field.name, field.attname, kind))
+    return fields
+
+
+class SnapshotWriter:
+    def __init__(self, handle):
+        self.handle = handle
+        self.handle.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, 0, 0))
+
+    def write(self, data):
+        """Append ``data`` 8-byte aligned and return its (offset, length)."""
+        padding = -self.handle.tell() % 8
+        self.handle.write(b'\0' * padding)
+        offset = self.handle.tell()
+        self.handle.write(data)
+        return offset, len(data)
+
+    def write_array(self, values):
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return self.write(values.tobytes())
+
+    def finish(self, header):
+        offset, length = self.write(json.dumps(header, sort_keys=True).encode('utf-8'))
+        self.handle.seek(0)
+        self.handle.write(PREAMBLE.pack(MAGIC, FORMAT_VERSION, offset, length))
+
+
+def _encode_column(kind, values):
+    """Return (codes, string table) for one column; the table is None for non-text columns."""
+    typecode = COLUMN_TYPES[kind][0]
+    if kind == 'str':
+        strings = sorted({value or '' for value in values})
+        codes = {value: code for code, value in enumerate(strings)}
+        return array.array(typecode, (codes[value or ''] for value in values)), strings
+    if kind == 'date':
+        return array.array(typecode, (value.toordinal() if value else 0 for value in values)), None
+    return array.array(typecode, (-1 if value is None else int(value) for value in values)), None
+
+
+def write_snapshot(path, dataset_version):
+    """Export every snapshot model to ``path`` and return the header that was written."""
+    header = {
+        'format': FORMAT_VERSION,
+        'dataset_version': dataset_version,
+        'created_at': time.time(),
+        'tables': {},
+    }
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as handle:
+        writer = SnapshotWriter(handle)
+        for model in SNAPSHOT_MODELS:
+            fields = snapshot_fields(model)
+            rows = list(model.objects.order_by('pk').values_list(*[attname for _, attname, _ in fields]))
+            columns = zip(*rows) if rows else [()] * len(fields)
+            table = {'rows': len(rows), 'columns': {}}
+
+            for (name, _, kind), values in zip(fields, columns):
+                codes, strings = _encode_column(kind, values)
+                offset, length = writer.write_array(codes)
+                column = {'kind': kind, 'dtype': COLUMN_TYPES[kind][1], 'offset': offset, 'length': length}
+                if strings is not None:
+                    encoded = [value.encode('utf-8') for value in strings]
+                    ends = array.array('I')
+                    position = 0
+                    for value in encoded:
+                        position += len(value)
+                        ends.append(position)
+                    column['strings'] = {
+                        'count': len(encoded),
+                        'ends': writer.write_array(ends)[0],
+                        'data': writer.write(b''.join(encoded)),
+                    }
+                table['columns'][name] = column
+            header['tables'][model._meta.model_name] = table
+        writer.finish(header)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return header
+
+
+class Snapshot:
+    """A read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as handle:
+            self.buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, offset, length = PREAMBLE.unpack_from(self.buffer)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self.buffer.close()
+            raise ValueError(f'{path} is not an IPL snapshot in format {FORMAT_VERSION}')
+        self.header = json.loads(self.buffer[offset:offset + length])
+        self.dataset_version = self.header['dataset_version']
+
+    def rows(self, table):
+        return self.header['tables'][table]['rows']
+
+    def column(self, table, name):
+        """The stored codes of one column: a read-only NumPy array, or a memoryview without numpy."""
+        meta = self.header['tables'][table]['columns'][name]
+        if np is not None:
+            return np.frombuffer(self.buffer, dtype=meta['dtype'], count=self.rows(table), offset=meta['offset'])
+        view = memoryview(self.buffer)[meta['offset']:meta['offset'] + meta['length']]
+        return view.cast(COLUMN_TYPES[meta['kind']][0])
+
+    def strings(self, table, name):
+        """The string table of a text column; a column value is an index into it."""
+        meta = self.header['tables'][table]['columns'][name]['strings']
+        ends = struct.unpack_from(f'<{meta["count"]}I', self.buffer, meta['ends'])
+        data_offset, data_length = meta['data']
+        data = self.buffer[data_offset:data_offset + data_length]
+        starts = (0,) + ends[:-1]
+        return [data[start:end].decode('utf-8') for start, end in zip(starts, ends)]
+
+    def close(self):
+        self.buffer.close()
@@ -0,0 +1,131 @@
+import csv
+import os
+import random
+
+MATCH_COLUMNS = [
+    'id', 'season', 'city', 'date', 'team1', 'team2', 'toss_winner', 'toss_decision',
+    'result', 'dl_applied', 'winner', 'win_by_runs', 'win_by_wickets', 'player_of_match',
+    'venue', 'umpire1', 'umpire2', 'umpire3',
+]
+
+DELIVERY_COLUMNS = [
+    'match_id', 'inning', 'batting_team', 'bowling_team', 'over', 'ball', 'batsman',
+    'non_striker', 'bowler', 'is_super_over', 'wide_runs', 'bye_runs', 'legbye_runs',
+    'noball_runs', 'penalty_runs', 'batsman_runs', 'extra_runs', 'total_runs',
+    'player_dismissed', 'dismissal_kind', 'fielder',
+]
+
+TEAMS = [
+    ('Mumbai Indians', 'Mumbai', 'Wankhede Stadium'),
+    ('Chennai Super Kings', 'Chennai', 'MA Chidambaram Stadium, Chepauk'),
+    ('Royal Challengers Bangalore', 'Bangalore', 'M Chinnaswamy Stadium'),
+    ('Kolkata Knight Riders', 'Kolkata', 'Eden Gardens'),
+    ('Delhi Daredevils', 'Delhi', 'Feroz Shah Kotla'),
+    ('Kings XI Punjab', 'Chandigarh', 'Punjab Cricket Association Stadium, Mohali'),
+    ('Rajasthan Royals', 'Jaipur', 'Sawai Mansingh Stadium'),
+    ('Sunrisers Hyderabad', 'Hyderabad', 'Rajiv Gandhi International Stadium, Uppal'),
+]
+
+DISMISSAL_KINDS = ['caught', 'bowled', 'lbw', 'run out', 'stumped', 'caught and bowled']
+MATCHES_PER_SEASON = 60
+PLAYERS_PER_TEAM = 15
+
+# Size of the real 2008-2017 Kaggle deliveries.csv that the benchmark scales multiply
+REAL_DELIVERIES = 150460
+SCALES = {'1x': 1, '10x': 10, '100x': 100}
+
+
+def generate_dataset(directory, deliveries=1000000, seed=42, matches_per_season=MATCHES_PER_SEASON):
+    """Write a deterministic matches.csv/deliveries.csv pair in the loader's format.
+
+    Matches are generated until at least ``deliveries`` balls have been written.
+    Returns the two file paths and the number of matches and deliveries.
+    """
+    rng = random.Random(seed)
+    rosters = {
+        team: [f'{team.split()[0]} Player {i + 1}' for i in range(PLAYERS_PER_TEAM)]
+        for team, _, _ in TEAMS
+    }
+    matches_path = os.path.join(directory, 'matches.csv')
+    deliveries_path = os.path.join(directory, 'deliveries.csv')
+
+    match_count = 0
+    delivery_count = 0
+    with open(matches_path, 'w', newline='', encoding='utf-8') as matches_file, \
+            open(deliveries_path, 'w', newline='', encoding='utf-8') as deliveries_file:
+        matches_writer = csv.writer(matches_file)
+        deliveries_writer = csv.writer(deliveries_file)
+        matches_writer.writerow(MATCH_COLUMNS)
+        deliveries_writer.writerow(DELIVERY_COLUMNS)
+
+        while delivery_count < deliveries:
+            match_count += 1
+            season = 2008 + (match_count - 1) // matches_per_season
+            (team1, city, venue), (team2, _, _) = rng.sample(TEAMS, 2)
+            toss_winner = rng.choice((team1, team2))
+            batting_first = toss_winner if rng.random() < 0.5 else (team2 if toss_winner == team1 else team1)
+            chasing = team2 if batting_first == team1 else team1
+
+            scores = []
+            for inning, (batting, bowling) in enumerate(((batting_first, chasing), (chasing, batting_first)), 1):
+                rows, score = _generate_innings(rng, match_count, inning, batting, bowling, rosters)
+                deliveries_writer.writerows(rows)
+                delivery_count += len(rows)
+                scores.append(score)
+
+            winner = batting_first if scores[0] > scores[1] else chasing
+            day = 1 + (match_count - 1) % MATCHES_PER_SEASON
+            matches_writer.writerow([
+                match_count, season, city, f'{season}-{4 + day // 31:02d}-{1 + day % 30:02d}',
+                team1, team2, toss_winner, rng.choice(('bat', 'field')), 'normal', 0,
+                winner, max(scores[0] - scores[1], 0), rng.randint(1, 9) if winner == chasing else 0,
+                rng.choice(rosters[winner]), venue, 'Umpire A', 'Umpire B', '',
+            ])
+
+    return matches_path, deliveries_path, match_count, delivery_count
+
+
+def generate_scaled_dataset(directory, scale, seed=42):
+    """``generate_dataset`` at a ``SCALES`` multiple of the real size, over the same ten or so seasons."""
+    factor = SCALES[scale]
+    return generate_dataset(directory, deliveries=REAL_DELIVERIES * factor, seed=seed,
+                            matches_per_season=MATCHES_PER_SEASON * factor)
+
+
+def _generate_innings(rng, match_id, inning, batting, bowling, rosters):
+    batters = rosters[batting]
+    bowlers = rosters[bowling][-6:]
+    striker, non_striker, next_batter = 0, 1, 2
+    rows = []
+    score = 0
+    for over in range(1, 21):
+        bowler = bowlers[over % len(bowlers)]
+        ball = 0
+        legal = 0
+        while legal < 6:
+            ball += 1
+            wide = 1 if rng.random() < 0.03 else 0
+            noball = 1 if not wide and rng.random() < 0.01 else 0
+            legbye = 1 if not wide and not noball and rng.random() < 0.02 else 0
+            batsman_runs = 0 if wide or legbye else rng.choice((0, 0, 0, 1, 1, 1, 2, 4, 4, 6))
+            extras = wide + noball + legbye
+            dismissed = kind = fielder = ''
+            if not wide and not noball and rng.random() < 0.04 and next_batter < len(batters):
+                dismissed = batters[striker]
+                kind = rng.choice(DISMISSAL_KINDS)
+                if kind in ('caught', 'run out', 'stumped'):
+                    fielder = rng.choice(rosters[bowling])
+            rows.append([
+                match_id, inning, batting, bowling, over, ball, batters[striker],
+                batters[non_striker], bowler, 0, wide, 0, legbye, noball, 0,
+                batsman_runs, extras, batsman_runs + extras, dismissed, kind, fielder,
+            ])
+            score += batsman_runs + extras
+            if not wide and not noball:
+                legal += 1
+            if dismissed:
+                striker, next_batter = next_batter, next_batter + 1
+            elif batsman_runs % 2 == 1:
+                striker, non_striker = non_striker, striker
+        striker, non_striker = non_striker, striker
+    return rows, score
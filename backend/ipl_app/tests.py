@@ -1,3 +1,1158 @@
-from django.test import TestCase
+import asyncio
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+from unittest import mock, skipUnless
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.db.models import F, Q, Sum
+from django.http import QueryDict
+from django.test import AsyncClient, AsyncRequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.decorators import api_view
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from . import bluegreen, views
+from .aggregation import SOURCES, AggregateSpec
+from .aggregates import refresh_head_to_head, refresh_season_stats, team_records
+from .async_views import as_async, coalescing_stats, reset_coalescing_stats
+from .benchmarks import compare_results, measure_endpoint
+from .bluegreen import InvalidBuild, list_builds, point_aliases_at, read_active
+from .cache import cache_stats, chart_cache, reset_cache_stats, warm_chart_cache
+from .columnar import ColumnarDataset, get_columnar_dataset, np
+from .database import AnalyticsRouter
+from .dataset import bump_dataset_version, forget_dataset_version, get_dataset_version
+from .engines import get_engine
+from .instrumentation import QueryBudgetExceeded, reset_route_stats
+from .renderers import FastJSONRenderer
+from .search import NameIndex
+from .snapshot import Snapshot
+from .ingest import iter_shard, read_header, shard_offsets
+from .serializers import EconomicalBowlerSerializer, BattingStatsSerializer, fast_data, fast_row
+from .models import (
+    Team, Player, Match, Delivery, SeasonTeamStats, SeasonBattingStats, HeadToHead, TeamVenueStats,
+)
+from .synthetic import generate_dataset
+
+
+def load_dataset(directory, **options):
+    matches_file = f'{directory}/matches.csv'
+    deliveries_file = f'{directory}/deliveries.csv'
+    call_command(
+        'load_ipl_data',
+        matches_file=matches_file,
+        deliveries_file=deliveries_file,
+        stdout=io.StringIO(),
+        **options
+    )
+
+
+class DatasetTestCase(TestCase):
+    """Loads a synthetic dataset of ``deliveries`` balls generated from ``seed`` once per class."""
+    deliveries = 3000
+    seed = 42
+    warm_cache = False
+
+    @classmethod
+    def setUpTestData(cls):
+        with tempfile.TemporaryDirectory() as directory:
+            generate_dataset(directory, deliveries=cls.deliveries, seed=cls.seed)
+            load_dataset(directory, warm_cache=cls.warm_cache)
+
+
+class LoadIplDataTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.directory = tempfile.TemporaryDirectory()
+        _, _, cls.match_count, cls.delivery_count = generate_dataset(
+            cls.directory.name, deliveries=3000, seed=7
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+        super().tearDownClass()
+
+    def test_bulk_load(self):
+        load_dataset(self.directory.name, batch_size=500)
+
+        self.assertEqual(Match.objects.count(), self.match_count)
+        self.assertEqual(Delivery.objects.count(), self.delivery_count)
+        self.assertEqual(Player.objects.values('name').distinct().count(), Player.objects.count())
+        self.assertFalse(Delivery.objects.exclude(season=F('match__season')).exists())
+        self.assertFalse(Delivery.objects.exclude(date=F('match__date')).exists())
+
+    def test_reuses_existing_teams_and_players(self):
+        team = Team.objects.create(name='Mumbai Indians', short_name='MI')
+        player = Player.objects.create(name='Mumbai Player 1')
+
+        load_dataset(self.directory.name)
+
+        self.assertEqual(Team.objects.get(name='Mumbai Indians'), team)
+        self.assertEqual(Player.objects.filter(name='Mumbai Player 1').get(), player)
+        self.assertTrue(Delivery.objects.filter(batsman=player).exists()
+                        or Delivery.objects.filter(bowler=player).exists())
+
+    def test_sharded_parallel_load_matches_single_process(self):
+        load_dataset(self.directory.name, workers=2, shard_size=16 * 1024)
+        parallel = list(Delivery.objects.order_by('match__match_id', 'inning', 'over', 'ball', 'sequence')
+                        .values_list('match__match_id', 'inning', 'over', 'ball', 'total_runs', 'bowler__name'))
+        Delivery.objects.all().delete()
+        Match.objects.update(deliveries_hash='')
+
+        load_dataset(self.directory.name)
+        single = list(Delivery.objects.order_by('match__match_id', 'inning', 'over', 'ball', 'sequence')
+                      .values_list('match__match_id', 'inning', 'over', 'ball', 'total_runs', 'bowler__name'))
+
+        self.assertEqual(len(parallel), self.delivery_count)
+        self.assertEqual(parallel, single)
+
+    def test_deliveries_not_grouped_by_match_still_load(self):
+        load_dataset(self.directory.name)
+        expected = sorted(Delivery.objects.values_list('match__match_id', 'inning', 'over', 'ball', 'sequence',
+                                                       'total_runs', 'bowler__name'))
+        Delivery.objects.all().delete()
+        Match.objects.update(deliveries_hash='')
+
+        with tempfile.TemporaryDirectory() as directory:
+            with open(f'{self.directory.name}/deliveries.csv', newline='', encoding='utf-8') as file:
+                header, *rows = csv.reader(file)
+            # Interleave the matches, keeping each match's own rows in order
+            seen = {}
+            positions = []
+            for row in rows:
+                seen[row[0]] = seen.get(row[0], -1) + 1
+                positions.append(seen[row[0]])
+            rows = [row for _, row in sorted(zip(positions, rows), key=lambda item: item[0])]
+            with open(f'{directory}/deliveries.csv', 'w', newline='', encoding='utf-8') as file:
+                csv.writer(file).writerows([header] + rows)
+            shutil.copy(f'{self.directory.name}/matches.csv', directory)
+
+            load_dataset(directory, workers=2, shard_size=16 * 1024)
+
+        self.assertEqual(sorted(Delivery.objects.values_list('match__match_id', 'inning', 'over', 'ball', 'sequence',
+                                                             'total_runs', 'bowler__name')), expected)
+
+    def test_shards_align_to_match_boundaries(self):
+        path = f'{self.directory.name}/deliveries.csv'
+        shards = shard_offsets(path, 8 * 1024)
+        header = read_header(path)
+
+        self.assertGreater(len(shards), 1)
+        seen = set()
+        for start, end in shards:
+            match_ids = {row['match_id'] for row in iter_shard(path, start, end, header)}
+            self.assertFalse(match_ids & seen)
+            seen |= match_ids
+
+    def test_reload_is_idempotent(self):
+        load_dataset(self.directory.name)
+        load_dataset(self.directory.name)
+
+        self.assertEqual(Match.objects.count(), self.match_count)
+        self.assertEqual(Delivery.objects.count(), self.delivery_count)
+
+
+class IncrementalLoadTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        _, self.deliveries_file, _, self.delivery_count = generate_dataset(
+            self.directory.name, deliveries=1000, seed=11
+        )
+        load_dataset(self.directory.name)
+
+    def rewrite_deliveries(self, transform):
+        with open(self.deliveries_file, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        rows = [rows[0]] + transform(rows[1:])
+        with open(self.deliveries_file, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+
+    def test_unchanged_files_load_nothing(self):
+        forget_dataset_version()
+        version = get_dataset_version()
+        stdout = io.StringIO()
+        call_command(
+            'load_ipl_data',
+            matches_file=f'{self.directory.name}/matches.csv',
+            deliveries_file=self.deliveries_file,
+            incremental=True,
+            stdout=stdout,
+        )
+
+        self.assertIn('Loaded 0 new or changed matches', stdout.getvalue())
+        self.assertIn('Loaded 0 deliveries for 0 new or changed matches', stdout.getvalue())
+        # Cached charts and ETags stay valid
+        self.assertNotIn('Warmed', stdout.getvalue())
+        forget_dataset_version()
+        self.assertEqual(get_dataset_version(), version)
+
+    def test_changed_match_is_upserted_and_pruned(self):
+        def transform(rows):
+            # Drop the last ball of match 1 and add a run to the first ball of match 2
+            last_of_first = max(i for i, row in enumerate(rows) if row[0] == '1')
+            first_of_second = next(i for i, row in enumerate(rows) if row[0] == '2')
+            rows[first_of_second][15] = str(int(rows[first_of_second][15]) + 1)
+            rows[first_of_second][17] = str(int(rows[first_of_second][17]) + 1)
+            del rows[last_of_first]
+            return rows
+
+        total_before = Delivery.objects.filter(match__match_id=2).aggregate(Sum('total_runs'))
+        self.rewrite_deliveries(transform)
+        load_dataset(self.directory.name, incremental=True)
+
+        self.assertEqual(Delivery.objects.count(), self.delivery_count - 1)
+        total_after = Delivery.objects.filter(match__match_id=2).aggregate(Sum('total_runs'))
+        self.assertEqual(total_after['total_runs__sum'], total_before['total_runs__sum'] + 1)
+
+    def test_season_change_moves_deliveries_and_summaries(self):
+        matches_file = f'{self.directory.name}/matches.csv'
+        with open(matches_file, newline='', encoding='utf-8') as file:
+            rows = list(csv.reader(file))
+        old_season = rows[1][1]
+        rows[1][1] = '1999'
+        with open(matches_file, 'w', newline='', encoding='utf-8') as file:
+            csv.writer(file).writerows(rows)
+
+        load_dataset(self.directory.name, incremental=True)
+
+        match = Match.objects.get(match_id=int(rows[1][0]))
+        self.assertEqual(match.season, '1999')
+        self.assertEqual(set(match.deliveries.values_list('season', flat=True)), {'1999'})
+        self.assertEqual(set(match.deliveries.values_list('date', flat=True)), {match.date})
+        played = SeasonTeamStats.objects.filter(season='1999').values_list('matches_played', flat=True)
+        self.assertEqual(list(played), [1, 1])
+        self.assertEqual(
+            sum(SeasonTeamStats.objects.filter(season=old_season).values_list('matches_played', flat=True)),
+            2 * Match.objects.filter(season=old_season).count(),
+        )
+
+    def test_repeated_ball_numbers_get_sequences(self):
+        def transform(rows):
+            rows.insert(1, list(rows[0]))
+            return rows
+
+        self.rewrite_deliveries(transform)
+        load_dataset(self.directory.name, incremental=True)
+
+        first = Delivery.objects.order_by('id').first()
+        self.assertEqual(
+            list(Delivery.objects.filter(
+                match=first.match, inning=first.inning, over=first.over, ball=first.ball
+            ).values_list('sequence', flat=True).order_by('sequence')),
+            [0, 1],
+        )
+
+
+class SeasonSummaryTests(DatasetTestCase):
+    deliveries = 6000
+    seed = 3
+    warm_cache = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.order_by('season').values_list('season', flat=True).first()
+
+    def test_extra_runs_match_deliveries(self):
+        expected = {
+            item['bowling_team__name']: item['extra_runs']
+            for item in Delivery.objects.filter(match__season=self.season)
+            .values('bowling_team__name').annotate(extra_runs=Sum('extra_runs'))
+        }
+
+        response = self.client.get(f'/api/extra-runs-per-team/{self.season}/')
+
+        self.assertEqual({item['team']: item['extra_runs'] for item in response.json()['data']}, expected)
+
+    def test_matches_played_vs_won_match_matches(self):
+        response = self.client.get(f'/api/matches-played-vs-won/{self.season}/')
+
+        for item in response.json()['data']:
+            team = Team.objects.get(name=item['team'])
+            season_matches = Match.objects.filter(season=self.season)
+            self.assertEqual(item['matches_played'], season_matches.filter(Q(team1=team) | Q(team2=team)).count())
+            self.assertEqual(item['matches_won'], season_matches.filter(winner=team).count())
+
+    def test_economical_bowlers_match_deliveries(self):
+        response = self.client.get(f'/api/economical-bowlers/{self.season}/')
+
+        data = response.json()['data']
+        self.assertTrue(data)
+        for item in data:
+            deliveries = Delivery.objects.filter(match__season=self.season, bowler__name=item['bowler'])
+            totals = deliveries.aggregate(Sum('total_runs'), Sum('bye_runs'), Sum('legbye_runs'))
+            self.assertEqual(item['runs_conceded'],
+                             totals['total_runs__sum'] - totals['bye_runs__sum'] - totals['legbye_runs__sum'])
+            wickets = deliveries.filter(player_dismissed__isnull=False).exclude(dismissal_kind='run out')
+            self.assertEqual(item['wickets_taken'], wickets.count())
+
+    def test_economical_bowlers_rank_legal_balls_in_sql(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get('/api/economical-bowlers/all/?limit=5&min_balls=0').json()['data']
+
+        self.assertEqual(len(data), 5)
+        self.assertIn('LIMIT 5', queries.captured_queries[-1]['sql'])
+        rates = [float(item['economy_rate']) for item in data]
+        self.assertEqual(rates, sorted(rates))
+        bowler = Player.objects.get(name=data[0]['bowler'])
+        legal = Delivery.objects.filter(bowler=bowler, wide_runs=0, noball_runs=0).count()
+        self.assertEqual(float(data[0]['overs_bowled']), round(legal / 6, 1))
+
+    def test_economical_bowlers_season_range_and_params(self):
+        seasons = sorted(set(Match.objects.values_list('season', flat=True)))
+        data = self.client.get(f'/api/economical-bowlers/{seasons[0]}-{seasons[-1]}/?limit=100&min_balls=0').json()['data']
+        self.assertEqual(data, self.client.get('/api/economical-bowlers/all/?limit=100&min_balls=0').json()['data'])
+        self.assertEqual(self.client.get('/api/economical-bowlers/all/?limit=x').status_code, 400)
+        self.assertEqual(self.client.get('/api/economical-bowlers/all/?limit=1000').status_code, 400)
+
+    def test_team_charts_reject_season_ranges(self):
+        for url in ('/api/extra-runs-per-team/all/', '/api/matches-played-vs-won/2008-2010/',
+                    '/api/season/all/dashboard/'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+        dashboard = self.client.get('/api/season/all/dashboard/', {'charts': 'economical_bowlers,available_years'})
+        self.assertEqual(dashboard.status_code, 200)
+        self.assertTrue(dashboard.json()['data']['economical_bowlers'])
+
+    def test_refresh_replaces_only_requested_seasons(self):
+        other = SeasonTeamStats.objects.exclude(season=self.season).count()
+        Match.objects.filter(season=self.season).update(winner=None)
+
+        refresh_season_stats([self.season])
+
+        self.assertFalse(SeasonTeamStats.objects.filter(season=self.season, matches_won__gt=0).exists())
+        self.assertEqual(SeasonTeamStats.objects.exclude(season=self.season).count(), other)
+
+    def test_team_records_single_query(self):
+        with self.assertNumQueries(1):
+            records = team_records()
+
+        for season, team_id, played, won in records:
+            season_matches = Match.objects.filter(season=season)
+            self.assertEqual(played, season_matches.filter(Q(team1=team_id) | Q(team2=team_id)).count())
+            self.assertEqual(won, season_matches.filter(winner=team_id).count())
+
+
+@override_settings(IPL_CHART_CACHE_ALIAS=None)
+class ChartQueryCountTests(DatasetTestCase):
+    deliveries = 20000
+    seed = 5
+    warm_cache = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.order_by('season').values_list('season', flat=True).first()
+
+    def setUp(self):
+        # Read the dataset version up front so only the chart queries are counted
+        get_dataset_version()
+
+    def test_matches_played_vs_won_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/matches-played-vs-won/{self.season}/')
+        self.assertEqual(len(response.json()['data']), 8)
+
+    def test_matches_played_vs_won_all_seasons_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/matches-played-vs-won/')
+
+        payload = response.json()
+        self.assertEqual(len(payload['data']), SeasonTeamStats.objects.count())
+        self.assertEqual(payload['years'], sorted(set(Match.objects.values_list('season', flat=True))))
+
+    def test_season_charts_are_one_query_each(self):
+        for url in ('/api/team-wins-stacked/', f'/api/extra-runs-per-team/{self.season}/',
+                    f'/api/economical-bowlers/{self.season}/'):
+            with self.subTest(url=url), self.assertNumQueries(1):
+                self.client.get(url)
+
+    def test_season_dashboard_shares_queries(self):
+        with self.assertNumQueries(3):
+            dashboard = self.client.get(f'/api/season/{self.season}/dashboard/').json()['data']
+
+        self.assertEqual(dashboard['extra_runs'], self.client.get(f'/api/extra-runs-per-team/{self.season}/').json()['data'])
+        self.assertEqual(dashboard['economical_bowlers'], self.client.get(f'/api/economical-bowlers/{self.season}/').json()['data'])
+        self.assertEqual(dashboard['matches_played_vs_won'], self.client.get(f'/api/matches-played-vs-won/{self.season}/').json()['data'])
+        self.assertEqual(dashboard['available_years'], self.client.get('/api/available-years/').json()['data'])
+
+    def test_season_dashboard_chart_selector(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/season/{self.season}/dashboard/?charts=extra_runs,matches_played_vs_won')
+
+        self.assertEqual(set(response.json()['data']), {'extra_runs', 'matches_played_vs_won'})
+        self.assertEqual(self.client.get(f'/api/season/{self.season}/dashboard/?charts=nope').status_code, 400)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+@override_settings(IPL_CHART_CACHE_ALIAS=None)
+class QueryPlanTests(DatasetTestCase):
+    seed = 9
+    warm_cache = True
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.values_list('season', flat=True).first()
+
+    def assertUsesIndexes(self, queries):
+        self.assertTrue(queries)
+        for query in queries:
+            with connection.cursor() as cursor:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = [row[-1] for row in cursor.fetchall()]
+            full_scans = [step for step in plan if re.fullmatch(r'SCAN ipl_app_\w+', step)]
+            self.assertEqual(full_scans, [], f'{query["sql"]}\n{plan}')
+
+    def test_chart_endpoints_use_indexes(self):
+        urls = [
+            '/api/matches-per-year/',
+            '/api/team-wins-stacked/',
+            f'/api/extra-runs-per-team/{self.season}/',
+            f'/api/economical-bowlers/{self.season}/',
+            f'/api/matches-played-vs-won/{self.season}/',
+            '/api/matches-played-vs-won/',
+            '/api/available-years/',
+        ]
+        for url in urls:
+            with self.subTest(url=url), CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+                self.assertUsesIndexes(queries.captured_queries)
+
+    def test_season_refresh_uses_indexes(self):
+        with CaptureQueriesContext(connection) as queries:
+            refresh_season_stats([self.season])
+
+        self.assertUsesIndexes([query for query in queries.captured_queries if query['sql'].startswith('SELECT')])
+
+
+class ChartCacheTests(DatasetTestCase):
+    seed = 13
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.values_list('season', flat=True).first()
+
+    def setUp(self):
+        chart_cache().clear()
+        forget_dataset_version()
+        reset_cache_stats()
+
+    def test_repeat_request_is_served_from_cache(self):
+        url = f'/api/extra-runs-per-team/{self.season}/'
+        first = self.client.get(url).json()
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url).json()
+
+        self.assertEqual(first, second)
+        self.assertEqual(cache_stats()['hits'], 1)
+        self.assertEqual(cache_stats()['misses'], 1)
+
+    def test_version_bump_invalidates(self):
+        url = f'/api/matches-played-vs-won/{self.season}/'
+        self.client.get(url)
+        SeasonTeamStats.objects.filter(season=self.season).update(matches_won=0)
+        bump_dataset_version()
+
+        data = self.client.get(url).json()['data']
+
+        self.assertEqual({item['matches_won'] for item in data}, {0})
+        self.assertEqual(cache_stats()['misses'], 2)
+
+    def test_warm_up_covers_every_season(self):
+        seasons = Match.objects.values_list('season', flat=True).distinct().count()
+
+        warmed = warm_chart_cache()
+        reset_cache_stats()
+        self.client.get(f'/api/economical-bowlers/{self.season}/')
+        self.client.get('/api/team-wins-stacked/')
+
+        self.assertEqual(warmed, 5 + 4 * seasons)
+        self.assertEqual(cache_stats()['misses'], 0)
+
+
+@override_settings(IPL_CHART_CACHE_ALIAS=None)
+class ConditionalRequestTests(DatasetTestCase):
+    seed = 17
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.values_list('season', flat=True).first()
+
+    def setUp(self):
+        forget_dataset_version()
+
+    def test_matching_etag_is_answered_without_queries(self):
+        url = f'/api/economical-bowlers/{self.season}/'
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=60', response['Cache-Control'])
+
+        with self.assertNumQueries(0):
+            repeat = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(repeat['ETag'], response['ETag'])
+
+    def test_etag_depends_on_query_and_version(self):
+        first = self.client.get('/api/matches/?season=2008&x=1')['ETag']
+        self.assertEqual(self.client.get('/api/matches/?x=1&season=2008')['ETag'], first)
+        self.assertNotEqual(self.client.get('/api/matches/?season=2008&x=2')['ETag'], first)
+
+        bump_dataset_version()
+
+        response = self.client.get('/api/matches/?season=2008&x=1', HTTP_IF_NONE_MATCH=first)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first)
+
+    def test_etag_depends_on_media_type(self):
+        url = f'/api/economical-bowlers/{self.season}/'
+        compact = self.client.get(url, HTTP_ACCEPT='application/json')
+        indented = self.client.get(url, HTTP_ACCEPT='application/json; indent=2')
+
+        self.assertIn('Accept', compact['Vary'])
+        self.assertNotEqual(indented.content, compact.content)
+        self.assertNotEqual(indented['ETag'], compact['ETag'])
+        repeat = self.client.get(url, HTTP_ACCEPT='application/json; indent=2', HTTP_IF_NONE_MATCH=compact['ETag'])
+        self.assertEqual(repeat.status_code, 200)
+        self.assertEqual(repeat.content, indented.content)
+
+    def test_create_changes_etag(self):
+        etag = self.client.get('/api/teams/')['ETag']
+        self.client.post('/api/teams/', {'name': 'New Team', 'short_name': 'NT'}, content_type='application/json')
+
+        self.assertEqual(self.client.get('/api/teams/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_process_local_stats_are_not_tagged(self):
+        self.assertFalse(self.client.get('/api/cache-stats/').has_header('ETag'))
+
+
+@override_settings(IPL_CHART_CACHE_ALIAS=None)
+class ListEndpointTests(DatasetTestCase):
+    seed = 19
+
+    def test_cursor_pages_cover_every_match_in_key_order(self):
+        match_ids = []
+        url = '/api/matches/?page_size=7'
+        while url:
+            payload = self.client.get(url).json()
+            match_ids += [item['match_id'] for item in payload['results']]
+            url = payload['next']
+
+        self.assertEqual(match_ids, list(Match.objects.order_by('match_id').values_list('match_id', flat=True)))
+
+    def test_fields_narrow_serializer_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            payload = self.client.get('/api/matches/?fields=match_id,winner_name').json()
+
+        self.assertEqual(set(payload['results'][0]), {'match_id', 'winner_name'})
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"ipl_app_team"."name"', sql)
+        self.assertNotIn('"venue"', sql)
+        self.assertEqual(self.client.get('/api/matches/?fields=nope').status_code, 400)
+
+    def test_filters(self):
+        team = Team.objects.first()
+        season = Match.objects.values_list('season', flat=True).first()
+        payload = self.client.get(f'/api/matches/?season={season}&team={team.pk}&page_size=1000').json()
+
+        expected = Match.objects.filter(Q(team1=team) | Q(team2=team), season=season).count()
+        self.assertEqual(len(payload['results']), expected)
+        deliveries = self.client.get(f'/api/deliveries/?season={season}&fields=total_runs&page_size=5').json()
+        self.assertEqual(deliveries['results'][0], {'total_runs': deliveries['results'][0]['total_runs']})
+
+
+@skipUnless(np is not None, 'the columnar engine requires numpy')
+@override_settings(IPL_CHART_CACHE_ALIAS=None)
+class ColumnarEngineTests(DatasetTestCase):
+    deliveries = 5000
+    seed = 23
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.values_list('season', flat=True).first()
+
+    def test_engines_return_identical_rows(self):
+        orm, columnar = get_engine('orm'), ColumnarDataset.from_database()
+
+        self.assertEqual(columnar.seasons(), orm.seasons())
+        self.assertEqual(columnar.matches_per_season(), orm.matches_per_season())
+        self.assertEqual(columnar.team_wins(), orm.team_wins())
+        self.assertEqual(columnar.season_team_rows(), orm.season_team_rows())
+        self.assertEqual(columnar.economical_bowlers([self.season]), orm.economical_bowlers([self.season]))
+        self.assertEqual(columnar.economical_bowlers(None, 0, 1000), orm.economical_bowlers(None, 0, 1000))
+        self.assertEqual(columnar.season_team_rows('1900'), [])
+
+    def test_chart_endpoints_agree(self):
+        for url in ('/api/team-wins-stacked/', '/api/matches-played-vs-won/',
+                    f'/api/season/{self.season}/dashboard/'):
+            expected = self.client.get(url).json()
+            with self.subTest(url=url), override_settings(IPL_ANALYTICS_ENGINE='columnar'):
+                self.assertEqual(self.client.get(url).json(), expected)
+
+    def test_dataset_is_rebuilt_after_version_bump(self):
+        forget_dataset_version()
+        dataset = get_columnar_dataset()
+        self.assertIs(get_columnar_dataset(), dataset)
+
+        bump_dataset_version()
+
+        self.assertIsNot(get_columnar_dataset(), dataset)
+
+
+class SnapshotTests(DatasetTestCase):
+    seed = 29
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = f'{directory.name}/ipl.snapshot'
+        forget_dataset_version()
+        call_command('export_snapshot', output=self.path, stdout=io.StringIO())
+
+    def test_columns_round_trip(self):
+        snapshot = Snapshot(self.path)
+        self.addCleanup(snapshot.close)
+
+        self.assertEqual(snapshot.dataset_version, get_dataset_version())
+        self.assertEqual(snapshot.rows('delivery'), Delivery.objects.count())
+        runs = snapshot.column('delivery', 'total_runs')
+        self.assertEqual(sum(int(value) for value in runs), Delivery.objects.aggregate(runs=Sum('total_runs'))['runs'])
+        venues = snapshot.strings('match', 'venue')
+        codes = snapshot.column('match', 'venue')
+        self.assertEqual([venues[code] for code in codes],
+                         list(Match.objects.order_by('pk').values_list('venue', flat=True)))
+        del runs, codes
+
+    @skipUnless(np is not None, 'the columnar engine requires numpy')
+    def test_columnar_engine_maps_current_snapshot(self):
+        get_dataset_version()
+        with override_settings(IPL_SNAPSHOT_PATH=self.path):
+            with self.assertNumQueries(0):
+                dataset = get_columnar_dataset()
+            self.assertEqual(dataset.snapshot.path, self.path)
+            self.assertEqual(dataset.season_team_rows(), get_engine('orm').season_team_rows())
+
+            bump_dataset_version()
+            self.assertFalse(hasattr(get_columnar_dataset(), 'snapshot'))
+
+
+class AggregateEndpointTests(DatasetTestCase):
+    seed = 31
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.values_list('season', flat=True).first()
+
+    def setUp(self):
+        chart_cache().clear()
+        forget_dataset_version()
+        reset_cache_stats()
+
+    def test_summary_table_plan(self):
+        payload = self.client.get('/api/aggregate/?group_by=season&metrics=extras').json()
+
+        self.assertEqual(payload['source'], 'season_team_stats')
+        expected = dict(Delivery.objects.values_list('season').annotate(Sum('extra_runs')).order_by())
+        self.assertEqual({row['season']: row['extras'] for row in payload['data']}, expected)
+
+    def test_delivery_plan(self):
+        payload = self.client.get(f'/api/aggregate/?group_by=over&metrics=runs,strike_rate&season={self.season}').json()
+
+        self.assertEqual(payload['source'], 'delivery')
+        self.assertEqual([row['over'] for row in payload['data']], list(range(1, 21)))
+        runs = Delivery.objects.filter(season=self.season, over=1).aggregate(Sum('total_runs'))['total_runs__sum']
+        self.assertEqual(payload['data'][0]['runs'], runs)
+
+    def test_bowler_plan_with_filters_order_and_limit(self):
+        payload = self.client.get(
+            f'/api/aggregate/?group_by=bowler&metrics=economy,balls&season={self.season}&order=economy&limit=5'
+        ).json()
+
+        self.assertEqual(payload['source'], 'season_bowler_stats')
+        rows = payload['data']
+        self.assertEqual(len(rows), 5)
+        self.assertEqual([row['economy'] for row in rows], sorted(row['economy'] for row in rows))
+        legal = Delivery.objects.filter(season=self.season, bowler=rows[0]['bowler_id'], wide_runs=0, noball_runs=0)
+        self.assertEqual(rows[0]['balls'], legal.count())
+
+    def test_summary_and_delivery_plans_agree(self):
+        delivery = SOURCES[-1]
+        for source in SOURCES[:-1]:
+            for dimension in source.dimensions:
+                for metric in source.metrics:
+                    with self.subTest(source=source.name, group_by=dimension, metric=metric):
+                        spec = AggregateSpec.from_params(QueryDict(f'group_by={dimension}&metrics={metric}&limit=1000'))
+                        self.assertIs(spec.plan(), source)
+                        with mock.patch.object(AggregateSpec, 'plan', return_value=delivery):
+                            expected = spec.run()[1]
+                        self.assertEqual(spec.run()[1], expected)
+
+    def test_venue_filter_keeps_commas(self):
+        venue = 'MA Chidambaram Stadium, Chepauk'
+        other = Match.objects.exclude(venue=venue).values_list('venue', flat=True).first()
+        expected = Delivery.objects.filter(match__venue=venue).aggregate(Sum('total_runs'))['total_runs__sum']
+        self.assertIsNotNone(expected)
+
+        payload = self.client.get('/api/aggregate/', {'metrics': 'runs', 'venue': venue}).json()
+        self.assertEqual(payload['data'][0]['runs'], expected)
+
+        both = self.client.get('/api/aggregate/', {'metrics': 'runs', 'venue': [venue, other]}).json()
+        runs = Delivery.objects.filter(match__venue__in=[venue, other]).aggregate(Sum('total_runs'))['total_runs__sum']
+        self.assertEqual(both['data'][0]['runs'], runs)
+
+    def test_equivalent_specs_share_a_cache_entry(self):
+        self.client.get('/api/aggregate/?group_by=season,inning&metrics=runs,wickets')
+        with self.assertNumQueries(0):
+            self.client.get('/api/aggregate/?group_by=inning,season&metrics=wickets,runs')
+
+        self.assertEqual(cache_stats()['hits'], 1)
+
+    def test_rejects_invalid_or_expensive_specs(self):
+        for query in ('group_by=season', 'metrics=runs&group_by=umpire', 'metrics=runs&order=economy',
+                      'metrics=runs&limit=100000', 'metrics=runs&bowler=abc',
+                      'metrics=runs&group_by=batsman,bowler'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/aggregate/?{query}').status_code, 400)
+
+
+class ExportTests(DatasetTestCase):
+    seed = 37
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.values_list('season', flat=True).first()
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv_round_trips_through_the_loader(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ('matches', 'deliveries'):
+                with open(f'{directory}/{name}.csv', 'wb') as handle:
+                    handle.write(self.export(f'/api/export/{name}.csv'))
+            before = Delivery.objects.count()
+
+            load_dataset(directory, incremental=True, warm_cache=False)
+
+        self.assertEqual(Delivery.objects.count(), before)
+
+    def test_ndjson_with_filters(self):
+        team = Team.objects.first()
+        lines = self.export(f'/api/export/deliveries.ndjson?season={self.season}&team={team.pk}').splitlines()
+
+        expected = Delivery.objects.filter(Q(batting_team=team) | Q(bowling_team=team), season=self.season)
+        self.assertEqual(len(lines), expected.count())
+        self.assertIn(team.name, (json.loads(lines[0])['batting_team'], json.loads(lines[0])['bowling_team']))
+
+    def test_gzip(self):
+        plain = self.export(f'/api/export/matches.csv?season={self.season}')
+        compressed = self.export(f'/api/export/matches.csv?season={self.season}&gzip=1')
+
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertEqual(len(plain.splitlines()), 1 + Match.objects.filter(season=self.season).count())
+        self.assertEqual(self.client.get('/api/export/umpires.csv').status_code, 404)
+
+
+class HeadToHeadTests(DatasetTestCase):
+    deliveries = 6000
+    seed = 41
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.match = Match.objects.select_related('team1', 'team2').first()
+
+    def records(self):
+        return (sorted(HeadToHead.objects.values_list('team', 'opponent', 'matches', 'wins', 'losses', 'no_results')),
+                sorted(TeamVenueStats.objects.values_list('venue', 'team', 'matches', 'wins', 'losses', 'no_results')))
+
+    def test_pair_record_matches_matches(self):
+        team1, team2 = self.match.team1, self.match.team2
+        data = self.client.get('/api/head-to-head/', {'team': team1.name, 'opponent': team2.name}).json()['data']
+
+        between = Match.objects.filter(Q(team1=team1, team2=team2) | Q(team1=team2, team2=team1))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['matches'], between.count())
+        self.assertEqual(data[0]['wins'], between.filter(winner=team1).count())
+        self.assertEqual(data[0]['losses'], between.filter(winner=team2).count())
+
+    def test_venue_records(self):
+        data = self.client.get(f'/api/venues/{self.match.venue}/').json()['data']
+
+        self.assertEqual(sum(item['matches'] for item in data), 2 * Match.objects.filter(venue=self.match.venue).count())
+        self.assertEqual(self.client.get('/api/venues/Nowhere/').status_code, 404)
+
+    def test_incremental_refresh_matches_full_rebuild(self):
+        Match.objects.filter(pk=self.match.pk).update(winner=None, venue='New Ground')
+        refresh_head_to_head([self.match.team1_id, self.match.team2_id])
+        incremental = self.records()
+
+        refresh_head_to_head()
+
+        self.assertEqual(self.records(), incremental)
+        self.assertTrue(TeamVenueStats.objects.filter(venue='New Ground', no_results=1).exists())
+
+
+class PlayerStatsTests(DatasetTestCase):
+    deliveries = 6000
+    seed = 43
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.season = Match.objects.order_by('season').values_list('season', flat=True).first()
+        cls.batsman = Delivery.objects.values_list('batsman', flat=True).first()
+
+    def setUp(self):
+        chart_cache().clear()
+        get_dataset_version()
+
+    def test_batting_rollup_matches_deliveries(self):
+        deliveries = Delivery.objects.filter(batsman=self.batsman)
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(f'/api/players/{self.batsman}/stats/').json()['data']
+        self.assertFalse(any('ipl_app_delivery' in query['sql'] for query in queries))
+
+        career = data['batting']['career']
+        self.assertEqual(career['runs'], deliveries.aggregate(runs=Sum('batsman_runs'))['runs'])
+        self.assertEqual(career['balls'], deliveries.filter(wide_runs=0).count())
+        self.assertEqual(career['sixes'], deliveries.filter(batsman_runs=6).count())
+        self.assertEqual(career['dismissals'], Delivery.objects.filter(player_dismissed=self.batsman).count())
+        self.assertEqual(self.client.get('/api/players/999999/stats/').status_code, 404)
+
+    def test_leaderboards(self):
+        runs = self.client.get(f'/api/season/{self.season}/leaderboard/', {'stat': 'runs', 'limit': 5}).json()['data']
+        top = SeasonBattingStats.objects.filter(season=self.season).order_by('-runs').first()
+        self.assertEqual(runs[0]['runs'], top.runs)
+        self.assertEqual([item['rank'] for item in runs], [1, 2, 3, 4, 5])
+
+        economy = self.client.get('/api/season/all/leaderboard/', {'stat': 'economy'}).json()['data']
+        self.assertEqual([item['economy'] for item in economy], sorted(item['economy'] for item in economy))
+        self.assertTrue(all(item['balls'] >= 60 for item in economy))
+        self.assertEqual(self.client.get('/api/season/all/leaderboard/', {'stat': 'catches'}).status_code, 400)
+
+
+class NameSearchTests(TestCase):
+    def test_ranks_prefix_word_and_typo_matches(self):
+        index = NameIndex([
+            ('player', 1, 'MS Dhoni'), ('player', 2, 'V Kohli'), ('player', 3, 'AB de Villiers'),
+            ('player', 4, 'MS Gony'), ('team', 5, 'Chennai Super Kings'),
+        ])
+
+        self.assertEqual([(item['id'], item['match']) for item in index.search('ms')], [(4, 'prefix'), (1, 'prefix')])
+        self.assertEqual(index.search('dhon')[0], {'type': 'player', 'id': 1, 'name': 'MS Dhoni', 'match': 'word'})
+        self.assertEqual([item['id'] for item in index.search('kohil')], [2])
+        self.assertEqual([item['id'] for item in index.search('chenai super')], [5])
+        self.assertEqual(index.search('chennai', kind='player'), [])
+        self.assertEqual(index.search('   '), [])
+
+    def test_endpoint_follows_new_players(self):
+        self.client.post('/api/players/', {'name': 'Rashid Khan'}, content_type='application/json')
+
+        data = self.client.get('/api/search/', {'q': 'rashid k'}).json()['data']
+        self.assertEqual([item['name'] for item in data], ['Rashid Khan'])
+        self.assertEqual(self.client.get('/api/search/', {'q': 'x', 'type': 'umpire'}).status_code, 400)
+
+    def test_player_names_are_unique(self):
+        self.client.post('/api/players/', {'name': 'Rashid Khan'}, content_type='application/json')
+        response = self.client.post('/api/players/', {'name': 'Rashid Khan'}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Player.objects.filter(name='Rashid Khan').count(), 1)
+
+
+@override_settings(ROOT_URLCONF='ipl_project.asgi_urls')
+class AsyncViewTests(TransactionTestCase):
+    # Pool threads use their own connections, so the data must be committed
+    databases = {'default', 'analytics'}
+
+    def setUp(self):
+        with tempfile.TemporaryDirectory() as directory:
+            generate_dataset(directory, deliveries=4000, seed=47)
+            load_dataset(directory, warm_cache=False)
+        chart_cache().clear()
+        forget_dataset_version()
+        self.season = Match.objects.order_by('season').values_list('season', flat=True).first()
+
+    async def test_async_views_match_sync_views(self):
+        client = AsyncClient()
+        for url in (f'/api/season/{self.season}/dashboard/', '/api/matches-per-year/',
+                    '/api/aggregate/?group_by=season&metrics=runs'):
+            with self.subTest(url=url):
+                response = await client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.has_header('ETag'))
+                with override_settings(IPL_CHART_CACHE_ALIAS=None, ROOT_URLCONF='ipl_project.urls'):
+                    expected = await asyncio.to_thread(lambda: self.client.get(url).json())
+                self.assertEqual(response.json(), expected)
+
+        # Routes without an async version fall through to the sync views
+        self.assertEqual((await client.get('/api/teams/')).status_code, 200)
+
+    async def test_concurrent_identical_requests_share_one_computation(self):
+        calls = []
+
+        @api_view(['GET'])
+        def slow(request):
+            calls.append(request.query_params['season'])
+            time.sleep(0.05)
+            return Response({'season': request.query_params['season']})
+
+        view = as_async(slow)
+        factory = AsyncRequestFactory()
+        reset_coalescing_stats()
+        responses = await asyncio.gather(
+            *[view(factory.get('/api/slow/', {'season': '2016'})) for _ in range(10)],
+            view(factory.get('/api/slow/', {'season': '2017'})),
+        )
+
+        self.assertEqual(sorted(calls), ['2016', '2017'])
+        self.assertEqual([json.loads(response.content)['season'] for response in responses], ['2016'] * 10 + ['2017'])
+        self.assertEqual(coalescing_stats(), {'computed': 2, 'coalesced': 9})
+
+    async def test_exports_stream_chunk_by_chunk(self):
+        response = await AsyncClient().get('/api/export/deliveries.csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertGreater(len(chunks), 1)
+        with override_settings(ROOT_URLCONF='ipl_project.urls'):
+            expected = await asyncio.to_thread(lambda: b''.join(self.client.get('/api/export/deliveries.csv')))
+        self.assertEqual(b''.join(chunks), expected)
+
+
+class InstrumentationTests(DatasetTestCase):
+    seed = 53
+
+    def setUp(self):
+        chart_cache().clear()
+        reset_route_stats()
+        get_dataset_version()
+
+    def test_server_timing_and_route_stats(self):
+        response = self.client.get('/api/matches-per-year/')
+
+        timings = dict(re.findall(r'(\w+);dur=([\d.]+)', response['Server-Timing']))
+        self.assertTrue({'db', 'serialize', 'render', 'total'} <= set(timings))
+        self.assertIn('desc="queries=1"', response['Server-Timing'])
+
+        self.client.get('/api/matches-per-year/')
+        stats = self.client.get('/api/timing-stats/').json()['data']['api/matches-per-year/']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['max_queries'], 1)
+        self.assertEqual(stats['over_budget'], 0)
+
+    def test_query_budget(self):
+        with mock.patch.object(views.matches_per_year, 'query_budget', 0):
+            with override_settings(IPL_QUERY_BUDGET_ACTION='raise'), self.assertRaises(QueryBudgetExceeded):
+                self.client.get('/api/matches-per-year/')
+
+            chart_cache().clear()
+            with override_settings(IPL_QUERY_BUDGET_ACTION='log'), self.assertLogs('ipl_app.timing', 'WARNING'):
+                self.assertEqual(self.client.get('/api/matches-per-year/').status_code, 200)
+
+    def test_failures_are_logged(self):
+        with mock.patch.object(views, 'get_engine', side_effect=RuntimeError('engine down')), \
+                self.assertLogs('ipl_app.views', 'ERROR') as logs:
+            response = self.client.get('/api/matches-per-year/')
+
+        self.assertEqual(response.status_code, 500)
+        self.assertIn('engine down', logs.output[0])
+
+
+class FastSerializationTests(DatasetTestCase):
+    seed = 59
+
+    def setUp(self):
+        chart_cache().clear()
+        get_dataset_version()
+
+    def test_matches_drf_serializers(self):
+        rows = [
+            {'bowler': 'A', 'economy_rate': 6.125, 'overs_bowled': 4, 'runs_conceded': 24, 'wickets_taken': 2},
+            {'bowler': 'B', 'economy_rate': 7.3349, 'overs_bowled': 3.5, 'runs_conceded': 28, 'wickets_taken': 0},
+        ]
+        self.assertEqual(fast_data(EconomicalBowlerSerializer, rows),
+                         EconomicalBowlerSerializer(rows, many=True).data)
+        career = {'runs': 10, 'balls': 0, 'fours': 1, 'sixes': 0, 'dismissals': 1, 'strike_rate': None}
+        self.assertEqual(fast_row(BattingStatsSerializer, career), BattingStatsSerializer(career).data)
+
+        payload = {'data': rows, 'when': datetime.datetime(2017, 4, 5, 12, 30, 15, 123456)}
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_columnar_format(self):
+        rows = self.client.get('/api/team-wins-stacked/')
+        columns = self.client.get('/api/team-wins-stacked/', {'format': 'columns'})
+
+        self.assertEqual(columns['Content-Type'], 'application/json')
+        data = columns.json()['data']
+        self.assertEqual(data['columns'], ['team', 'year', 'wins'])
+        self.assertEqual([dict(zip(data['columns'], row)) for row in data['rows']], rows.json()['data'])
+        self.assertLess(len(columns.content), len(rows.content))
+        self.assertNotEqual(columns['ETag'], rows['ETag'])
+
+        dashboard = self.client.get(f'/api/season/{data["rows"][0][1]}/dashboard/', {'format': 'columns'})
+        self.assertIn('columns', dashboard.json()['data']['economical_bowlers'])
+        error = self.client.get('/api/season/all/leaderboard/', {'stat': 'catches', 'format': 'columns'})
+        self.assertEqual(error.status_code, 400)
+        self.assertEqual(set(error.json()), {'success', 'error'})
+
+
+class DatabaseProfileTests(TestCase):
+    def open(self, directory, alias):
+        settings_dict = {**connection.settings_dict, 'NAME': f'{directory}/profile.sqlite3'}
+        wrapper = SQLiteDatabaseWrapper(settings_dict, alias=alias)
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper.connection
+
+    def test_pragmas_and_read_only_connection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            writer = self.open(directory, 'default')
+            self.assertEqual(writer.execute('PRAGMA journal_mode').fetchone(), ('wal',))
+            self.assertEqual(writer.execute('PRAGMA cache_size').fetchone(), (-64000,))
+            self.assertEqual(writer.execute('PRAGMA synchronous').fetchone(), (1,))  # NORMAL
+            writer.execute('CREATE TABLE t (x)')
+
+            reader = self.open(directory, 'analytics')
+            self.assertEqual(reader.execute('PRAGMA query_only').fetchone(), (1,))
+            self.assertEqual(reader.execute('SELECT count(*) FROM t').fetchone(), (0,))
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.execute('INSERT INTO t VALUES (1)')
+
+    def test_router(self):
+        router = AnalyticsRouter()
+        # TestCase wraps every test in a transaction on default, so reads stay there
+        self.assertEqual(router.db_for_read(Match), 'default')
+        with mock.patch.object(connections['default'], 'in_atomic_block', False):
+            self.assertEqual(router.db_for_read(Match), 'analytics')
+            with override_settings(IPL_ANALYTICS_DATABASE=None):
+                self.assertEqual(router.db_for_read(Match), 'default')
+        self.assertEqual(router.db_for_write(Match), 'default')
+        self.assertFalse(router.allow_migrate('analytics', 'ipl_app'))
+
+
+class BlueGreenTests(TransactionTestCase):
+    databases = {'default', 'analytics'}
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        generate_dataset(self.directory, deliveries=3000, seed=61)
+        load_dataset(self.directory, warm_cache=False)
+        forget_dataset_version()
+
+        # Switching builds repoints the aliases; put them back on the test database afterwards,
+        # which is in memory and only survives while a connection to it stays open
+        live = sqlite3.connect(connection.settings_dict['NAME'], uri=True)
+        self.addCleanup(live.close)
+        self.addCleanup(point_aliases_at, ['default', 'analytics'], connection.settings_dict['NAME'])
+        self.addCleanup(bluegreen._active.update, name=None, checked=0.0, base=None)
+        builds = override_settings(IPL_DATABASES_DIR=f'{self.directory}/builds')
+        builds.enable()
+        self.addCleanup(builds.disable)
+
+    def load_next(self, **options):
+        directory = f'{self.directory}/next'
+        os.makedirs(directory, exist_ok=True)
+        generate_dataset(directory, deliveries=6000, seed=62)
+        load_dataset(directory, warm_cache=False, blue_green=True, **options)
+
+    def matches(self, response):
+        return sum(item['matches_count'] for item in response.json()['data'])
+
+    def test_switch_and_rollback(self):
+        before = self.client.get('/api/matches-per-year/')
+        live_matches = Match.objects.count()
+
+        self.load_next()
+
+        build = read_active()
+        self.assertEqual(list_builds(), [build])
+        after = self.client.get('/api/matches-per-year/')
+        self.assertNotEqual(after['ETag'], before['ETag'])
+        self.assertGreater(Match.objects.count(), live_matches)
+        self.assertEqual(self.matches(after), Match.objects.count())
+
+        call_command('switch_database', '--rollback', stdout=io.StringIO())
+        self.assertIsNone(read_active())
+        rolled_back = self.client.get('/api/matches-per-year/')
+        self.assertEqual(rolled_back['ETag'], before['ETag'])
+        self.assertEqual(self.matches(rolled_back), live_matches)
+        # The build stays available to switch back to
+        self.assertEqual(list_builds(), [build])
+
+    def test_invalid_build_is_discarded(self):
+        before = self.client.get('/api/matches-per-year/')
+        with mock.patch('ipl_app.management.commands.load_ipl_data.validate_build',
+                        side_effect=InvalidBuild('no season summaries')), \
+                self.assertRaisesMessage(CommandError, 'no season summaries'):
+            self.load_next()
+
+        self.assertEqual(list_builds(), [])
+        self.assertIsNone(read_active())
+        self.assertEqual(self.client.get('/api/matches-per-year/')['ETag'], before['ETag'])
+
+        os.makedirs(f'{self.directory}/builds', exist_ok=True)
+        open(f'{self.directory}/builds/ipl-empty.sqlite3', 'w').close()
+        with self.assertRaisesMessage(CommandError, 'unapplied migrations'):
+            call_command('switch_database', 'ipl-empty.sqlite3', stdout=io.StringIO())
+
+
+class BenchmarkComparisonTests(TestCase):
+    databases = {'default', 'analytics'}
+
+    def results(self, ingest_s, median_ms, queries):
+        return {'scales': {'1x': {
+            'ingest_s': ingest_s,
+            'ingest_peak_rss_mb': 100.0,
+            'endpoints': {'season-dashboard': {'median_ms': median_ms, 'queries': queries, 'peak_kb': 50.0}},
+        }}}
+
+    def test_counts_queries_on_every_alias(self):
+        # Outside a transaction the router sends every read to the analytics alias
+        with mock.patch.object(AnalyticsRouter, 'db_for_read', return_value='analytics'), \
+                override_settings(IPL_CHART_CACHE_ALIAS=None):
+            metrics = measure_endpoint(self.client, '/api/matches-per-year/', repeat=1)
+        self.assertGreater(metrics['queries'], 0)
+
+    def test_flags_slowdowns_and_extra_queries(self):
+        baseline = self.results(10.0, 5.0, 3)
+
+        self.assertEqual(compare_results(baseline, self.results(10.5, 5.5, 3)), [])
+        # Relative noise on a fast endpoint stays under the absolute floor
+        self.assertEqual(compare_results(self.results(10.0, 0.2, 3), self.results(10.0, 0.5, 3)), [])
+        self.assertEqual(compare_results(baseline, self.results(15.0, 9.0, 4)), [
+            '1x ingest: 10.0s -> 15.0s',
+            '1x season-dashboard: 5.0 ms -> 9.0 ms',
+            '1x season-dashboard: 3 -> 4 queries',
+        ])
 
-# Create your tests here.
@@ -6,15 +6,27 @@ urlpatterns = [
     path('teams/', views.TeamListCreateView.as_view(), name='team-list-create'),
     path('players/', views.PlayerListCreateView.as_view(), name='player-list-create'),
     path('matches/', views.MatchListCreateView.as_view(), name='match-list-create'),
+    path('players/<int:player_id>/stats/', views.player_stats, name='player-stats'),
+    path('deliveries/', views.DeliveryListView.as_view(), name='delivery-list'),
     
     # Chart API endpoints for assignment tasks
     path('matches-per-year/', views.matches_per_year, name='matches-per-year'),
     path('team-wins-stacked/', views.team_wins_stacked, name='team-wins-stacked'),
     path('extra-runs-per-team/<str:year>/', views.extra_runs_per_team, name='extra-runs-per-team'),
     path('economical-bowlers/<str:year>/', views.economical_bowlers, name='economical-bowlers'),
+    path('matches-played-vs-won/', views.matches_played_vs_won_all_seasons, name='matches-played-vs-won-all-seasons'),
     path('matches-played-vs-won/<str:year>/', views.matches_played_vs_won, name='matches-played-vs-won'),
+    path('season/<str:year>/dashboard/', views.season_dashboard, name='season-dashboard'),
+    path('season/<str:year>/leaderboard/', views.season_leaderboard, name='season-leaderboard'),
+    path('aggregate/', views.aggregate, name='aggregate'),
+    path('head-to-head/', views.head_to_head, name='head-to-head'),
+    path('venues/<str:venue>/', views.venue_records, name='venue-records'),
+    path('export/<str:dataset>.<str:fmt>', views.export_dataset, name='export'),
     
     # Utility endpoints
     path('available-years/', views.available_years, name='available-years'),
+    path('search/', views.name_search, name='name-search'),
     path('teams-list/', views.teams_list, name='teams-list'),
+    path('cache-stats/', views.chart_cache_stats, name='chart-cache-stats'),
+    path('timing-stats/', views.timing_stats, name='timing-stats'),
 ]
\ No newline at end of file
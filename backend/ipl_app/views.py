@@ -1,33 +1,137 @@
+import logging
 from rest_framework import generics, status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.db.models import Count, Sum, Avg, F, Q
-from .models import Team, Player, Match, Delivery
+from django.db.models import Sum, F, Q, ExpressionWrapper, FloatField
+from django.db.models.functions import Cast
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from .aggregates import refresh_head_to_head, refresh_season_stats
+from .aggregation import AggregateSpec, InvalidSpec
+from .cache import cache_stats, cached_chart, cached_result
+from .dataset import bump_dataset_version
+from .engines import get_engine
+from .exports import EXPORT_COLUMNS, EXPORT_FORMATS, export_queryset, gzip_stream, iter_export
+from .instrumentation import query_budget, route_stats
+from .middleware import etag_exempt
+from .models import (
+    Team, Player, Match, Delivery, HeadToHead, TeamVenueStats, SeasonBattingStats, SeasonBowlerStats,
+)
+from .search import KINDS, search_names
 from .serializers import (
     TeamSerializer, PlayerSerializer, MatchSerializer, DeliverySerializer,
     MatchesPerYearSerializer, TeamWinsStackedSerializer, ExtraRunsPerTeamSerializer,
-    EconomicalBowlerSerializer, MatchesPlayedVsWonSerializer
+    EconomicalBowlerSerializer, MatchesPlayedVsWonSerializer, SeasonMatchesPlayedVsWonSerializer,
+    HeadToHeadSerializer, VenueRecordSerializer, BattingStatsSerializer, BowlingStatsSerializer,
+    fast_data, fast_row,
 )
 
-class TeamListCreateView(generics.ListCreateAPIView):
+logger = logging.getLogger(__name__)
+
+class ProjectedListMixin:
+    """List views accepting ``?fields=a,b`` to narrow the serializer and the selected columns.
+
+    Each requested field's source (e.g. ``team1.name``) becomes an ``only()``
+    column (``team1__name``) and, for related fields, a ``select_related``.
+    """
+    cursor_ordering = 'id'
+    query_budget = 2
+
+    def requested_fields(self):
+        if self.request.method != 'GET' or 'fields' not in self.request.query_params:
+            return None
+        fields = [name for name in self.request.query_params['fields'].split(',') if name]
+        unknown = sorted(set(fields) - set(self.get_serializer_class()().fields))
+        if unknown:
+            raise ValidationError({'fields': f'Unknown fields: {", ".join(unknown)}'})
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.requested_fields()
+        if fields is None:
+            return queryset
+        serializer_fields = self.get_serializer_class()().fields
+        columns = {self.cursor_ordering}
+        columns.update(serializer_fields[name].source.replace('.', '__') for name in fields)
+        relations = {column.rsplit('__', 1)[0] for column in columns if '__' in column}
+        return queryset.select_related(None).select_related(*relations).only(*columns)
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.requested_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+    def id_param(self, name):
+        value = self.request.query_params.get(name)
+        if value is not None and not value.isdigit():
+            raise ValidationError({name: 'Must be an integer id.'})
+        return value
+
+class TeamListCreateView(ProjectedListMixin, generics.ListCreateAPIView):
     queryset = Team.objects.all()
     serializer_class = TeamSerializer
 
-class PlayerListCreateView(generics.ListCreateAPIView):
+    def perform_create(self, serializer):
+        serializer.save()
+        bump_dataset_version()
+
+class PlayerListCreateView(ProjectedListMixin, generics.ListCreateAPIView):
     queryset = Player.objects.all()
     serializer_class = PlayerSerializer
 
-class MatchListCreateView(generics.ListCreateAPIView):
+    def perform_create(self, serializer):
+        serializer.save()
+        bump_dataset_version()
+
+class MatchListCreateView(ProjectedListMixin, generics.ListCreateAPIView):
     queryset = Match.objects.all().select_related('team1', 'team2', 'winner', 'player_of_match')
     serializer_class = MatchSerializer
+    cursor_ordering = 'match_id'
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        season = self.request.query_params.get('season')
+        team = self.id_param('team')
+        if season:
+            queryset = queryset.filter(season=season)
+        if team:
+            queryset = queryset.filter(Q(team1=team) | Q(team2=team))
+        return queryset
+
+    def perform_create(self, serializer):
+        match = serializer.save()
+        refresh_season_stats([match.season])
+        refresh_head_to_head([match.team1_id, match.team2_id])
+        bump_dataset_version()
 
+class DeliveryListView(ProjectedListMixin, generics.ListAPIView):
+    queryset = Delivery.objects.all().select_related('batsman', 'bowler', 'batting_team')
+    serializer_class = DeliverySerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        season = self.request.query_params.get('season')
+        if season:
+            queryset = queryset.filter(season=season)
+        for name in ('match', 'bowler', 'batsman'):
+            value = self.id_param(name)
+            if value:
+                queryset = queryset.filter(**{name: value})
+        team = self.id_param('team')
+        if team:
+            queryset = queryset.filter(Q(batting_team=team) | Q(bowling_team=team))
+        return queryset
+
+
+@query_budget(2)
 @api_view(['GET'])
+@cached_chart('matches-per-year')
 def matches_per_year(request):
     try:
-        matches_data = Match.objects.values('season').annotate(
-            matches_count=Count('match_id')
-        ).order_by('season')
+        matches_data = get_engine().matches_per_season()
         formatted_data = []
         for item in matches_data:
             formatted_data.append({
@@ -35,184 +139,572 @@ def matches_per_year(request):
                 'matches_count': item['matches_count']
             })
         
-        serializer = MatchesPerYearSerializer(formatted_data, many=True)
         return Response({
             'success': True,
-            'data': serializer.data,
+            'data': fast_data(MatchesPerYearSerializer, formatted_data),
             'message': 'Matches per year data retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 # Task 2: For the Stacked Graph in the Landing Page..
+@query_budget(2)
 @api_view(['GET'])
+@cached_chart('team-wins-stacked')
 def team_wins_stacked(request):
     try:
-        wins_data = Match.objects.filter(winner__isnull=False).values(
-            'season', 'winner__name'
-        ).annotate(
-            wins=Count('match_id')
-        ).order_by('season', 'winner__name')
+        wins_data = get_engine().team_wins()
         
         # Transform data for stacked bar chart
         formatted_data = []
         for item in wins_data:
             formatted_data.append({
-                'team': item['winner__name'],
+                'team': item['team__name'],
                 'year': item['season'],
-                'wins': item['wins']
+                'wins': item['matches_won']
             })
         
-        serializer = TeamWinsStackedSerializer(formatted_data, many=True)
         return Response({
             'success': True,
-            'data': serializer.data,
+            'data': fast_data(TeamWinsStackedSerializer, formatted_data),
             'message': 'Team wins stacked data retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+def _season_team_rows(year):
+    # One query serves both the extra runs and the matches played vs won charts
+    return get_engine().season_team_rows(year)
+
+def _extra_runs_data(team_rows):
+    formatted_data = [
+        {'team': item['team__name'], 'extra_runs': item['extra_runs_conceded']}
+        for item in team_rows
+    ]
+    formatted_data.sort(key=lambda x: x['extra_runs'], reverse=True)
+    return fast_data(ExtraRunsPerTeamSerializer, formatted_data)
+
+def _season_range(year):
+    """Seasons named by ``year``: a single season, an inclusive range like ``2015-2017``, or ``all`` (None)."""
+    if year == 'all':
+        return None
+    if '-' in year:
+        first, last = year.split('-', 1)
+        return [season for season in get_engine().seasons() if first <= season <= last]
+    return [year]
+
+def _single_season_error(year):
+    # The per-team charts are per season; only the bowler rankings combine seasons
+    if year == 'all' or '-' in year:
+        return Response({
+            'success': False,
+            'error': f'{year} is not a single season; ranges and "all" are only supported for economical bowlers'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+def _economical_bowlers_data(year, min_balls=60, limit=15):
+    bowler_stats = get_engine().economical_bowlers(_season_range(year), min_balls=min_balls, limit=limit)
+    
+    formatted_data = []
+    for bowler in bowler_stats:
+        formatted_data.append({
+            'bowler': bowler['bowler__name'],
+            'economy_rate': round(bowler['economy'], 2),
+            'overs_bowled': round(bowler['legal'] / 6.0, 1),
+            'runs_conceded': bowler['runs'],
+            'wickets_taken': bowler['wickets_taken']
+        })
+    return fast_data(EconomicalBowlerSerializer, formatted_data)
+
+def _int_param(request, name, default, maximum):
+    value = request.query_params.get(name, str(default))
+    if not value.isdigit() or int(value) > maximum:
+        raise ValueError(f'{name} must be an integer between 0 and {maximum}')
+    return int(value)
+
+def _matches_played_vs_won_data(team_rows):
+    team_stats = []
+    for item in team_rows:
+        matches_played = item['matches_played']
+        matches_won = item['matches_won']
+        win_percentage = (matches_won / matches_played * 100) if matches_played > 0 else 0
+        
+        team_stats.append({
+            'team': item['team__name'],
+            'matches_played': matches_played,
+            'matches_won': matches_won,
+            'win_percentage': round(win_percentage, 2)
+        })
+    team_stats.sort(key=lambda x: x['matches_won'], reverse=True)
+    return fast_data(MatchesPlayedVsWonSerializer, team_stats)
+
+def _available_years_data():
+    return get_engine().seasons()
+
 #Task 3: For the year "YYYY" plot the extra runs conceded per team
+@query_budget(2)
 @api_view(['GET'])
+@cached_chart('extra-runs-per-team')
 def extra_runs_per_team(request, year):
+    error = _single_season_error(year)
+    if error:
+        return error
     try:
-        extra_runs_data = Delivery.objects.filter(
-            match__season=year
-        ).values('bowling_team__name').annotate(
-            extra_runs=Sum('extra_runs')
-        ).order_by('-extra_runs')
-        
-        formatted_data = []
-        for item in extra_runs_data:
-            formatted_data.append({
-                'team': item['bowling_team__name'],
-                'extra_runs': item['extra_runs'] or 0
-            })
-        
-        serializer = ExtraRunsPerTeamSerializer(formatted_data, many=True)
         return Response({
             'success': True,
-            'data': serializer.data,
+            'data': _extra_runs_data(_season_team_rows(year)),
             'year': year,
             'message': f'Extra runs per team for {year} retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 #Task 4: For the year "YYYY" plot the top economical bowlers
+# year may also be a range (2015-2017) or "all"; ?limit= and ?min_balls= tune the ranking
+@query_budget(3)
 @api_view(['GET'])
+@cached_chart('economical-bowlers')
 def economical_bowlers(request, year):
     try:
-        bowler_stats = Delivery.objects.filter(
-            match__season=year
-        ).values('bowler__name').annotate(
-            total_runs=Sum('total_runs'),
-            total_balls=Count('id'),
-            wickets=Count('player_dismissed', filter=Q(player_dismissed__isnull=False))
-        ).filter(total_balls__gte=60) 
-        
-        formatted_data = []
-        for bowler in bowler_stats:
-            overs = bowler['total_balls'] / 6.0
-            economy = bowler['total_runs'] / overs if overs > 0 else 0
-            
-            formatted_data.append({
-                'bowler': bowler['bowler__name'],
-                'economy_rate': round(economy, 2),
-                'overs_bowled': round(overs, 1),
-                'runs_conceded': bowler['total_runs'],
-                'wickets_taken': bowler['wickets']
-            })
-        formatted_data.sort(key=lambda x: x['economy_rate'])
-        top_bowlers = formatted_data[:15]
-        
-        serializer = EconomicalBowlerSerializer(top_bowlers, many=True)
+        limit = _int_param(request, 'limit', 15, 100)
+        min_balls = _int_param(request, 'min_balls', 60, 10000)
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
         return Response({
             'success': True,
-            'data': serializer.data,
+            'data': _economical_bowlers_data(year, min_balls=min_balls, limit=limit),
             'year': year,
             'message': f'Top economical bowlers for {year} retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 #Task 5: For the year "YYYY" plot a chart for matches played vs matches won for each team
+@query_budget(2)
 @api_view(['GET'])
+@cached_chart('matches-played-vs-won')
 def matches_played_vs_won(request, year):
+    error = _single_season_error(year)
+    if error:
+        return error
+    try:
+        return Response({
+            'success': True,
+            'data': _matches_played_vs_won_data(_season_team_rows(year)),
+            'year': year,
+            'message': f'Matches played vs won for {year} retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# Every per-season chart in one response; ?charts=a,b selects a subset
+SEASON_DASHBOARD_CHARTS = ['extra_runs', 'economical_bowlers', 'matches_played_vs_won', 'available_years']
+
+@query_budget(5)
+@api_view(['GET'])
+@cached_chart('season-dashboard')
+def season_dashboard(request, year):
+    charts = request.query_params.get('charts')
+    charts = [name for name in charts.split(',') if name] if charts else SEASON_DASHBOARD_CHARTS
+    unknown = sorted(set(charts) - set(SEASON_DASHBOARD_CHARTS))
+    if unknown:
+        return Response({
+            'success': False,
+            'error': f'Unknown charts: {", ".join(unknown)}'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if 'extra_runs' in charts or 'matches_played_vs_won' in charts:
+        error = _single_season_error(year)
+        if error:
+            return error
+    try:
+        data = {}
+        if 'extra_runs' in charts or 'matches_played_vs_won' in charts:
+            team_rows = _season_team_rows(year)
+            if 'extra_runs' in charts:
+                data['extra_runs'] = _extra_runs_data(team_rows)
+            if 'matches_played_vs_won' in charts:
+                data['matches_played_vs_won'] = _matches_played_vs_won_data(team_rows)
+        if 'economical_bowlers' in charts:
+            data['economical_bowlers'] = _economical_bowlers_data(year)
+        if 'available_years' in charts:
+            data['available_years'] = _available_years_data()
+        return Response({
+            'success': True,
+            'data': data,
+            'year': year,
+            'message': f'Season dashboard for {year} retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# Ad-hoc grouped aggregates over deliveries, e.g.
+# ?group_by=bowler&metrics=economy,wickets&season=2016&order=economy&limit=10
+@query_budget(2)
+@api_view(['GET'])
+def aggregate(request):
+    try:
+        spec = AggregateSpec.from_params(request.query_params)
+    except InvalidSpec as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        source, rows = cached_result('aggregate', spec.normalized(), spec.run)
+        return Response({
+            'success': True,
+            'data': rows,
+            'spec': spec.normalized(),
+            'source': source,
+            'message': 'Aggregate retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# Streaming CSV/NDJSON exports, e.g. /api/export/deliveries.csv?season=2016&team=3&gzip=1
+@require_GET
+def export_dataset(request, dataset, fmt):
+    if dataset not in EXPORT_COLUMNS or fmt not in EXPORT_FORMATS:
+        raise Http404(f'No export {dataset}.{fmt}')
+    team = request.GET.get('team')
+    if team is not None and not team.isdigit():
+        return JsonResponse({'success': False, 'error': 'team must be an integer id'}, status=400)
+
+    rows = export_queryset(dataset, season=request.GET.get('season'), team=team)
+    chunks = iter_export(dataset, fmt, rows)
+    filename = f'{dataset}.{fmt}'
+    if request.GET.get('gzip') == '1':
+        response = StreamingHttpResponse(gzip_stream(chunks), content_type='application/gzip')
+        filename += '.gz'
+    else:
+        response = StreamingHttpResponse(chunks, content_type=f'{EXPORT_FORMATS[fmt]}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+# Task 5 across every season: a season x team matrix of matches played vs won
+@query_budget(2)
+@api_view(['GET'])
+@cached_chart('matches-played-vs-won-all-seasons')
+def matches_played_vs_won_all_seasons(request):
     try:
-        # Get all teams that played in the specified year
-        teams_in_year = Match.objects.filter(season=year).values_list('team1', 'team2').distinct()
-        team_ids = set()
-        for match in teams_in_year:
-            team_ids.add(match[0])
-            team_ids.add(match[1])
+        season_stats = get_engine().season_team_rows()
         
         team_stats = []
-        for team_id in team_ids:
-            team = Team.objects.get(id=team_id)
-            
-            matches_played = Match.objects.filter(
-                season=year
-            ).filter(
-                Q(team1=team) | Q(team2=team)
-            ).count()
-            
-            matches_won = Match.objects.filter(
-                season=year,
-                winner=team
-            ).count()
-            
+        for item in season_stats:
+            matches_played = item['matches_played']
+            matches_won = item['matches_won']
             win_percentage = (matches_won / matches_played * 100) if matches_played > 0 else 0
             
             team_stats.append({
-                'team': team.name,
+                'year': item['season'],
+                'team': item['team__name'],
                 'matches_played': matches_played,
                 'matches_won': matches_won,
                 'win_percentage': round(win_percentage, 2)
             })
-        team_stats.sort(key=lambda x: x['matches_won'], reverse=True)
         
-        serializer = MatchesPlayedVsWonSerializer(team_stats, many=True)
         return Response({
             'success': True,
-            'data': serializer.data,
+            'data': fast_data(SeasonMatchesPlayedVsWonSerializer, team_stats),
+            'years': sorted({item['year'] for item in team_stats}),
+            'teams': sorted({item['team'] for item in team_stats}),
+            'message': 'Matches played vs won for all seasons retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def _record(item):
+    win_percentage = (item['wins'] / item['matches'] * 100) if item['matches'] > 0 else 0
+    return dict(item, win_percentage=round(win_percentage, 2))
+
+# All-time team-vs-team records; ?team= and ?opponent= (team names) narrow the matrix
+@query_budget(2)
+@api_view(['GET'])
+@cached_chart('head-to-head')
+def head_to_head(request):
+    try:
+        records = HeadToHead.objects.values(
+            'matches', 'wins', 'losses', 'no_results', team_name=F('team__name'), opponent_name=F('opponent__name')
+        ).order_by('team__name', 'opponent__name')
+        if 'team' in request.query_params:
+            records = records.filter(team__name=request.query_params['team'])
+        if 'opponent' in request.query_params:
+            records = records.filter(opponent__name=request.query_params['opponent'])
+
+        formatted_data = [
+            _record({
+                'team': item['team_name'],
+                'opponent': item['opponent_name'],
+                'matches': item['matches'],
+                'wins': item['wins'],
+                'losses': item['losses'],
+                'no_results': item['no_results'],
+            })
+            for item in records
+        ]
+        return Response({
+            'success': True,
+            'data': fast_data(HeadToHeadSerializer, formatted_data),
+            'teams': sorted({item['team'] for item in formatted_data}),
+            'message': 'Head-to-head records retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# All-time record of every team at one venue
+@query_budget(2)
+@api_view(['GET'])
+@cached_chart('venue-records')
+def venue_records(request, venue):
+    try:
+        records = TeamVenueStats.objects.filter(venue=venue).values(
+            'matches', 'wins', 'losses', 'no_results', team_name=F('team__name')
+        ).order_by('-wins', 'team__name')
+        formatted_data = [
+            _record({
+                'team': item['team_name'],
+                'matches': item['matches'],
+                'wins': item['wins'],
+                'losses': item['losses'],
+                'no_results': item['no_results'],
+            })
+            for item in records
+        ]
+        if not formatted_data:
+            return Response({
+                'success': False,
+                'error': f'No matches found at {venue}'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            'success': True,
+            'data': fast_data(VenueRecordSerializer, formatted_data),
+            'venue': venue,
+            'message': f'Team records at {venue} retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+BATTING_FIELDS = ('runs', 'balls', 'fours', 'sixes', 'dismissals')
+BOWLING_FIELDS = ('legal_balls', 'runs_conceded', 'wickets')
+
+def _strike_rate(runs, balls):
+    return round(runs * 100 / balls, 2) if balls else None
+
+def _economy_rate(runs_conceded, legal_balls):
+    return round(runs_conceded * 6 / legal_balls, 2) if legal_balls else None
+
+def _batting_row(item):
+    item['strike_rate'] = _strike_rate(item['runs'], item['balls'])
+    return item
+
+def _bowling_row(item):
+    item['economy_rate'] = _economy_rate(item['runs_conceded'], item['legal_balls'])
+    return item
+
+# Batting and bowling figures of one player per season and over the career, read from the summary tables
+@query_budget(4)
+@api_view(['GET'])
+@cached_chart('player-stats')
+def player_stats(request, player_id):
+    try:
+        player = Player.objects.filter(pk=player_id).values('id', 'name', 'role').first()
+        if player is None:
+            return Response({
+                'success': False,
+                'error': f'Player {player_id} not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        batting = [_batting_row(item) for item in SeasonBattingStats.objects.filter(
+            batsman=player_id
+        ).values('season', *BATTING_FIELDS).order_by('season')]
+        bowling = [_bowling_row(item) for item in SeasonBowlerStats.objects.filter(
+            bowler=player_id
+        ).values('season', *BOWLING_FIELDS).order_by('season')]
+        career_batting = _batting_row({field: sum(item[field] for item in batting) for field in BATTING_FIELDS})
+        career_bowling = _bowling_row({field: sum(item[field] for item in bowling) for field in BOWLING_FIELDS})
+
+        return Response({
+            'success': True,
+            'data': {
+                'player': player,
+                'batting': {
+                    'seasons': fast_data(BattingStatsSerializer, batting),
+                    'career': fast_row(BattingStatsSerializer, career_batting),
+                },
+                'bowling': {
+                    'seasons': fast_data(BowlingStatsSerializer, bowling),
+                    'career': fast_row(BowlingStatsSerializer, career_bowling),
+                },
+            },
+            'message': f'Stats for {player["name"]} retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+def _rate(numerator, denominator, scale):
+    return ExpressionWrapper(Cast(numerator, FloatField()) * scale / F(denominator), output_field=FloatField())
+
+# stat -> (summary model, player field, balls field, value expression, best first);
+# rate stats default to a 60-ball minimum so a handful of balls can't top the table
+LEADERBOARD_STATS = {
+    'runs': (SeasonBattingStats, 'batsman', 'balls', lambda: Sum('runs'), 'desc'),
+    'fours': (SeasonBattingStats, 'batsman', 'balls', lambda: Sum('fours'), 'desc'),
+    'sixes': (SeasonBattingStats, 'batsman', 'balls', lambda: Sum('sixes'), 'desc'),
+    'strike_rate': (SeasonBattingStats, 'batsman', 'balls', lambda: _rate('total_runs', 'total_balls', 100), 'desc'),
+    'wickets': (SeasonBowlerStats, 'bowler', 'legal_balls', lambda: Sum('wickets'), 'desc'),
+    'economy': (SeasonBowlerStats, 'bowler', 'legal_balls', lambda: _rate('total_runs', 'total_balls', 6), 'asc'),
+}
+RATE_STATS = {'strike_rate', 'economy'}
+
+def _leaderboard_data(year, stat, min_balls, limit):
+    model, player_field, balls_field, value, direction = LEADERBOARD_STATS[stat]
+    rows = model.objects.all()
+    seasons = _season_range(year)
+    if seasons is not None:
+        rows = rows.filter(season__in=seasons)
+    runs_field = 'runs' if model is SeasonBattingStats else 'runs_conceded'
+    rows = rows.values(player_field, f'{player_field}__name').annotate(
+        total_runs=Sum(runs_field), total_balls=Sum(balls_field),
+    ).filter(total_balls__gte=max(min_balls, 1 if stat in RATE_STATS else 0)).annotate(value=value())
+    ordering = F('value').desc() if direction == 'desc' else F('value').asc()
+    rows = rows.order_by(ordering, f'{player_field}__name', player_field)[:limit]
+    return [
+        {
+            'rank': rank,
+            'player_id': item[player_field],
+            'player': item[f'{player_field}__name'],
+            stat: round(item['value'], 2) if isinstance(item['value'], float) else item['value'],
+            'balls': item['total_balls'],
+        }
+        for rank, item in enumerate(rows, 1)
+    ]
+
+# Season leaderboards; year may be a range (2015-2017) or "all", ?stat= picks the table
+@query_budget(3)
+@api_view(['GET'])
+@cached_chart('season-leaderboard')
+def season_leaderboard(request, year):
+    stat = request.query_params.get('stat', 'runs')
+    try:
+        if stat not in LEADERBOARD_STATS:
+            raise ValueError(f'stat must be one of {", ".join(LEADERBOARD_STATS)}')
+        limit = _int_param(request, 'limit', 10, 100)
+        min_balls = _int_param(request, 'min_balls', 60 if stat in RATE_STATS else 0, 10000)
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return Response({
+            'success': True,
+            'data': _leaderboard_data(year, stat, min_balls, limit),
             'year': year,
-            'message': f'Matches played vs won for {year} retrieved successfully'
+            'stat': stat,
+            'message': f'{stat} leaderboard for {year} retrieved successfully'
+        })
+    except Exception as e:
+        logger.exception('%s failed', request.path)
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+# Typeahead over player and team names: ?q=, optional ?type=player|team and ?limit=
+@query_budget(3)
+@api_view(['GET'])
+def name_search(request):
+    kind = request.query_params.get('type') or None
+    try:
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f'type must be one of {", ".join(KINDS)}')
+        limit = _int_param(request, 'limit', 10, 50)
+    except ValueError as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        return Response({
+            'success': True,
+            'data': search_names(request.query_params.get('q', ''), kind=kind, limit=limit),
+            'message': 'Search results retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 #Get all available years/seasons in the database
+@query_budget(2)
 @api_view(['GET'])
+@cached_chart('available-years')
 def available_years(request):
     try:
-        years = Match.objects.values_list('season', flat=True).distinct().order_by('season')
         return Response({
             'success': True,
-            'data': list(years),
+            'data': _available_years_data(),
             'message': 'Available years retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@query_budget(2)
 @api_view(['GET'])
 def teams_list(request):
     try:
@@ -224,7 +716,26 @@ def teams_list(request):
             'message': 'Teams retrieved successfully'
         })
     except Exception as e:
+        logger.exception('%s failed', request.path)
         return Response({
             'success': False,
             'error': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+@etag_exempt
+@api_view(['GET'])
+def chart_cache_stats(request):
+    return Response({
+        'success': True,
+        'data': cache_stats(),
+        'message': 'Chart cache statistics retrieved successfully'
+    })
+
+@etag_exempt
+@api_view(['GET'])
+def timing_stats(request):
+    return Response({
+        'success': True,
+        'data': route_stats(),
+        'message': 'Request timing statistics retrieved successfully'
+    })
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ipl_project.settings')
+# Serve the read-only API through its async views, e.g. `uvicorn ipl_project.asgi:application`
+os.environ.setdefault('IPL_ROOT_URLCONF', 'ipl_project.asgi_urls')
 
 application = get_asgi_application()
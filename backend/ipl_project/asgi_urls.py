@@ -0,0 +1,12 @@
+"""
+URL configuration used when serving through asgi.py.
+
+The read-only API endpoints resolve to the async views in ipl_app.async_urls;
+every other URL falls through to ipl_project.urls.
+"""
+from django.urls import path, include
+from .urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path('api/', include('ipl_app.async_urls')),
+] + sync_urlpatterns
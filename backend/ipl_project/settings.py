@@ -31,9 +31,13 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'ipl_app.middleware.DatasetETagMiddleware',
+    # Last, so its view timing brackets just the view
+    'ipl_app.instrumentation.RequestTimingMiddleware',
 ]
 
-ROOT_URLCONF = 'ipl_project.urls'
+# asgi.py switches this to ipl_project.asgi_urls
+ROOT_URLCONF = os.environ.get('IPL_ROOT_URLCONF', 'ipl_project.urls')
 
 TEMPLATES = [
     {
@@ -54,12 +58,92 @@ TEMPLATES = [
 WSGI_APPLICATION = 'ipl_project.wsgi.application'
 
 # Database - Using SQLite for this assignment
+# 'default' is the only writer; reads go to 'analytics', a query-only connection
+# to the same file (see ipl_app.database). Connections persist for CONN_MAX_AGE.
+DATABASE_PATH = os.environ.get('IPL_DATABASE_PATH', str(BASE_DIR / 'db.sqlite3'))
+CONN_MAX_AGE = int(os.environ.get('IPL_DB_CONN_MAX_AGE', 600))
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'NAME': DATABASE_PATH,
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
+    },
+    'analytics': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': DATABASE_PATH,
+        'CONN_MAX_AGE': CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+DATABASE_ROUTERS = ['ipl_app.database.AnalyticsRouter']
+IPL_ANALYTICS_DATABASE = os.environ.get('IPL_ANALYTICS_DATABASE', 'analytics') or None
+
+# Blue/green loads (load_ipl_data --blue-green) build each new database file here;
+# the file named in ACTIVE is served instead of DATABASE_PATH, older builds are kept for rollback
+IPL_DATABASES_DIR = os.environ.get('IPL_DATABASES_DIR', str(BASE_DIR / 'databases'))
+IPL_DATABASE_BUILDS_KEPT = 3
+
+# Applied to every new SQLite connection; journal_mode only on the writer
+IPL_SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',  # durable in WAL mode except against power loss
+    'cache_size': -64000,  # KiB, i.e. 64 MB of page cache per connection
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+
+# Caches - chart responses live in their own bounded, LRU-evicted cache.
+# Point IPL_CHART_CACHE_BACKEND/LOCATION at e.g. Redis to share it between workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'charts': {
+        'BACKEND': os.environ.get('IPL_CHART_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('IPL_CHART_CACHE_LOCATION', 'ipl-charts'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('IPL_CHART_CACHE_MAX_ENTRIES', 2000)),
+            'CULL_FREQUENCY': 10,
+        },
+    },
 }
+IPL_CHART_CACHE_ALIAS = 'charts'  # set to None to disable chart caching
+
+# Seconds a process may keep using its copy of the dataset version token
+IPL_DATASET_VERSION_TTL = 2
+
+# Engine answering the chart queries: 'orm' reads the summary tables, 'columnar'
+# keeps Match and Delivery in NumPy arrays (requires numpy) rebuilt after each load
+IPL_ANALYTICS_ENGINE = os.environ.get('IPL_ANALYTICS_ENGINE', 'orm')
+
+# Columnar snapshot written by export_snapshot; the columnar engine maps it
+# instead of querying the database when it matches the current dataset version
+IPL_SNAPSHOT_PATH = os.environ.get('IPL_SNAPSHOT_PATH', str(BASE_DIR / 'snapshots' / 'ipl.snapshot'))
+
+# Limits on /api/aggregate/ specs
+IPL_AGGREGATE_MAX_DIMENSIONS = 3
+IPL_AGGREGATE_DEFAULT_LIMIT = 100
+IPL_AGGREGATE_MAX_LIMIT = 1000
+IPL_AGGREGATE_MAX_GROUPS = 50000  # estimated from per-dimension cardinalities
+
+# Conditional GET for the API: ETags follow the dataset version, so clients
+# may reuse a response briefly and then revalidate it cheaply with If-None-Match.
+IPL_ETAG_PATH_PREFIX = '/api/'
+IPL_API_CACHE_CONTROL = 'max-age=60, stale-while-revalidate=300'
+
+# Request instrumentation (ipl_app.instrumentation): recent samples kept per route
+# for /api/timing-stats/, and what a view exceeding its query budget does: 'log' or 'raise'
+# ('raise' turns the response into a 500, so keep it to tests and CI)
+IPL_TIMING_SAMPLES = 1000
+IPL_QUERY_BUDGET_ACTION = os.environ.get('IPL_QUERY_BUDGET_ACTION', 'log')
+
+# Threads the async API views (ipl_app.async_views) run the sync ORM work in
+IPL_ASYNC_MAX_WORKERS = int(os.environ.get('IPL_ASYNC_MAX_WORKERS', 8))
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -96,13 +180,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'ipl_app.renderers.FastJSONRenderer',
+        'ipl_app.renderers.ColumnarJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
     'PAGE_SIZE': 100,
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'ipl_app.pagination.KeysetCursorPagination',
 }
 
 # CORS settings for React frontend
@@ -126,4 +211,19 @@ CORS_ALLOW_HEADERS = [
 
 # Media files
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
\ No newline at end of file
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# One JSON line per request on ipl_app.timing at INFO; query budget overruns at WARNING
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'ipl_app': {
+            'handlers': ['console'],
+            'level': os.environ.get('IPL_LOG_LEVEL', 'WARNING'),
+        },
+    },
+}
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Typography,
   Box,
@@ -16,28 +16,13 @@ import SchoolIcon from '@mui/icons-material/School';
 import '../styles/Bowlers.css';
 
 const Bowlers = () => {
-  const [selectedYear, setSelectedYear] = useState(2010);
+  const [selectedYear, setSelectedYear] = useState(2008);
   const [availableYears, setAvailableYears] = useState([]);
   const [bowlersData, setBowlersData] = useState([]);
   const [topBowlers, setTopBowlers] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
-
-  // Fetch available years
-  useEffect(() => {
-    const fetchYears = async () => {
-      try {
-        const response = await apiService.getAvailableYears();
-        if (response.success && response.data.length > 0) {
-          setAvailableYears(response.data);
-          setSelectedYear(response.data[0]);
-        }
-      } catch (error) {
-        console.error('Error fetching years:', error);
-      }
-    };
-    fetchYears();
-  }, []);
+  const yearsLoaded = useRef(false);
 
   // Fetch bowlers data
   useEffect(() => {
@@ -47,10 +32,22 @@ const Bowlers = () => {
       try {
         setLoading(true);
         setError(null);
-        const response = await apiService.getEconomicalBowlers(selectedYear);
+        // One request per year: the chart, plus the season list on first load
+        const charts = yearsLoaded.current ? ['economical_bowlers'] : ['available_years', 'economical_bowlers'];
+        const response = await apiService.getSeasonDashboard(selectedYear, charts);
+        const years = response.success ? response.data.available_years : undefined;
+        if (years && years.length > 0) {
+          yearsLoaded.current = true;
+          setAvailableYears(years);
+          if (!years.map(String).includes(String(selectedYear))) {
+            setSelectedYear(years[0]);
+            return;
+          }
+        }
+        const chartRows = response.success ? response.data.economical_bowlers : undefined;
 
-        if (response.success && response.data && response.data.length > 0) {
-          const data = response.data;
+        if (chartRows && chartRows.length > 0) {
+          const data = chartRows;
 
           // Get top 3 bowlers with proper field mapping
           const top3 = data.slice(0, 3).map((item) => ({
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Typography,
   Box,
@@ -20,22 +20,7 @@ const ExtraRuns = () => {
   const [topTeams, setTopTeams] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
-
-  // Fetch available years
-  useEffect(() => {
-    const fetchYears = async () => {
-      try {
-        const response = await apiService.getAvailableYears();
-        if (response.success && response.data.length > 0) {
-          setAvailableYears(response.data);
-          setSelectedYear(response.data[response.data.length - 1]);
-        }
-      } catch (error) {
-        console.error('Error fetching years:', error);
-      }
-    };
-    fetchYears();
-  }, []);
+  const yearsLoaded = useRef(false);
 
   // Fetch extra runs data
   useEffect(() => {
@@ -45,10 +30,22 @@ const ExtraRuns = () => {
       try {
         setLoading(true);
         setError(null);
-        const response = await apiService.getExtraRunsPerTeam(selectedYear);
+        // One request per year: the chart, plus the season list on first load
+        const charts = yearsLoaded.current ? ['extra_runs'] : ['available_years', 'extra_runs'];
+        const response = await apiService.getSeasonDashboard(selectedYear, charts);
+        const years = response.success ? response.data.available_years : undefined;
+        if (years && years.length > 0) {
+          yearsLoaded.current = true;
+          setAvailableYears(years);
+          if (!years.map(String).includes(String(selectedYear))) {
+            setSelectedYear(years[years.length - 1]);
+            return;
+          }
+        }
+        const chartRows = response.success ? response.data.extra_runs : undefined;
 
-        if (response.success && response.data && response.data.length > 0) {
-          const data = response.data;
+        if (chartRows && chartRows.length > 0) {
+          const data = chartRows;
 
           // Sort by extra_runs in descending order
           const sortedData = data.sort((a, b) => b.extra_runs - a.extra_runs);
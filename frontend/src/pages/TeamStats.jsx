@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import {
   Typography,
   Box,
@@ -27,22 +27,7 @@ const TeamStats = () => {
   const [chartData, setChartData] = useState([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
-
-  // Fetch available years
-  useEffect(() => {
-    const fetchYears = async () => {
-      try {
-        const response = await apiService.getAvailableYears();
-        if (response.success && response.data.length > 0) {
-          setAvailableYears(response.data);
-          setSelectedYear(response.data[response.data.length - 1]);
-        }
-      } catch (error) {
-        console.error('Error fetching years:', error);
-      }
-    };
-    fetchYears();
-  }, []);
+  const yearsLoaded = useRef(false);
 
   // Fetch team stats data
   useEffect(() => {
@@ -52,10 +37,22 @@ const TeamStats = () => {
       try {
         setLoading(true);
         setError(null);
-        const response = await apiService.getMatchesPlayedVsWon(selectedYear);
+        // One request per year: the chart, plus the season list on first load
+        const charts = yearsLoaded.current ? ['matches_played_vs_won'] : ['available_years', 'matches_played_vs_won'];
+        const response = await apiService.getSeasonDashboard(selectedYear, charts);
+        const years = response.success ? response.data.available_years : undefined;
+        if (years && years.length > 0) {
+          yearsLoaded.current = true;
+          setAvailableYears(years);
+          if (!years.map(String).includes(String(selectedYear))) {
+            setSelectedYear(years[years.length - 1]);
+            return;
+          }
+        }
+        const chartRows = response.success ? response.data.matches_played_vs_won : undefined;
 
-        if (response.success && response.data && response.data.length > 0) {
-          const formattedData = response.data.map((item, index) => ({
+        if (chartRows && chartRows.length > 0) {
+          const formattedData = chartRows.map((item, index) => ({
             id: index,
             rank: index + 1,
             team_name: item.team || item.team_name || 'Unknown',
@@ -64,6 +64,97 @@ export const apiService = {
     }
   },
 
+  // Task 5 across all seasons: season x team matrix of matches played vs won
+  getMatchesPlayedVsWonAllSeasons: async () => {
+    try {
+      const response = await api.get('/matches-played-vs-won/');
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching matches played vs won for all seasons:', error);
+      throw error;
+    }
+  },
+
+  // Every per-season chart in one request; charts is an optional list of chart names
+  getSeasonDashboard: async (year, charts) => {
+    try {
+      const params = charts ? { charts: charts.join(',') } : {};
+      const response = await api.get(`/season/${year}/dashboard/`, { params });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching season dashboard:', error);
+      throw error;
+    }
+  },
+
+  // Ad-hoc aggregate, e.g. { group_by: 'bowler', metrics: 'economy', season: 2016, order: 'economy' }
+  getAggregate: async (spec) => {
+    try {
+      const response = await api.get('/aggregate/', { params: spec });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching aggregate:', error);
+      throw error;
+    }
+  },
+
+  // All-time head-to-head records; team and opponent are optional team names
+  getHeadToHead: async (team, opponent) => {
+    try {
+      const response = await api.get('/head-to-head/', { params: { team, opponent } });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching head-to-head records:', error);
+      throw error;
+    }
+  },
+
+  // All-time record of every team at one venue
+  getVenueRecords: async (venue) => {
+    try {
+      const response = await api.get(`/venues/${encodeURIComponent(venue)}/`);
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching venue records:', error);
+      throw error;
+    }
+  },
+
+  // Batting and bowling figures of one player, per season and over the career
+  getPlayerStats: async (playerId) => {
+    try {
+      const response = await api.get(`/players/${playerId}/stats/`);
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching player stats:', error);
+      throw error;
+    }
+  },
+
+  // Season leaderboard; stat is runs, fours, sixes, strike_rate, wickets or economy
+  getSeasonLeaderboard: async (year, stat = 'runs', limit = 10) => {
+    try {
+      const response = await api.get(`/season/${year}/leaderboard/`, { params: { stat, limit } });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching season leaderboard:', error);
+      throw error;
+    }
+  },
+
+  // Typeahead over player and team names; type is 'player', 'team' or null for both
+  searchNames: async (query, type = null, limit = 10) => {
+    try {
+      const params = { q: query, limit };
+      if (type) params.type = type;
+      const response = await api.get('/search/', { params });
+      return response.data;
+    } catch (error) {
+      console.error('Error searching names:', error);
+      throw error;
+    }
+  },
+
   // Get available years
   getAvailableYears: async () => {
     try {